@@ -0,0 +1,195 @@
+"""
+Response compression with a size threshold and a compressed-body cache.
+
+CompressionMiddleware compresses complete (single-chunk) responses of a
+compressible content type once they reach COMPRESSION_MIN_SIZE bytes. The
+encoding is the client's most preferred one (Accept-Encoding q-values) among
+COMPRESSION_ENCODINGS that are importable here: `br` needs `brotli`, `zstd`
+needs `zstandard`, `gzip` is always available.
+
+Compressed bodies are cached by (encoding, BLAKE2 digest of the body) in a
+byte-bounded LRU (COMPRESSION_CACHE_MB). A hot payload, such as the same
+singleStock page served to many clients, is therefore compressed once; later
+hits only hash the body. Streaming responses (e.g. multipart @defer) and
+bodies that are already encoded pass through untouched.
+
+Usage:
+    app.add_middleware(CompressionMiddleware, min_size=1024, encodings=["br", "zstd", "gzip"])
+    body = compress(payload, "gzip")
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 6
+COMPRESSIBLE_TYPES = ("application/json", "application/graphql-response+json", "text/", "application/javascript")
+
+
+@lru_cache(maxsize=1)
+def available_codecs() -> Dict[str, Callable[[bytes], bytes]]:
+    """Encoding -> compress function, for the codecs installed here."""
+    codecs: Dict[str, Callable[[bytes], bytes]] = {
+        "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+    }
+    try:
+        import brotli
+        codecs["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        lock = threading.Lock()  # ZstdCompressor instances are not thread-safe
+        
+        def zstd(body: bytes) -> bytes:
+            with lock:
+                return compressor.compress(body)
+        codecs["zstd"] = zstd
+    except ImportError:
+        pass
+    return codecs
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return available_codecs()[encoding](body)
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Client's most preferred encoding among `encodings` (server order breaks ties)."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            weights[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressedCache:
+    """Byte-bounded LRU of compressed bodies keyed by (encoding, body digest)."""
+    
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        if self.max_bytes <= 0:
+            return compress(body, encoding)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+        compressed = compress(body, encoding)
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries and len(compressed) <= self.max_bytes:
+                self._entries[key] = compressed
+                self.size += len(compressed)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return compressed
+
+
+class CompressionMiddleware:
+    """ASGI middleware; see module docstring."""
+    
+    def __init__(
+        self,
+        app,
+        min_size: int = 1024,
+        encodings: Sequence[str] = ("br", "zstd", "gzip"),
+        cache_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.encodings: List[str] = [e for e in encodings if e in available_codecs()]
+        self.cache = CompressedCache(cache_bytes)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key.lower() == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept, self.encodings) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._compressible(start, body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            compressed = self.cache.get_or_compress(body, encoding)
+            headers = [
+                (k, v) for k, v in start.get("headers", [])
+                if k.lower() not in (b"content-length", b"content-encoding")
+            ]
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    def _compressible(self, start, body: bytes) -> bool:
+        if start is None or len(body) < self.min_size:
+            return False
+        content_type = b""
+        for key, value in start.get("headers", []):
+            key = key.lower()
+            if key == b"content-encoding":
+                return False
+            if key == b"content-type":
+                content_type = value.lower()
+        return any(content_type.startswith(t.encode()) for t in COMPRESSIBLE_TYPES)
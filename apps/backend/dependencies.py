@@ -2,11 +2,15 @@
 FastAPI Dependencies
 
 Verifies JWT tokens issued by Django (simplejwt).
+
+The decoded claims are memoized on `request.state`, so any number of
+dependencies in one request decode the bearer token once; across requests
+libs.auth caches verified claims until the token expires.
 """
 
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import HTTPException, Request
 
@@ -15,7 +19,9 @@ libs_path = Path(__file__).resolve().parent.parent.parent / 'libs'
 if str(libs_path.parent) not in sys.path:
     sys.path.insert(0, str(libs_path.parent))
 
-from libs.auth import verify_token, get_user_id_from_token
+from libs.auth import user_id_from_payload, verify_token
+
+_UNSET = object()
 
 
 def get_token_from_request(request: Request) -> Optional[str]:
@@ -26,16 +32,27 @@ def get_token_from_request(request: Request) -> Optional[str]:
     return auth_header.split(" ", 1)[1]
 
 
+def get_token_payload(request: Request) -> Optional[Dict[str, Any]]:
+    """
+    Verified claims of the request's bearer token (decoded once per request).
+    
+    Returns None if there is no token or it is invalid/expired.
+    """
+    payload = getattr(request.state, "token_payload", _UNSET)
+    if payload is _UNSET:
+        token = get_token_from_request(request)
+        payload = verify_token(token) if token else None
+        request.state.token_payload = payload
+    return payload
+
+
 def get_current_user_id(request: Request) -> Optional[int]:
     """
     Extract user ID from JWT token.
     
     Returns None if not authenticated.
     """
-    token = get_token_from_request(request)
-    if not token:
-        return None
-    return get_user_id_from_token(token)
+    return user_id_from_payload(get_token_payload(request))
 
 
 def require_auth(request: Request) -> int:
@@ -5,33 +5,62 @@ Usage:
     uvicorn apps.backend.main:app --reload
 """
 
+import logging
 from contextlib import asynccontextmanager
 
 import strawberry
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
+from strawberry.schema.config import StrawberryConfig
 
-from neo4j_repo import StockRepository, lifespan as neo4j_lifespan
+from neo4j_repo import create_stock_repository, lifespan as neo4j_lifespan
 from neo4j_repo.connection import get_settings
 
-from .resolvers import Query
+from .resolvers import Query, Subscription
 from .services.stock_service import StockService
 
+logger = logging.getLogger(__name__)
+
+
+def report_missing_schema() -> None:
+    """Log graph indexes/constraints that have not been installed."""
+    from neo4j.exceptions import Neo4jError
+    from libs.neo4j_models.schema import GRAPH_MODELS, missing_schema
+    from neo4j_repo.models import CrawlerJobNode, StockDocumentNode, TrackingRecordNode
+    
+    try:
+        missing = missing_schema(GRAPH_MODELS + [StockDocumentNode, CrawlerJobNode, TrackingRecordNode])
+    except Neo4jError as exc:
+        logger.warning("Could not verify graph schema: %s", exc)
+        return
+    for item in missing:
+        logger.warning("Missing graph schema item: %s", item)
+    if missing:
+        logger.warning("Run `python manage.py install_graph_schema` in apps/cms to install them")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - initialize services."""
     settings = get_settings()
     
-    # Initialize repository and service
-    repo = StockRepository()
+    # Initialize repository and service (GRAPH_BACKEND=memory: no database)
+    repo = create_stock_repository()
     service = StockService(repo)
     
     # Seed default data
     from .services.seed import get_seed_payloads
     repo.seed_if_needed(get_seed_payloads())
     
+    if settings.graph_backend == "neo4j":
+        report_missing_schema()
+    
+    # Rebuild singleStock snapshots after writes
+    snapshots = getattr(app.state, "snapshots", None)
+    if snapshots is not None:
+        service.add_write_listener(snapshots.invalidate)
+    
     # Store in app state for resolver access
     app.state.stock_service = service
     app.state.repo = repo
@@ -51,6 +80,18 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     
+    # Stale-while-revalidate singleStock snapshots (innermost: CORS and
+    # compression apply to snapshot responses too)
+    if settings.snapshot_max_entries > 0:
+        from .snapshots import SnapshotMiddleware, SnapshotStore
+        app.state.snapshots = SnapshotStore(
+            max_entries=settings.snapshot_max_entries,
+            max_bytes=settings.snapshot_cache_mb * 1024 * 1024,
+            ttl=settings.snapshot_ttl_seconds,
+            max_age=settings.snapshot_max_age_seconds,
+        )
+        app.add_middleware(SnapshotMiddleware, store=app.state.snapshots)
+    
     # CORS
     app.add_middleware(
         CORSMiddleware,
@@ -60,8 +101,35 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
-    # GraphQL schema
-    schema = strawberry.Schema(query=Query)
+    # Response compression (above COMPRESSION_MIN_SIZE; compressed bodies are cached)
+    if settings.compression_encodings:
+        from .compression import CompressionMiddleware
+        app.add_middleware(
+            CompressionMiddleware,
+            min_size=settings.compression_min_size,
+            encodings=settings.compression_encodings,
+            cache_bytes=settings.compression_cache_mb * 1024 * 1024,
+        )
+    
+    # Opt-in per-request profiling (PROFILE_SECRET / PROFILE_SAMPLE_RATE)
+    if settings.profile_secret or settings.profile_sample_rate > 0:
+        from .profiling import ProfilingMiddleware
+        app.add_middleware(
+            ProfilingMiddleware,
+            secret=settings.profile_secret,
+            sample_rate=settings.profile_sample_rate,
+            mode=settings.profile_mode,
+            output_dir=settings.profile_dir,
+            keep=settings.profile_keep,
+        )
+    
+    # GraphQL schema (subscriptions over WebSocket on the same path;
+    # @defer / @stream answered as multipart/mixed when the client accepts it)
+    schema = strawberry.Schema(
+        query=Query,
+        subscription=Subscription,
+        config=StrawberryConfig(enable_experimental_incremental_execution=True),
+    )
     
     # Context factory for resolvers
     async def get_context():
@@ -83,6 +151,17 @@ def create_app() -> FastAPI:
     async def root():
         return {"status": "ok", "graphql": "/graphql"}
     
+    # Live events relayed from other processes (pipeline commits in the CMS worker)
+    if settings.events_secret:
+        from libs.events import SIGNATURE_HEADER, bus, parse_relay_body
+        
+        @app.post("/events")
+        async def relay_events(request: Request):
+            events = parse_relay_body(await request.body(), request.headers.get(SIGNATURE_HEADER), settings.events_secret)
+            if events is None:
+                raise HTTPException(status_code=403, detail="Invalid event signature")
+            return {"received": len(events), "delivered": bus.publish_many(events)}
+    
     return app
 
 
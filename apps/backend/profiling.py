@@ -0,0 +1,226 @@
+"""
+Per-request profiling middleware (opt-in).
+
+A request is profiled when it carries a valid signed `X-Profile` header
+(needs PROFILE_SECRET) or is picked by PROFILE_SAMPLE_RATE. One request is
+profiled at a time per process; others pass through untouched.
+
+Modes (PROFILE_MODE, or per request with `X-Profile-Mode`):
+- sample:   a background thread samples the stacks of every thread every
+            5 ms and writes collapsed stacks (`.folded`) for flamegraph.pl,
+            inferno or speedscope. Low overhead. Work offloaded with
+            `asyncio.to_thread` (e.g. singleStock kline/news decoding) shows
+            up under a `[thread-name]` root frame; idle pool threads are
+            skipped.
+- cprofile: deterministic cProfile over the request, dumped as `.prof` for
+            pstats / snakeviz / flameprof. Higher overhead, exact call counts.
+            cProfile only sees the event-loop thread that enabled it, so
+            `asyncio.to_thread` work is missing: use `sample` for it.
+
+Both modes see the whole process (sample) or event-loop thread (cprofile),
+so work of other requests that interleaves with the profiled one is included. Files go to PROFILE_DIR
+(x-log/profiles); only the newest PROFILE_KEEP are kept. The response
+carries the file name in `X-Profile-Id`.
+
+Usage:
+    header=$(python -c "from apps.backend.profiling import sign_profile_header; print(sign_profile_header('$PROFILE_SECRET'))")
+    curl -H "X-Profile: $header" -H "Content-Type: application/json" \\
+         -d '{"query": "{ singleStock(symbol: \\"AAPL\\") { stock { symbol } } }"}' http://127.0.0.1:8000/graphql
+    flamegraph.pl x-log/profiles/<X-Profile-Id> > flame.svg
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hashlib
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL_SECONDS = 0.005
+SIGNATURE_MAX_AGE_SECONDS = 300
+PROFILE_SUFFIXES = (".folded", ".prof")
+
+
+def sign_profile_header(secret: str, timestamp: Optional[int] = None) -> str:
+    """`X-Profile` header value: `<unix ts>:<hmac-sha256(secret, ts)>`."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), str(timestamp).encode(), hashlib.sha256).hexdigest()
+    return f"{timestamp}:{signature}"
+
+
+def verify_profile_header(secret: str, value: str, now: Optional[float] = None) -> bool:
+    if not secret or not value:
+        return False
+    timestamp, _, signature = value.partition(":")
+    try:
+        age = (time.time() if now is None else now) - int(timestamp)
+    except ValueError:
+        return False
+    if abs(age) > SIGNATURE_MAX_AGE_SECONDS:
+        return False
+    expected = sign_profile_header(secret, int(timestamp)).partition(":")[2]
+    return hmac.compare_digest(expected, signature)
+
+
+# Innermost frames of threads that are blocked waiting for work
+IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+class StackSampler:
+    """
+    Samples Python stacks at a fixed interval into collapsed stacks.
+    
+    `thread_id` (the event-loop thread) is always recorded as is; every
+    other thread except the sampler is recorded under a `[thread-name]`
+    root frame unless it is idle (blocked in threading/queue/selectors).
+    """
+    
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL_SECONDS) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident != self.thread_id and frame.f_code.co_filename.endswith(IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if ident != self.thread_id:
+                    stack.append(f"[{names.get(ident, ident)}]")
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+    
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in ("site-packages/", "/apps/", "/libs/"):
+        if marker in filename:
+            filename = filename.rsplit(marker, 1)[1]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware; see module docstring."""
+    
+    def __init__(
+        self,
+        app,
+        secret: str = "",
+        sample_rate: float = 0.0,
+        mode: str = "sample",
+        output_dir: str = "x-log/profiles",
+        keep: int = 50,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of: {', '.join(MODES)}")
+        self.app = app
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.keep = keep
+        self._busy = threading.Lock()
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        if not self._should_profile(headers) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send, headers)
+        finally:
+            self._busy.release()
+    
+    def _should_profile(self, headers) -> bool:
+        if "x-profile" in headers:
+            return verify_profile_header(self.secret, headers["x-profile"])
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    async def _profile(self, scope, receive, send, headers) -> None:
+        mode = headers.get("x-profile-mode", self.mode)
+        if mode not in MODES:
+            mode = self.mode
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{'.folded' if mode == 'sample' else '.prof'}"
+        
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", name.encode())]}
+            await send(message)
+        
+        if mode == "sample":
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if mode == "sample":
+                profiler.stop()
+            else:
+                profiler.disable()
+            try:
+                self._write(name, profiler)
+                logger.info("Profiled %s %s in %.1f ms -> %s", scope.get("method"), scope.get("path"), elapsed_ms, name)
+            except OSError as exc:
+                logger.warning("Could not write profile %s: %s", name, exc)
+    
+    def _write(self, name: str, profiler) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / name
+        if isinstance(profiler, StackSampler):
+            path.write_text(profiler.folded())
+        else:
+            profiler.dump_stats(str(path))
+        self._prune()
+    
+    def _prune(self) -> None:
+        files = sorted(
+            (p for p in self.output_dir.iterdir() if p.suffix in PROFILE_SUFFIXES),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for stale in files[:max(0, len(files) - self.keep)]:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
@@ -1,13 +1,13 @@
 """
 GraphQL Resolvers - Strawberry type definitions
 
-Exports the merged Query type for use in main.py.
+Exports the merged Query and Subscription types for use in main.py.
 """
 
 import strawberry
 
 from .ping import PingQuery
-from .stock import StockQuery
+from .stock import StockQuery, StockSubscription
 
 
 @strawberry.type
@@ -16,5 +16,11 @@ class Query(PingQuery, StockQuery):
     pass
 
 
-__all__ = ["Query"]
+@strawberry.type
+class Subscription(StockSubscription):
+    """Root Subscription type - aggregates all domain subscriptions."""
+    pass
+
+
+__all__ = ["Query", "Subscription"]
 
@@ -4,11 +4,36 @@ Stock Resolvers - Market domain queries.
 Corresponds to: libs/schema/market/market.graphql
 """
 
-from typing import Optional
+import asyncio
+from typing import AsyncGenerator, Optional
 
 import strawberry
 from strawberry.types import Info
 
+# Upper bound for k in similarity queries
+MAX_SIMILAR = 100
+
+# Upper bound for limit in pegStocks
+MAX_PEG_STOCKS = 1000
+
+# Upper bound for symbols per subscription
+MAX_SUBSCRIBED_SYMBOLS = 100
+
+
+@strawberry.type
+class FactorValue:
+    """Precomputed cross-sectional factor (percentile or z-score)."""
+    name: str
+    value: Optional[float] = None
+
+
+@strawberry.input
+class FactorFilter:
+    """Inclusive bounds on one factor, e.g. peg_ratio_sector_pct <= 0.2."""
+    factor: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+
 
 @strawberry.type
 class PegStock:
@@ -18,6 +43,34 @@ class PegStock:
     pe_ratio: Optional[float] = strawberry.field(name="peRatio", default=None)
     earnings_growth: Optional[float] = strawberry.field(name="earningsGrowth", default=None)
     peg_ratio: Optional[float] = strawberry.field(name="pegRatio", default=None)
+    factors: list[FactorValue] = strawberry.field(default_factory=list)
+
+
+@strawberry.type
+class SectorSummary:
+    """Precomputed sector aggregates over members' latest earnings."""
+    name: str
+    company_count: int = strawberry.field(name="companyCount")
+    reporting_count: int = strawberry.field(name="reportingCount")
+    pe_median: Optional[float] = strawberry.field(name="peMedian", default=None)
+    pe_p25: Optional[float] = strawberry.field(name="peP25", default=None)
+    pe_p75: Optional[float] = strawberry.field(name="peP75", default=None)
+    peg_median: Optional[float] = strawberry.field(name="pegMedian", default=None)
+    peg_p25: Optional[float] = strawberry.field(name="pegP25", default=None)
+    peg_p75: Optional[float] = strawberry.field(name="pegP75", default=None)
+    growth_median: Optional[float] = strawberry.field(name="growthMedian", default=None)
+    growth_p25: Optional[float] = strawberry.field(name="growthP25", default=None)
+    growth_p75: Optional[float] = strawberry.field(name="growthP75", default=None)
+    positive_growth_ratio: Optional[float] = strawberry.field(name="positiveGrowthRatio", default=None)
+    computed_at: Optional[float] = strawberry.field(name="computedAt", default=None)
+
+
+@strawberry.type
+class SimilarCompany:
+    """Company ranked by embedding similarity."""
+    symbol: str
+    name: str
+    score: float
 
 
 @strawberry.type
@@ -80,10 +133,43 @@ class NewsItem:
 
 @strawberry.type
 class SingleStockPage:
-    """Single stock page aggregated data."""
+    """
+    Single stock page aggregated data.
+    
+    `stock` comes from the metadata read; `dailyKline` and `news` are each
+    fetched by their own resolver, in a worker thread, so they can be
+    delivered incrementally (`@stream` / `@defer`) without holding back
+    the header.
+    """
     stock: Stock
-    daily_kline: list[KLinePoint] = strawberry.field(name="dailyKline")
-    news: list[NewsItem]
+    symbol: strawberry.Private[str]
+    
+    @strawberry.field(name="dailyKline")
+    async def daily_kline(self, info: Info) -> strawberry.Streamable[KLinePoint]:
+        """Daily OHLCV bars, oldest first (streamable)."""
+        service = info.context["stock_service"]
+        for row in await asyncio.to_thread(service.get_stock_kline, self.symbol):
+            yield _to_kline_point(row)
+    
+    @strawberry.field
+    async def news(self, info: Info) -> list[NewsItem]:
+        """News items for the stock (deferrable)."""
+        service = info.context["stock_service"]
+        return [_to_news_item(item) for item in await asyncio.to_thread(service.get_stock_news, self.symbol)]
+
+
+@strawberry.type
+class QuoteUpdate:
+    """Latest K-line bar written for a symbol."""
+    symbol: str
+    bar: KLinePoint
+
+
+@strawberry.type
+class NewsAdded:
+    """News item newly linked to a symbol."""
+    symbol: str
+    news: NewsItem
 
 
 @strawberry.type
@@ -91,10 +177,28 @@ class StockQuery:
     """Stock domain queries."""
     
     @strawberry.field
-    def peg_stocks(self, info: Info) -> list[PegStock]:
-        """List PEG watchlist candidates."""
+    def peg_stocks(
+        self,
+        info: Info,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        filters: Optional[list[FactorFilter]] = None,
+        limit: Optional[int] = None,
+    ) -> list[PegStock]:
+        """
+        List PEG watchlist candidates, optionally filtered/sorted by factor.
+        
+        limit must be >= 0 and is capped at MAX_PEG_STOCKS.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must be >= 0, got {limit}")
         service = info.context["stock_service"]
-        candidates = service.list_peg_candidates()
+        candidates = service.list_peg_candidates(
+            sort_by=sort_by,
+            descending=descending,
+            filters=[{"factor": f.factor, "min": f.min, "max": f.max} for f in filters or []],
+            limit=MAX_PEG_STOCKS if limit is None else min(limit, MAX_PEG_STOCKS),
+        )
         return [
             PegStock(
                 symbol=entry.get("symbol", ""),
@@ -102,18 +206,70 @@ class StockQuery:
                 pe_ratio=entry.get("pe_ratio"),
                 earnings_growth=entry.get("earnings_growth"),
                 peg_ratio=entry.get("peg_ratio"),
+                factors=[
+                    FactorValue(name=name, value=value)
+                    for name, value in (entry.get("factors") or {}).items()
+                ],
             )
             for entry in candidates
         ]
     
     @strawberry.field
     def single_stock(self, info: Info, symbol: str) -> Optional[SingleStockPage]:
-        """Fetch single stock page data by symbol."""
+        """
+        Fetch single stock page data by symbol.
+        
+        Only the metadata is read here; kline and news are resolved on
+        demand, e.g. `dailyKline @stream(initialCount: 0)` and
+        `... @defer { news { title } }`.
+        """
         service = info.context["stock_service"]
-        payload = service.get_single_stock_page(symbol)
-        if not payload:
+        meta = service.get_stock_meta(symbol)
+        if not meta:
             return None
-        return _to_single_stock_page(payload)
+        return _to_single_stock_page(meta)
+    
+    @strawberry.field
+    def sectors(self, info: Info) -> list[SectorSummary]:
+        """List sector aggregates (median PE/PEG/growth, breadth)."""
+        service = info.context["stock_service"]
+        return [SectorSummary(**entry) for entry in service.list_sectors()]
+    
+    @strawberry.field
+    def similar_companies(self, info: Info, symbol: str, k: int = 10) -> list[SimilarCompany]:
+        """Companies most similar to symbol by embedding."""
+        service = info.context["stock_service"]
+        return [
+            SimilarCompany(symbol=entry["symbol"], name=entry["name"], score=entry["score"])
+            for entry in service.similar_companies(symbol, min(k, MAX_SIMILAR))
+        ]
+    
+    @strawberry.field
+    def related_news(self, info: Info, symbol: str, k: int = 10) -> list[NewsItem]:
+        """News articles most related to symbol by embedding."""
+        service = info.context["stock_service"]
+        return [_to_news_item(item) for item in service.related_news(symbol, min(k, MAX_SIMILAR))]
+
+
+@strawberry.type
+class StockSubscription:
+    """Stock domain subscriptions (graphql-transport-ws / graphql-ws)."""
+    
+    @strawberry.subscription
+    async def quote_updated(self, info: Info, symbols: list[str]) -> AsyncGenerator[QuoteUpdate, None]:
+        """Push the latest bar of any of symbols as it is written."""
+        service = info.context["stock_service"]
+        async with service.subscribe("quote", symbols[:MAX_SUBSCRIBED_SYMBOLS], _to_quote_update) as queue:
+            while True:
+                yield await queue.get()
+    
+    @strawberry.subscription
+    async def news_added(self, info: Info, symbols: list[str]) -> AsyncGenerator[NewsAdded, None]:
+        """Push news items as they are added for any of symbols."""
+        service = info.context["stock_service"]
+        async with service.subscribe("news", symbols[:MAX_SUBSCRIBED_SYMBOLS], _to_news_added) as queue:
+            while True:
+                yield await queue.get()
 
 
 def _maybe_float(value) -> Optional[float]:
@@ -124,41 +280,51 @@ def _maybe_float(value) -> Optional[float]:
         return None
 
 
-def _to_single_stock_page(payload: dict) -> SingleStockPage:
-    """Convert raw payload to SingleStockPage type."""
-    company_info = _to_company_info(payload)
+def _to_single_stock_page(meta: dict) -> SingleStockPage:
+    """Convert raw metadata to SingleStockPage type (kline/news resolve lazily)."""
+    company_info = _to_company_info(meta)
     
     stock = Stock(
-        symbol=payload.get("symbol", ""),
-        name=payload.get("name", ""),
-        exchange=payload.get("exchange", ""),
-        currency=payload.get("currency", ""),
+        symbol=meta.get("symbol", ""),
+        name=meta.get("name", ""),
+        exchange=meta.get("exchange", ""),
+        currency=meta.get("currency", ""),
         company_info=company_info,
     )
     
-    daily_kline = [
-        KLinePoint(
-            timestamp=float(row.get("timestamp", 0)),
-            open=_maybe_float(row.get("open")),
-            high=_maybe_float(row.get("high")),
-            low=_maybe_float(row.get("low")),
-            close=_maybe_float(row.get("close")),
-            volume=_maybe_float(row.get("volume")),
-        )
-        for row in payload.get("daily_kline") or []
-    ]
-    
-    news = [
-        NewsItem(
-            title=item.get("title", ""),
-            url=item.get("url"),
-            source=item.get("source"),
-            published_at=_maybe_float(item.get("published_at")),
-        )
-        for item in payload.get("news") or []
-    ]
-    
-    return SingleStockPage(stock=stock, daily_kline=daily_kline, news=news)
+    return SingleStockPage(stock=stock, symbol=stock.symbol)
+
+
+def _to_kline_point(row: dict) -> KLinePoint:
+    """Convert raw kline row to KLinePoint type."""
+    return KLinePoint(
+        timestamp=float(row.get("timestamp", 0)),
+        open=_maybe_float(row.get("open")),
+        high=_maybe_float(row.get("high")),
+        low=_maybe_float(row.get("low")),
+        close=_maybe_float(row.get("close")),
+        volume=_maybe_float(row.get("volume")),
+    )
+
+
+def _to_quote_update(symbol: str, row: dict) -> QuoteUpdate:
+    """Convert a quote event; built once per subscriber group."""
+    return QuoteUpdate(symbol=symbol, bar=_to_kline_point(row))
+
+
+def _to_news_added(symbol: str, item: dict) -> NewsAdded:
+    """Convert a news event; built once per subscriber group."""
+    return NewsAdded(symbol=symbol, news=_to_news_item(item))
+
+
+def _to_news_item(item: dict) -> NewsItem:
+    """Convert raw news dict to NewsItem type."""
+    return NewsItem(
+        title=item.get("title", ""),
+        url=item.get("url"),
+        source=item.get("source"),
+        published_at=_maybe_float(item.get("published_at")),
+    )
 
 
 def _to_company_info(payload: dict) -> CompanyInfo:
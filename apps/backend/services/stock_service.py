@@ -4,9 +4,13 @@ Stock Service - Business logic layer.
 Sits between GraphQL resolvers and repository layer.
 """
 
-from typing import Any, Dict, List, Optional
+from contextlib import AbstractAsyncContextManager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from neo4j_repo import StockRepository
+from libs.events import EventBus, bus
+
+if TYPE_CHECKING:
+    from neo4j_repo import StockRepository
 
 
 class StockService:
@@ -20,8 +24,10 @@ class StockService:
     - Cross-entity operations
     """
     
-    def __init__(self, repo: StockRepository) -> None:
+    def __init__(self, repo: "StockRepository", events: Optional[EventBus] = None) -> None:
         self.repo = repo
+        self.events = events if events is not None else bus
+        self._write_listeners: List[Callable[[str], Any]] = []
     
     def get_single_stock_page(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -31,15 +37,106 @@ class StockService:
         """
         return self.repo.fetch_stock_payload(symbol)
     
-    def list_peg_candidates(self) -> List[Dict[str, Any]]:
+    def get_stock_meta(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Single stock page header: the payload without daily_kline / news.
+        
+        Reads no kline/news data, so it is the cheapest page section.
+        """
+        return self.repo.fetch_stock_meta(symbol)
+    
+    def get_stock_kline(self, symbol: str) -> List[Dict[str, Any]]:
+        """Daily K-line rows (timestamp, open, high, low, close, volume)."""
+        return self.repo.fetch_stock_kline(symbol) or []
+    
+    def get_stock_news(self, symbol: str) -> List[Dict[str, Any]]:
+        """News items (title, url, source, published_at)."""
+        return self.repo.fetch_stock_news(symbol) or []
+    
+    def list_peg_candidates(
+        self,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List PEG watchlist candidates, optionally filtered/sorted by factors.
+        
+        Returns list of: symbol, name, pe_ratio, earnings_growth, peg_ratio, factors
+        """
+        return self.repo.list_peg_candidates(sort_by, descending, filters, limit)
+    
+    def list_sectors(self) -> List[Dict[str, Any]]:
+        """
+        List precomputed sector aggregates.
+        
+        Returns list of: name, company_count, pe/peg/growth median + quartiles, ...
+        """
+        return self.repo.list_sectors()
+    
+    def similar_companies(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
         """
-        List PEG watchlist candidates.
+        Companies nearest to `symbol` by embedding.
         
-        Returns list of: symbol, name, pe_ratio, earnings_growth, peg_ratio
+        Returns list of: symbol, name, score (cosine similarity)
         """
-        return self.repo.list_peg_candidates()
+        return self.repo.similar_companies(symbol, k)
+    
+    def related_news(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
+        """News articles nearest to `symbol`'s company embedding."""
+        return self.repo.related_news(symbol, k)
     
     def upsert_stock(self, payload: Dict[str, Any]) -> None:
-        """Upsert stock data."""
+        """
+        Upsert stock data and publish live events for it.
+        
+        Publishes the latest kline bar ("quote") and, while someone is
+        subscribed to the symbol's news, each news item not stored before
+        ("news"; needs one extra read to diff against).
+        """
+        symbol = (payload.get("symbol") or "").upper()
+        previous = None
+        watch_news = bool(symbol) and self.events.has_subscribers("news", symbol)
+        if watch_news:
+            previous = self.repo.fetch_stock_payload(symbol) or {}
         self.repo.upsert_stock_payload(payload)
+        if symbol:
+            for listener in self._write_listeners:
+                listener(symbol)
+            self.events.publish_many(_stock_events(symbol, payload, previous if watch_news else None))
+    
+    def add_write_listener(self, listener: Callable[[str], Any]) -> None:
+        """Call `listener(symbol)` after every upsert_stock (e.g. cache invalidation)."""
+        self._write_listeners.append(listener)
+    
+    def subscribe(
+        self,
+        topic: str,
+        symbols: Iterable[str],
+        transform: Optional[Callable[[str, dict], Any]] = None,
+    ) -> AbstractAsyncContextManager:
+        """
+        Live events for symbols (topic "quote" or "news").
+        
+        Returns an async context manager yielding an asyncio.Queue.
+        """
+        return self.events.subscribe(topic, symbols, transform)
+
+
+def _stock_events(
+    symbol: str,
+    payload: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Quote event for the latest bar; news events for items missing from `previous`."""
+    kline = payload.get("daily_kline") or []
+    if kline:
+        yield "quote", symbol, max(kline, key=lambda row: row.get("timestamp") or 0)
+    if previous is None:
+        return
+    seen = {item.get("url") or item.get("title") for item in previous.get("news") or []}
+    for item in payload.get("news") or []:
+        if (item.get("url") or item.get("title")) not in seen:
+            yield "news", symbol, item
 
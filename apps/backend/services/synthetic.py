@@ -0,0 +1,349 @@
+"""
+Synthetic Universe - Production-sized fake data for benchmarks.
+
+Extends seed.build_sample_payload with realistic data for N tickers x M years:
+- quarterly earnings (EPS trend + noise, revenue, P/E and YoY TTM growth)
+- daily OHLCV anchored to trend EPS, with a mean-reverting P/E random walk
+- news articles and sector/industry assignment
+- optional company embeddings clustered by sector
+
+Each ticker draws from its own generator seeded with (seed, index), so ticker
+#i is identical at every scale and across runs.
+
+Two sinks:
+- StockDocument payloads (same shape as build_sample_payload) upserted
+  through StockRepository - what singleStock / pegStocks read.
+- Pipeline NDJSON.gz files per data type, for
+  `manage.py create_batch --type <type> --file <path>` in apps/cms.
+
+Usage:
+    PYTHONPATH=apps/backend:libs:. python -m apps.backend.services.synthetic --scale medium --documents
+    PYTHONPATH=apps/backend:libs:. python -m apps.backend.services.synthetic --tickers 50 --years 10 --records-dir x-data/synthetic
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .seed import build_sample_payload
+
+SCALES = {"small": 10, "medium": 1_000, "large": 10_000}
+
+# Fixed anchor so the same seed always yields the same dates
+DEFAULT_END = date(2025, 12, 31)
+TRADING_DAYS_PER_YEAR = 252
+PE_REVERSION = 0.995  # daily AR(1) coefficient of log P/E around its level
+NEWS_PER_MONTH = 2
+
+SECTORS = {
+    "Technology": ["Software", "Semiconductors", "IT Services"],
+    "Healthcare": ["Biotechnology", "Medical Devices", "Pharmaceuticals"],
+    "Financials": ["Banks", "Insurance", "Asset Management"],
+    "Consumer Discretionary": ["Retail", "Automobiles", "Leisure"],
+    "Industrials": ["Machinery", "Aerospace", "Transportation"],
+    "Energy": ["Oil & Gas", "Renewables"],
+    "Utilities": ["Electric Utilities", "Water Utilities"],
+    "Materials": ["Chemicals", "Metals & Mining"],
+}
+SECTOR_NAMES = sorted(SECTORS)
+EXCHANGES = ["NASDAQ", "NYSE", "AMEX"]
+NEWS_SOURCES = ["Reuters", "Bloomberg", "WSJ", "CNBC", "MarketWatch"]
+NEWS_TEMPLATES = [
+    "{name} beats quarterly estimates",
+    "{name} misses revenue expectations",
+    "{name} announces share buyback",
+    "{name} expands into new markets",
+    "Analysts upgrade {name}",
+    "Analysts downgrade {name}",
+    "{name} names new CFO",
+    "{name} unveils product roadmap",
+]
+
+
+@dataclass
+class SyntheticTicker:
+    """Everything generated for one ticker."""
+    symbol: str
+    name: str
+    sector: str
+    industry: str
+    exchange: str
+    quotes: List[Dict[str, Any]] = field(default_factory=list)
+    earnings: List[Dict[str, Any]] = field(default_factory=list)
+    news: List[Dict[str, Any]] = field(default_factory=list)
+    embedding: Optional[List[float]] = None
+
+
+def ticker_symbol(index: int) -> str:
+    """Unique 4-letter symbol per index (AAAA, AAAB, ...; 456k max)."""
+    letters = []
+    for _ in range(4):
+        index, rem = divmod(index, 26)
+        letters.append(chr(ord("A") + rem))
+    return "".join(reversed(letters))
+
+
+def trading_days(end: date, years: int) -> List[date]:
+    """Weekdays in the `years` before `end` (holidays ignored)."""
+    start = end - timedelta(days=round(years * 365.25))
+    days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    weekdays = days[np.is_busday(days)]
+    return [d.astype(object) for d in weekdays]
+
+
+def _epoch_ms(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def generate_ticker(index: int, days: List[date], seed: int = 42, embedding_dim: int = 0) -> SyntheticTicker:
+    """Generate one ticker deterministically from (seed, index)."""
+    rng = np.random.default_rng([seed, index])
+    symbol = ticker_symbol(index)
+    sector = SECTOR_NAMES[index % len(SECTOR_NAMES)]
+    industries = SECTORS[sector]
+    ticker = SyntheticTicker(
+        symbol=symbol,
+        name=f"{symbol.title()} {rng.choice(['Corp', 'Inc.', 'Holdings', 'Group'])}",
+        sector=sector,
+        industry=industries[int(rng.integers(len(industries)))],
+        exchange=EXCHANGES[int(rng.integers(len(EXCHANGES)))],
+    )
+    n = len(days)
+    
+    # Earnings trend per calendar quarter that has trading days
+    quarter_ends: Dict[str, int] = {}
+    for i, day in enumerate(days):
+        quarter_ends[f"{day.year}Q{(day.month - 1) // 3 + 1}"] = i
+    periods = list(quarter_ends)
+    eps_trend = rng.uniform(0.2, 3.0) * np.exp(np.cumsum(rng.normal(rng.normal(0.02, 0.03), 0.05, len(periods))))
+    eps = eps_trend * (1 + rng.normal(0, 0.15, len(periods)))
+    shares = rng.uniform(5e7, 5e9)
+    
+    # Prices: annualized trend EPS x a P/E whose log follows a mean-reverting
+    # random walk, plus overnight gaps and an intraday range
+    vol = rng.uniform(0.15, 0.60) / np.sqrt(TRADING_DAYS_PER_YEAR)
+    fundamental = 4 * np.interp(np.arange(n), list(quarter_ends.values()), eps_trend)
+    shocks = rng.normal(0, vol, n)
+    log_pe = np.empty(n)
+    level = 0.0
+    for i in range(n):
+        level = PE_REVERSION * level + shocks[i]
+        log_pe[i] = level
+    close = fundamental * rng.lognormal(np.log(20), 0.4) * np.exp(log_pe)
+    prev_close = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev_close * np.exp(rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+    volume = rng.lognormal(np.log(rng.uniform(2e5, 2e7)), 0.4, n).round()
+    ticker.quotes = [
+        {
+            "ticker": symbol,
+            "date": day.isoformat(),
+            "open": round(float(open_[i]), 4),
+            "high": round(float(high[i]), 4),
+            "low": round(float(low[i]), 4),
+            "close": round(float(close[i]), 4),
+            "volume": float(volume[i]),
+        }
+        for i, day in enumerate(days)
+    ]
+    
+    # Earnings reports, P/E and YoY TTM growth as of the quarter's last trading day
+    for q, period in enumerate(periods):
+        ttm = eps[max(0, q - 3):q + 1].sum() if q >= 3 else None
+        prev_ttm = eps[q - 7:q - 3].sum() if q >= 7 else None
+        price = close[quarter_ends[period]]
+        report = {
+            "ticker": symbol,
+            "fiscal_period": period,
+            "fiscal_year": int(period[:4]),
+            "fiscal_quarter": int(period[-1]),
+            "eps": round(float(eps[q]), 4),
+            "eps_estimated": round(float(eps_trend[q]), 4),
+            "revenue": round(float(abs(eps[q]) * shares * rng.uniform(4, 12)), 2),
+            "pe_ratio": round(float(price / ttm), 4) if ttm and ttm > 0 else None,
+            "eps_growth": round(float(ttm / prev_ttm - 1), 4) if ttm and prev_ttm and prev_ttm > 0 else None,
+            "report_date": days[quarter_ends[period]].isoformat(),
+        }
+        ticker.earnings.append(report)
+    
+    # News: a few articles per month
+    months = max(1, n // 21)
+    count = int(rng.poisson(NEWS_PER_MONTH * months))
+    picks = np.sort(rng.integers(0, n, count))
+    ticker.news = [
+        {
+            "article_id": f"syn-{symbol}-{k}",
+            "title": NEWS_TEMPLATES[int(rng.integers(len(NEWS_TEMPLATES)))].format(name=ticker.name),
+            "url": f"https://example.com/news/{symbol.lower()}-{k}",
+            "source_name": NEWS_SOURCES[int(rng.integers(len(NEWS_SOURCES)))],
+            "published_at": days[i].isoformat() + "T13:30:00+00:00",
+            "tickers": [symbol],
+        }
+        for k, i in enumerate(picks)
+    ]
+    
+    # Embedding: shared sector direction + idiosyncratic noise
+    if embedding_dim:
+        center = np.random.default_rng([seed, 10_000_000 + SECTOR_NAMES.index(sector)]).normal(size=embedding_dim)
+        vector = center + rng.normal(0, 0.7, embedding_dim)
+        ticker.embedding = [round(float(v), 6) for v in vector / np.linalg.norm(vector)]
+    return ticker
+
+
+def iter_universe(
+    tickers: int,
+    years: int = 5,
+    seed: int = 42,
+    end: date = DEFAULT_END,
+    embedding_dim: int = 0,
+) -> Iterator[SyntheticTicker]:
+    """Stream generated tickers one at a time (memory stays per-ticker)."""
+    days = trading_days(end, years)
+    for index in range(tickers):
+        yield generate_ticker(index, days, seed, embedding_dim)
+
+
+def to_stock_payload(ticker: SyntheticTicker) -> Dict[str, Any]:
+    """StockDocument payload, built on build_sample_payload."""
+    payload = build_sample_payload(ticker.symbol, metadata={
+        "name": ticker.name,
+        "exchange": ticker.exchange,
+        "sector": ticker.sector,
+        "industry": ticker.industry,
+        "description": f"Synthetic {ticker.industry.lower()} company ({ticker.sector})",
+    })
+    latest = next((r for r in reversed(ticker.earnings) if r["pe_ratio"] is not None), None)
+    growth = next((r["eps_growth"] for r in reversed(ticker.earnings) if r["eps_growth"] is not None), None)
+    pe_ratio = latest["pe_ratio"] if latest else None
+    payload["valuation"]["pe_ratio"] = pe_ratio
+    payload["indicators"]["eps"] = ticker.earnings[-1]["eps"] if ticker.earnings else None
+    payload["metrics"] = {
+        "earnings_growth": growth,
+        "peg_ratio": round(pe_ratio / (growth * 100), 4) if pe_ratio and growth and growth > 0 else None,
+    }
+    payload["daily_kline"] = [
+        {
+            "timestamp": _epoch_ms(date.fromisoformat(q["date"])),
+            "open": q["open"],
+            "high": q["high"],
+            "low": q["low"],
+            "close": q["close"],
+            "volume": q["volume"],
+        }
+        for q in ticker.quotes
+    ]
+    payload["news"] = [
+        {
+            "title": n["title"],
+            "url": n["url"],
+            "source": n["source_name"],
+            "published_at": datetime.fromisoformat(n["published_at"]).timestamp() * 1000,
+        }
+        for n in reversed(ticker.news)
+    ]
+    return payload
+
+
+def to_pipeline_records(ticker: SyntheticTicker) -> Dict[str, List[Dict[str, Any]]]:
+    """Records per pipeline data type (company/quote/earnings/news)."""
+    company = {
+        "ticker": ticker.symbol,
+        "name": ticker.name,
+        "exchange": ticker.exchange,
+        "sector": ticker.sector,
+        "industry": ticker.industry,
+    }
+    if ticker.embedding:
+        company["embedding"] = ticker.embedding
+    return {
+        "company": [company],
+        "quote": ticker.quotes,
+        "earnings": ticker.earnings,
+        "news": [{k: v for k, v in n.items() if k != "tickers"} for n in ticker.news],
+    }
+
+
+class RecordWriter:
+    """Stream pipeline records into <directory>/<type>.ndjson.gz."""
+    
+    DATA_TYPES = ("company", "quote", "earnings", "news")
+    
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.counts = dict.fromkeys(self.DATA_TYPES, 0)
+        self._files: Dict[str, Any] = {}
+    
+    def __enter__(self) -> "RecordWriter":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files = {
+            t: gzip.open(self.directory / f"{t}.ndjson.gz", "wt", encoding="utf-8")
+            for t in self.DATA_TYPES
+        }
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        for handle in self._files.values():
+            handle.close()
+    
+    def write(self, ticker: SyntheticTicker) -> None:
+        for data_type, records in to_pipeline_records(ticker).items():
+            handle = self._files[data_type]
+            for record in records:
+                handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.counts[data_type] += len(records)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic stock universe")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=SCALES, help="Preset ticker count (small=10, medium=1k, large=10k)")
+    size.add_argument("--tickers", type=int, help="Number of tickers")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END, help="Last trading day (YYYY-MM-DD)")
+    parser.add_argument("--embedding-dim", type=int, default=0, help="Add company embeddings of this size")
+    parser.add_argument("--documents", action="store_true", help="Upsert StockDocument payloads via StockRepository")
+    parser.add_argument("--records-dir", type=Path, help="Write pipeline NDJSON.gz files here")
+    args = parser.parse_args(argv)
+    
+    if not args.documents and not args.records_dir:
+        parser.error("choose at least one sink: --documents and/or --records-dir")
+    count = args.tickers or SCALES[args.scale or "small"]
+    started = time.monotonic()
+    
+    repo = None
+    if args.documents:
+        from neo4j_repo import StockRepository
+        repo = StockRepository()
+    
+    with ExitStack() as stack:
+        writer = stack.enter_context(RecordWriter(args.records_dir)) if args.records_dir else None
+        universe = iter_universe(count, args.years, args.seed, args.end, args.embedding_dim)
+        for done, ticker in enumerate(universe, start=1):
+            if repo:
+                repo.upsert_stock_payload(to_stock_payload(ticker))
+            if writer:
+                writer.write(ticker)
+            if done % 100 == 0 or done == count:
+                print(f"[synthetic] {done}/{count} tickers ({time.monotonic() - started:.1f}s)")
+    
+    if writer:
+        print(f"[synthetic] wrote {writer.counts} to {args.records_dir}")
+        print("[synthetic] load in apps/cms with: python manage.py create_batch --source synthetic "
+              f"--type <company|quote|earnings|news> --file {args.records_dir}/<type>.ndjson.gz")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,380 @@
+"""
+Stale-while-revalidate snapshots of serialized singleStock responses.
+
+SnapshotMiddleware keeps the complete response body of `singleStock`
+queries, keyed by the request body (query document + variables), so a
+popular page is answered from memory without parsing, executing or
+serializing anything. Eligible requests are POSTs to /graphql whose
+operation is a query selecting only `singleStock` fields and using no
+@defer / @stream; responses are kept only when they carry no errors.
+
+Freshness:
+- A snapshot is fresh for SNAPSHOT_TTL_SECONDS, or until
+  StockService.upsert_stock writes one of its symbols.
+- A stale snapshot is still served (`X-Snapshot: stale`) while it is
+  rebuilt in the background, by replaying the original request through the
+  app. Writes start that rebuild right away.
+- Every write bumps a per-symbol generation. A response built while a
+  write to one of its symbols landed may hold pre-write data, so it is
+  never stored as fresh: it is kept stale (or dropped if a snapshot
+  already exists) and another rebuild is scheduled.
+- Snapshots older than SNAPSHOT_MAX_AGE_SECONDS are never served; the
+  request runs normally and its response replaces the snapshot.
+
+The store is an LRU bounded by SNAPSHOT_MAX_ENTRIES and SNAPSHOT_CACHE_MB,
+so it holds the most requested symbols. Writes made by other processes
+(e.g. seeding scripts) are only picked up through the TTL.
+
+Usage:
+    store = SnapshotStore(max_entries=500, max_bytes=128 * 1024 * 1024, ttl=300, max_age=3600)
+    app.add_middleware(SnapshotMiddleware, store=store)
+    stock_service.add_write_listener(store.invalidate)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FIELD = "singleStock"
+REPLAY_HEADERS = (b"content-type", b"accept", b"host")
+
+
+@dataclass
+class Snapshot:
+    """Serialized response plus the request that rebuilds it."""
+    body: bytes
+    headers: List[Tuple[bytes, bytes]]
+    symbols: Tuple[str, ...]
+    scope: Dict[str, Any]
+    request_body: bytes
+    built_at: float = field(default_factory=time.monotonic)
+    stale: bool = False
+
+
+class SnapshotStore:
+    """LRU of snapshots keyed by request digest, bounded by count and bytes."""
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, max_age: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_age = max_age
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.on_stale: Optional[Callable[[List[bytes]], None]] = None
+        self._entries: "OrderedDict[bytes, Snapshot]" = OrderedDict()
+        self._by_symbol: Dict[str, Set[bytes]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: bytes, now: Optional[float] = None) -> Tuple[Optional[Snapshot], bool]:
+        """(snapshot to serve or None, whether it needs a rebuild)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None or now - snapshot.built_at > self.max_age:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            stale = snapshot.stale or now - snapshot.built_at > self.ttl
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return snapshot, stale
+    
+    def peek(self, key: bytes) -> Optional[Snapshot]:
+        with self._lock:
+            return self._entries.get(key)
+    
+    def generation(self, symbols: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Write generation of `symbols`; take it before building a response."""
+        with self._lock:
+            return tuple(self._generations.get(symbol, 0) for symbol in symbols)
+    
+    def put(self, key: bytes, snapshot: Snapshot, generation: Optional[Tuple[int, ...]] = None) -> bool:
+        """
+        Store a snapshot built from data as of `generation`.
+        
+        Returns False if a symbol was written since then: the snapshot is
+        then stored stale (or dropped when `key` already has one) and the
+        caller should rebuild it.
+        """
+        if self.max_entries <= 0 or len(snapshot.body) > self.max_bytes:
+            return True
+        with self._lock:
+            current = tuple(self._generations.get(symbol, 0) for symbol in snapshot.symbols)
+            if generation is not None and generation != current:
+                if key in self._entries:
+                    return False
+                snapshot.stale = True
+            self._remove(key)
+            self._entries[key] = snapshot
+            self.size += len(snapshot.body)
+            for symbol in snapshot.symbols:
+                self._by_symbol.setdefault(symbol, set()).add(key)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return not snapshot.stale
+    
+    def invalidate(self, symbol: str) -> int:
+        """Bump `symbol`'s generation, mark its snapshots stale and request their rebuild."""
+        symbol = symbol.upper()
+        with self._lock:
+            self._generations[symbol] = self._generations.get(symbol, 0) + 1
+            keys = list(self._by_symbol.get(symbol, ()))
+            for key in keys:
+                self._entries[key].stale = True
+        if keys and self.on_stale is not None:
+            self.on_stale(keys)
+        return len(keys)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_symbol.clear()
+            self.size = 0
+    
+    def _remove(self, key: bytes) -> None:
+        snapshot = self._entries.pop(key, None)
+        if snapshot is None:
+            return
+        self.size -= len(snapshot.body)
+        for symbol in snapshot.symbols:
+            keys = self._by_symbol.get(symbol)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_symbol[symbol]
+
+
+@lru_cache(maxsize=256)
+def _snapshot_plan(query: str, operation_name: Optional[str]) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """
+    Where each `singleStock(symbol:)` takes its symbol from, as
+    ("variable", name) / ("value", literal); None if the document is not
+    eligible for snapshots.
+    """
+    if "@defer" in query or "@stream" in query:
+        return None
+    from graphql import GraphQLError, parse
+    from graphql.language import FieldNode, OperationDefinitionNode, StringValueNode, VariableNode
+    
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return None
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if operation_name:
+        operations = [op for op in operations if op.name and op.name.value == operation_name]
+    if len(operations) != 1 or len(document.definitions) != 1 or operations[0].operation.value != "query":
+        return None
+    sources = []
+    for selection in operations[0].selection_set.selections:
+        if not isinstance(selection, FieldNode) or selection.name.value != SNAPSHOT_FIELD or selection.directives:
+            return None
+        for argument in selection.arguments:
+            if argument.name.value != "symbol":
+                continue
+            if isinstance(argument.value, VariableNode):
+                sources.append(("variable", argument.value.name.value))
+            elif isinstance(argument.value, StringValueNode):
+                sources.append(("value", argument.value.value))
+            else:
+                return None
+    return tuple(sources) or None
+
+
+def snapshot_symbols(request: Any) -> Optional[Tuple[str, ...]]:
+    """Symbols shown by a GraphQL request body, or None if it cannot be snapshotted."""
+    if not isinstance(request, dict) or not isinstance(request.get("query"), str):
+        return None
+    plan = _snapshot_plan(request["query"], request.get("operationName"))
+    if plan is None:
+        return None
+    variables = request.get("variables") or {}
+    if not isinstance(variables, dict):
+        return None
+    symbols = []
+    for kind, value in plan:
+        symbol = variables.get(value) if kind == "variable" else value
+        if not isinstance(symbol, str):
+            return None
+        symbols.append(symbol.upper())
+    return tuple(symbols)
+
+
+class SnapshotMiddleware:
+    """ASGI middleware; see module docstring."""
+    
+    def __init__(self, app, store: SnapshotStore, path: str = "/graphql") -> None:
+        self.app = app
+        self.store = store
+        self.path = path.rstrip("/")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refreshing: Set[bytes] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        store.on_stale = self._schedule
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") != self.path:
+            await self.app(scope, receive, send)
+            return
+        body = await _read_body(receive)
+        try:
+            symbols = snapshot_symbols(json.loads(body))
+        except ValueError:
+            symbols = None
+        if symbols is None:
+            await self.app(scope, _replay(body, receive), send)
+            return
+        self._loop = asyncio.get_running_loop()
+        key = hashlib.blake2b(body, digest_size=16).digest()
+        snapshot, stale = self.store.get(key)
+        if snapshot is not None:
+            if stale:
+                self._schedule([key])
+            await _send_snapshot(send, snapshot, b"stale" if stale else b"hit")
+            return
+        
+        generation = self.store.generation(symbols)
+        captured = _Capture(send)
+        await self.app(scope, _replay(body, receive), captured)
+        if captured.ok():
+            current = self.store.put(key, Snapshot(
+                body=captured.body,
+                headers=captured.headers,
+                symbols=symbols,
+                scope=_replay_scope(scope),
+                request_body=body,
+            ), generation)
+            if not current:
+                self._schedule([key])
+    
+    def _schedule(self, keys: List[bytes]) -> None:
+        """Start background rebuilds; callable from any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        for key in keys:
+            self._loop.call_soon_threadsafe(self._start_refresh, key)
+    
+    def _start_refresh(self, key: bytes) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.ensure_future(self._refresh(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _refresh(self, key: bytes) -> None:
+        """Rebuild one snapshot; runs again if a write landed meanwhile."""
+        current = True
+        try:
+            snapshot = self.store.peek(key)
+            if snapshot is None:
+                return
+            generation = self.store.generation(snapshot.symbols)
+            captured = _Capture(None)
+            await self.app(dict(snapshot.scope), _replay(snapshot.request_body), captured)
+            if captured.ok():
+                current = self.store.put(key, Snapshot(
+                    body=captured.body,
+                    headers=captured.headers,
+                    symbols=snapshot.symbols,
+                    scope=snapshot.scope,
+                    request_body=snapshot.request_body,
+                ), generation)
+        except Exception:
+            logger.exception("Snapshot rebuild failed")
+        finally:
+            self._refreshing.discard(key)
+        if not current:
+            self._start_refresh(key)
+
+
+class _Capture:
+    """ASGI send wrapper that records a single-chunk response (and forwards it if `send`)."""
+    
+    def __init__(self, send) -> None:
+        self.send = send
+        self.status = 0
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+        self.chunks = 0
+    
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = [
+                (k, v) for k, v in message.get("headers", [])
+                if k.lower() in (b"content-type", b"content-length")
+            ]
+        elif message["type"] == "http.response.body":
+            self.chunks += 1
+            self.body += message.get("body", b"")
+        if self.send is not None:
+            await self.send(message)
+    
+    def ok(self) -> bool:
+        content_type = dict((k.lower(), v) for k, v in self.headers).get(b"content-type", b"")
+        if self.status != 200 or self.chunks != 1 or not content_type.startswith(b"application/json"):
+            return False
+        try:
+            return "errors" not in json.loads(self.body)
+        except ValueError:
+            return False
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive=None):
+    """Hand an already-read body to the app, then pass through to `receive` (disconnect if none)."""
+    sent = False
+    
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        if receive is not None:
+            return await receive()
+        return {"type": "http.disconnect"}
+    return replay
+
+
+def _replay_scope(scope) -> Dict[str, Any]:
+    """Request scope without credentials or cookies, for background rebuilds."""
+    return {**scope, "headers": [(k, v) for k, v in scope.get("headers", []) if k.lower() in REPLAY_HEADERS]}
+
+
+async def _send_snapshot(send, snapshot: Snapshot, state: bytes) -> None:
+    age = int(time.monotonic() - snapshot.built_at)
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [*snapshot.headers, (b"x-snapshot", state), (b"age", str(age).encode())],
+    })
+    await send({"type": "http.response.body", "body": snapshot.body})
@@ -30,3 +30,15 @@ def client(app):
     from starlette.testclient import TestClient
     with TestClient(app) as client:
         yield client
+
+
+@pytest.fixture
+def memory_client(monkeypatch):
+    """Test client on the in-memory graph backend (no Neo4j required)."""
+    monkeypatch.setenv("GRAPH_BACKEND", "memory")
+    reset_settings_cache()
+    from starlette.testclient import TestClient
+    from apps.backend.main import create_app
+    with TestClient(create_app()) as client:
+        yield client
+    reset_settings_cache()
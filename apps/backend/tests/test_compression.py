@@ -0,0 +1,166 @@
+"""
+Response compression tests (apps/backend/compression.py).
+
+No Neo4j required; the middleware wraps small Starlette apps.
+"""
+
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from apps.backend.compression import (
+    CompressedCache,
+    CompressionMiddleware,
+    compress,
+    negotiate,
+)
+
+PAYLOAD = {"stocks": [{"symbol": f"S{i:04d}", "pe": i * 0.5} for i in range(200)]}
+
+
+def _big(request):
+    return JSONResponse(PAYLOAD)
+
+
+def _small(request):
+    return JSONResponse({"ok": True})
+
+
+def _encoded(request):
+    return Response(gzip.compress(json.dumps(PAYLOAD).encode()), media_type="application/json",
+                    headers={"content-encoding": "gzip"})
+
+
+def _streamed(request):
+    chunk = json.dumps(PAYLOAD).encode()
+    
+    async def chunks():
+        yield chunk
+        yield chunk
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+def _multipart(request):
+    part = b"--graphql\r\ncontent-type: application/json\r\n\r\n" + json.dumps(PAYLOAD).encode() + b"\r\n"
+    
+    async def parts():
+        yield part
+        yield part + b"--graphql--\r\n"
+    return StreamingResponse(parts(), media_type='multipart/mixed; boundary="graphql"')
+
+
+@pytest.fixture
+def middleware():
+    app = Starlette(routes=[
+        Route("/big", _big),
+        Route("/small", _small),
+        Route("/encoded", _encoded),
+        Route("/streamed", _streamed),
+        Route("/multipart", _multipart),
+    ])
+    return CompressionMiddleware(app, min_size=1024, encodings=["gzip"])
+
+
+@pytest.fixture
+def client(middleware):
+    return TestClient(middleware)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, *;q=0.5", "br"),
+    ("*;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+    ("identity, *;q=0", None),
+    ("br;q=0.5, gzip", "gzip"),
+    ("GZIP;q=0.8, br;q=0.8", "br"),
+    ("gzip;q=bogus", None),
+    ("", None),
+])
+def test_negotiate_q_values(accept, expected):
+    assert negotiate(accept, ["br", "gzip"]) == expected
+
+
+def test_explicit_q_zero_beats_wildcard():
+    assert negotiate("gzip;q=0, *", ["gzip"]) is None
+
+
+def test_compresses_large_json(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(compress(json.dumps(PAYLOAD, separators=(",", ":")).encode(), "gzip"))
+    assert response.json() == PAYLOAD
+
+
+@pytest.mark.parametrize("accept", ["identity", "gzip;q=0", "*;q=0"])
+def test_refused_encodings_pass_through(client, accept):
+    response = client.get("/big", headers={"Accept-Encoding": accept})
+    assert "content-encoding" not in response.headers
+    assert response.json() == PAYLOAD
+
+
+def test_small_bodies_pass_through(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(response.content))
+    assert response.json() == {"ok": True}
+
+
+def test_already_encoded_bodies_are_left_alone(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "vary" not in response.headers
+    assert response.json() == PAYLOAD   # decoded exactly once
+
+
+@pytest.mark.parametrize("path", ["/streamed", "/multipart"])
+def test_chunked_responses_pass_through(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert json.dumps(PAYLOAD).encode() in response.content
+
+
+def test_cache_hit_reuses_compressed_body(client, middleware):
+    first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert first.content == second.content
+    assert first.headers["content-length"] == second.headers["content-length"]
+    assert (middleware.cache.hits, middleware.cache.misses) == (1, 1)
+
+
+def test_cache_is_byte_bounded():
+    bodies = [json.dumps({"n": i, "pad": "x" * 2000}).encode() for i in range(4)]
+    sizes = [len(compress(body, "gzip")) for body in bodies]
+    cache = CompressedCache(max_bytes=sizes[0] + sizes[1] + sizes[2] - 1)
+    
+    for body in bodies[:3]:
+        cache.get_or_compress(body, "gzip")
+    assert cache.misses == 3
+    assert len(cache._entries) == 2          # the oldest entry was evicted
+    assert cache.size == sizes[1] + sizes[2]
+    assert cache.size <= cache.max_bytes
+    
+    assert cache.get_or_compress(bodies[2], "gzip") == compress(bodies[2], "gzip")
+    assert cache.hits == 1
+    cache.get_or_compress(bodies[0], "gzip")  # evicted earlier, compressed again
+    assert cache.misses == 4
+
+
+def test_cache_skips_entries_larger_than_the_bound():
+    body = b"x" * 10_000
+    cache = CompressedCache(max_bytes=8)
+    assert gzip.decompress(cache.get_or_compress(body, "gzip")) == body
+    assert cache.size == 0 and not cache._entries
+    
+    disabled = CompressedCache(max_bytes=0)
+    disabled.get_or_compress(body, "gzip")
+    assert (disabled.hits, disabled.misses) == (0, 0)
@@ -0,0 +1,50 @@
+"""
+@defer / @stream tests for singleStock (multipart/mixed responses).
+
+Run on the in-memory graph backend (no Neo4j required).
+"""
+
+import json
+
+
+def multipart_parts(response):
+    """JSON bodies of a multipart/mixed GraphQL response, in order."""
+    parts = []
+    for chunk in response.text.split("\r\n---"):
+        _, _, body = chunk.partition("\r\n\r\n")
+        if body.strip().startswith("{"):
+            parts.append(json.loads(body))
+    return parts
+
+
+def test_single_stock_defers_news_and_streams_kline(memory_client):
+    """The first part carries the header only; kline and news follow."""
+    query = """
+        query ($symbol: String!) {
+          singleStock(symbol: $symbol) {
+            stock { symbol name }
+            dailyKline @stream(initialCount: 0) { timestamp close }
+            ... @defer { news { title } }
+          }
+        }
+    """
+    response = memory_client.post(
+        "/graphql",
+        json={"query": query, "variables": {"symbol": "AAPL"}},
+        headers={"Accept": "multipart/mixed"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("multipart/mixed")
+    
+    first, *rest = multipart_parts(response)
+    assert first["data"]["singleStock"]["stock"]["symbol"] == "AAPL"
+    assert first["data"]["singleStock"]["dailyKline"] == []
+    assert "news" not in first["data"]["singleStock"]
+    assert first["hasNext"] is True
+    
+    incremental = [entry for part in rest for entry in part.get("incremental", [])]
+    news = [entry["data"]["news"] for entry in incremental if "data" in entry]
+    bars = [item for entry in incremental for item in entry.get("items", [])]
+    assert news and news[0]
+    assert bars
+    assert rest[-1]["hasNext"] is False
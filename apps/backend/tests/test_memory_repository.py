@@ -0,0 +1,92 @@
+"""
+In-memory graph backend tests (GRAPH_BACKEND=memory, no Neo4j required).
+"""
+
+import math
+
+from neo4j_repo import InMemoryStockRepository
+
+from libs.analytics.factors import factor_names
+
+
+def graphql(client, query: str, variables=None):
+    """Helper to make GraphQL requests."""
+    return client.post("/graphql", json={"query": query, "variables": variables or {}})
+
+
+def test_memory_backend_serves_seeded_stock(memory_client):
+    """Seed payloads are served without a database."""
+    response = graphql(
+        memory_client,
+        "query ($symbol: String!) { singleStock(symbol: $symbol) { stock { symbol } dailyKline { timestamp } } }",
+        variables={"symbol": "aapl"},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert "errors" not in payload
+    assert payload["data"]["singleStock"]["stock"]["symbol"] == "AAPL"
+    assert payload["data"]["singleStock"]["dailyKline"]
+
+
+def test_upsert_merges_like_stock_document():
+    """Missing payload fields keep their previous values; kline/news are replaced."""
+    repo = InMemoryStockRepository()
+    repo.upsert_stock_payload({"symbol": "msft", "name": "Microsoft", "sector": "Technology", "news": [{"title": "a"}]})
+    repo.upsert_stock_payload({"symbol": "MSFT", "daily_kline": [{"timestamp": 1}]})
+    payload = repo.fetch_stock_payload("MSFT")
+    assert payload["name"] == "Microsoft"
+    assert payload["sector"] == "Technology"
+    assert payload["exchange"] == "NASDAQ"
+    assert payload["daily_kline"] == [{"timestamp": 1}]
+    assert payload["news"] == []
+
+
+def test_peg_candidates_fall_back_to_latest_documents():
+    """Without screener rows, documents are listed most recently updated first."""
+    repo = InMemoryStockRepository()
+    for symbol in ("AAA", "BBB", "AAA"):
+        repo.upsert_stock_payload({"symbol": symbol})
+    assert [row["symbol"] for row in repo.list_peg_candidates()] == ["AAA", "BBB"]
+    assert [row["symbol"] for row in repo.list_peg_candidates(limit=1)] == ["AAA"]
+    assert [row["symbol"] for row in repo.list_peg_candidates(descending=True)] == ["BBB", "AAA"]
+
+
+def test_peg_candidates_filter_and_sort_on_factors():
+    """Factor filters and sorting follow the Cypher query (NaN never matches)."""
+    names = factor_names()
+    sort_name = names[0]
+    
+    def factors(value):
+        row = [0.5] * len(names)
+        row[0] = value
+        return row
+    
+    repo = InMemoryStockRepository()
+    repo.put_peg_candidates([
+        {"ticker": "AAA", "rank": 1, "factors": factors(0.2)},
+        {"ticker": "BBB", "rank": 2, "factors": factors(0.9)},
+        {"ticker": "CCC", "rank": 3, "factors": factors(math.nan)},
+        {"ticker": "DDD", "rank": 4, "factors": factors(0.6)},
+    ])
+    assert [row["symbol"] for row in repo.list_peg_candidates()] == ["AAA", "BBB", "CCC", "DDD"]
+    assert [row["symbol"] for row in repo.list_peg_candidates(descending=True)] == ["DDD", "CCC", "BBB", "AAA"]
+    assert [row["symbol"] for row in repo.list_peg_candidates(descending=True, limit=2)] == ["DDD", "CCC"]
+    
+    ranked = repo.list_peg_candidates(sort_by=sort_name, descending=True)
+    assert [row["symbol"] for row in ranked] == ["BBB", "DDD", "AAA"]
+    
+    filtered = repo.list_peg_candidates(filters=[{"factor": sort_name, "min": 0.5}], limit=1)
+    assert [row["symbol"] for row in filtered] == ["BBB"]
+    assert filtered[0]["factors"][sort_name] == 0.9
+
+
+def test_peg_stocks_rejects_negative_limit(memory_client):
+    """A negative limit is a GraphQL error, not LIMIT -1 / rows[:-1]."""
+    query = "query ($limit: Int) { pegStocks(limit: $limit) { symbol } }"
+    payload = graphql(memory_client, query, variables={"limit": -1}).json()
+    assert payload["data"] is None
+    assert payload["errors"][0]["message"] == "limit must be >= 0, got -1"
+    
+    payload = graphql(memory_client, query, variables={"limit": 0}).json()
+    assert "errors" not in payload
+    assert payload["data"]["pegStocks"] == []
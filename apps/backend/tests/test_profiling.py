@@ -0,0 +1,116 @@
+"""
+Profiling middleware tests (no Neo4j required).
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from apps.backend.profiling import (
+    SIGNATURE_MAX_AGE_SECONDS,
+    ProfilingMiddleware,
+    StackSampler,
+    sign_profile_header,
+    verify_profile_header,
+)
+
+SECRET = "profile-secret"
+NOW = 1_700_000_000
+
+
+def spin_in_worker_thread(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+def test_sampler_sees_work_offloaded_to_threads():
+    """asyncio.to_thread work is recorded under its thread's root frame."""
+    async def scenario():
+        sampler = StackSampler(threading.get_ident(), interval=0.002)
+        sampler.start()
+        await asyncio.to_thread(spin_in_worker_thread, 0.1)
+        sampler.stop()
+        return sampler.folded()
+    
+    folded = asyncio.run(scenario())
+    offloaded = [line for line in folded.splitlines() if "spin_in_worker_thread" in line]
+    assert offloaded and all(line.startswith("[asyncio_") for line in offloaded)
+    assert "profile-sampler" not in folded
+
+
+def test_signed_header_is_accepted_within_max_age():
+    assert verify_profile_header(SECRET, sign_profile_header(SECRET, NOW), now=NOW)
+    assert verify_profile_header(SECRET, sign_profile_header(SECRET, NOW - SIGNATURE_MAX_AGE_SECONDS), now=NOW)
+
+
+@pytest.mark.parametrize("value", [
+    sign_profile_header("another-secret", NOW),                          # bad signature
+    f"{NOW}:{sign_profile_header(SECRET, NOW).partition(':')[2][:-1]}0",  # tampered signature
+    sign_profile_header(SECRET, NOW - SIGNATURE_MAX_AGE_SECONDS - 1),    # expired
+    sign_profile_header(SECRET, NOW + SIGNATURE_MAX_AGE_SECONDS + 1),    # from the future
+    f"{NOW + 1}:{sign_profile_header(SECRET, NOW).partition(':')[2]}",   # signature of another ts
+    "", "1", f"{NOW}", f"{NOW}:", ":abc", "soon:abc", f"{NOW}.5:abc",     # malformed
+])
+def test_invalid_headers_are_rejected(value):
+    assert not verify_profile_header(SECRET, value, now=NOW)
+
+
+def test_no_secret_disables_signed_profiling():
+    assert not verify_profile_header("", sign_profile_header("", NOW), now=NOW)
+
+
+def test_prune_keeps_only_the_newest_profiles(tmp_path):
+    middleware = ProfilingMiddleware(None, output_dir=str(tmp_path), keep=2)
+    for i, name in enumerate(["a.folded", "b.prof", "c.folded", "d.prof"]):
+        path = tmp_path / name
+        path.write_text(name)
+        os.utime(path, (NOW + i, NOW + i))
+    (tmp_path / "notes.txt").write_text("not a profile")
+    os.utime(tmp_path / "notes.txt", (NOW - 100, NOW - 100))
+    
+    middleware._prune()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c.folded", "d.prof", "notes.txt"]
+
+
+def test_only_one_request_is_profiled_at_a_time(tmp_path):
+    """A second signed request during a profile passes through unprofiled."""
+    async def scenario():
+        release = asyncio.Event()
+        entered = asyncio.Event()
+        
+        async def app(scope, receive, send):
+            if scope["path"] == "/slow":
+                entered.set()
+                await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+        
+        middleware = ProfilingMiddleware(app, secret=SECRET, output_dir=str(tmp_path))
+        
+        async def request(path):
+            sent = []
+            
+            async def send(message):
+                sent.append(message)
+            scope = {"type": "http", "method": "GET", "path": path,
+                     "headers": [(b"x-profile", sign_profile_header(SECRET).encode())]}
+            await middleware(scope, None, send)
+            return dict(sent[0]["headers"])
+        
+        slow = asyncio.create_task(request("/slow"))
+        await entered.wait()
+        concurrent = await request("/fast")
+        release.set()
+        profiled = await slow
+        after = await request("/fast")
+        return profiled, concurrent, after
+    
+    profiled, concurrent, after = asyncio.run(scenario())
+    assert b"x-profile-id" in profiled
+    assert b"x-profile-id" not in concurrent
+    assert b"x-profile-id" in after   # the guard is released afterwards
+    assert len(list(tmp_path.iterdir())) == 2
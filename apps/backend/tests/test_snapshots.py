@@ -0,0 +1,128 @@
+"""
+singleStock snapshot tests (stale-while-revalidate).
+
+Run on the in-memory graph backend (no Neo4j required).
+"""
+
+import asyncio
+import json
+import time
+
+from apps.backend.snapshots import Snapshot, SnapshotMiddleware, SnapshotStore, snapshot_symbols
+
+QUERY = "query SingleStock($symbol: String!) { singleStock(symbol: $symbol) { stock { symbol name } } }"
+
+
+def test_snapshot_served_stale_then_rebuilt_after_write(memory_client):
+    """A write marks the snapshot stale; it is served until the rebuild lands."""
+    body = {"query": QUERY, "variables": {"symbol": "AAPL"}, "operationName": "SingleStock"}
+    assert "x-snapshot" not in memory_client.post("/graphql", json=body).headers
+    assert memory_client.post("/graphql", json=body).headers["x-snapshot"] == "hit"
+    
+    memory_client.app.state.stock_service.upsert_stock({"symbol": "AAPL", "name": "Apple Renamed"})
+    deadline = time.monotonic() + 2
+    while True:
+        response = memory_client.post("/graphql", json=body)
+        name = response.json()["data"]["singleStock"]["stock"]["name"]
+        if name == "Apple Renamed":
+            break
+        assert response.headers["x-snapshot"] == "stale"
+        assert time.monotonic() < deadline, "snapshot was not rebuilt"
+        time.sleep(0.01)
+    assert response.headers["x-snapshot"] == "hit"
+
+
+def test_only_plain_single_stock_queries_are_eligible():
+    """Other root fields, mutations and incremental delivery bypass snapshots."""
+    assert snapshot_symbols({"query": QUERY, "variables": {"symbol": "msft"}}) == ("MSFT",)
+    assert snapshot_symbols({"query": '{ a: singleStock(symbol: "A") { stock { symbol } } }'}) == ("A",)
+    assert snapshot_symbols({"query": "{ ping { message } }"}) is None
+    assert snapshot_symbols({"query": '{ singleStock(symbol: "A") { stock { symbol } } ping { message } }'}) is None
+    assert snapshot_symbols({"query": '{ singleStock(symbol: "A") { ... @defer { news { title } } } }'}) is None
+    assert snapshot_symbols({"query": QUERY, "variables": {}}) is None
+
+
+def test_store_bounds_age_and_size():
+    """Entries past max_age are misses; the least recently used entry is evicted first."""
+    store = SnapshotStore(max_entries=2, max_bytes=1024, ttl=10, max_age=60)
+    
+    def snapshot(symbol):
+        return Snapshot(body=b"{}", headers=[], symbols=(symbol,), scope={}, request_body=b"")
+    
+    for key in (b"a", b"b"):
+        store.put(key, snapshot(key.decode().upper()))
+    now = store.peek(b"a").built_at
+    assert store.get(b"a", now=now + 5) == (store.peek(b"a"), False)
+    assert store.get(b"a", now=now + 30)[1] is True
+    assert store.get(b"a", now=now + 61) == (None, False)
+    
+    store.put(b"c", snapshot("C"))
+    assert store.peek(b"b") is None
+    assert store.invalidate("a") == 1
+    assert store.get(b"a", now=now)[1] is True
+
+
+def test_snapshot_built_across_a_write_is_not_stored_fresh():
+    """A response whose symbol was written while it was being built stays stale."""
+    store = SnapshotStore(max_entries=10, max_bytes=1024, ttl=10, max_age=60)
+    
+    def snapshot():
+        return Snapshot(body=b"{}", headers=[], symbols=("A",), scope={}, request_body=b"")
+    
+    before = store.generation(("A",))
+    store.invalidate("a")
+    assert store.put(b"k", snapshot(), before) is False
+    assert store.get(b"k")[1] is True
+    
+    assert store.put(b"k", snapshot(), store.generation(("A",))) is True
+    assert store.get(b"k")[1] is False
+    
+    # An outdated rebuild never replaces an existing snapshot
+    outdated = store.generation(("A",))
+    store.invalidate("A")
+    assert store.put(b"k", snapshot(), outdated) is False
+    assert store.peek(b"k").stale is True
+
+
+def test_rebuild_is_rescheduled_after_a_write_during_the_build():
+    """Writes landing mid-request (miss path) or mid-rebuild trigger another rebuild."""
+    store = SnapshotStore(max_entries=10, max_bytes=1024, ttl=10, max_age=60)
+    version = {"n": 0}
+    write_during = {1, 2}   # the first request and the first rebuild see a concurrent write
+    calls = []
+    
+    async def app(scope, receive, send):
+        calls.append(version["n"])
+        body = json.dumps({"data": {"singleStock": {"v": version["n"]}}}).encode()
+        if len(calls) in write_during:
+            version["n"] += 1
+            store.invalidate("AAPL")
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+    
+    middleware = SnapshotMiddleware(app, store)
+    request = json.dumps({"query": QUERY, "variables": {"symbol": "AAPL"}}).encode()
+    
+    async def post():
+        sent = []
+        
+        async def receive():
+            return {"type": "http.request", "body": request, "more_body": False}
+        
+        async def send(message):
+            sent.append(message)
+        
+        await middleware({"type": "http", "method": "POST", "path": "/graphql", "headers": []}, receive, send)
+        headers = dict(sent[0]["headers"])
+        return headers.get(b"x-snapshot"), json.loads(sent[1]["body"])["data"]["singleStock"]["v"]
+    
+    async def scenario():
+        assert await post() == (None, 0)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not middleware._tasks and len(calls) >= 3:
+                break
+        return await post()
+    
+    assert asyncio.run(scenario()) == (b"hit", 2)
+    assert calls == [0, 1, 2]
@@ -0,0 +1,105 @@
+"""
+GraphQL subscription tests (quoteUpdated / newsAdded over WebSocket).
+
+Run on the in-memory graph backend (no Neo4j required).
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from neo4j_repo.connection import reset_settings_cache
+
+from libs.events import SIGNATURE_HEADER, EventBus, bus
+from libs.events.relay import sign_body
+
+
+def wait_for_subscriber(topic: str, symbol: str, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not bus.has_subscribers(topic, symbol):
+        assert time.monotonic() < deadline, f"no {topic} subscriber for {symbol}"
+        time.sleep(0.01)
+
+
+def test_quote_updated_pushes_latest_bar(memory_client):
+    """upsert_stock publishes the newest bar to quoteUpdated subscribers."""
+    with memory_client.websocket_connect("/graphql", subprotocols=["graphql-transport-ws"]) as ws:
+        ws.send_json({"type": "connection_init"})
+        assert ws.receive_json()["type"] == "connection_ack"
+        ws.send_json({
+            "id": "1",
+            "type": "subscribe",
+            "payload": {"query": 'subscription { quoteUpdated(symbols: ["aapl"]) { symbol bar { timestamp close } } }'},
+        })
+        wait_for_subscriber("quote", "AAPL")
+        
+        memory_client.app.state.stock_service.upsert_stock({
+            "symbol": "AAPL",
+            "daily_kline": [{"timestamp": 2000, "close": 2.0}, {"timestamp": 1000, "close": 1.0}],
+        })
+        message = ws.receive_json()
+        assert message["type"] == "next"
+        assert message["payload"]["data"]["quoteUpdated"] == {"symbol": "AAPL", "bar": {"timestamp": 2000.0, "close": 2.0}}
+        ws.send_json({"id": "1", "type": "complete"})
+
+
+def test_events_are_converted_once_per_group():
+    """Subscribers sharing a transform receive the same converted object."""
+    events = EventBus()
+    converted = []
+    
+    def transform(symbol, data):
+        converted.append(symbol)
+        return {"symbol": symbol, **data}
+    
+    async def scenario():
+        async with events.subscribe("news", ["msft"], transform) as first, events.subscribe("news", ["MSFT"], transform) as second:
+            assert events.publish("news", "msft", {"title": "a"}) == 2
+            one, two = await first.get(), await second.get()
+            assert one is two
+        assert not events.has_subscribers("news")
+    
+    asyncio.run(scenario())
+    assert converted == ["MSFT"]
+
+
+@pytest.fixture
+def relay_client(monkeypatch):
+    """memory_client with EVENTS_SECRET set, so `/events` is registered."""
+    monkeypatch.setenv("EVENTS_SECRET", "test-secret")
+    monkeypatch.setenv("GRAPH_BACKEND", "memory")
+    reset_settings_cache()
+    from starlette.testclient import TestClient
+    from apps.backend.main import create_app
+    with TestClient(create_app()) as client:
+        yield client
+    reset_settings_cache()
+
+
+def test_signed_relay_post_reaches_subscriber(relay_client):
+    """A CMS worker relay body signed with EVENTS_SECRET is republished to newsAdded."""
+    with relay_client.websocket_connect("/graphql", subprotocols=["graphql-transport-ws"]) as ws:
+        ws.send_json({"type": "connection_init"})
+        assert ws.receive_json()["type"] == "connection_ack"
+        ws.send_json({
+            "id": "1",
+            "type": "subscribe",
+            "payload": {"query": 'subscription { newsAdded(symbols: ["MSFT"]) { symbol news { title } } }'},
+        })
+        wait_for_subscriber("news", "MSFT")
+        
+        body = json.dumps({
+            "sent_at": time.time(),
+            "events": [{"topic": "news", "symbol": "msft", "data": {"title": "Relayed", "published_at": 1700000000000}}],
+        }).encode()
+        forged = relay_client.post("/events", content=body, headers={SIGNATURE_HEADER: sign_body("wrong", body)})
+        assert forged.status_code == 403
+        
+        response = relay_client.post("/events", content=body, headers={SIGNATURE_HEADER: sign_body("test-secret", body)})
+        assert response.status_code == 200
+        assert response.json() == {"received": 1, "delivered": 1}
+        message = ws.receive_json()
+        assert message["type"] == "next"
+        assert message["payload"]["data"]["newsAdded"] == {"symbol": "MSFT", "news": {"title": "Relayed"}}
+        ws.send_json({"id": "1", "type": "complete"})
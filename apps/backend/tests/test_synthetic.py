@@ -0,0 +1,67 @@
+"""
+Synthetic universe tests (pure numpy, no Neo4j required).
+"""
+
+import json
+from dataclasses import asdict
+from itertools import islice
+
+from apps.backend.services.synthetic import (
+    DEFAULT_END,
+    generate_ticker,
+    iter_universe,
+    to_pipeline_records,
+    to_stock_payload,
+    trading_days,
+)
+
+DAYS = trading_days(DEFAULT_END, 2)
+
+
+def dump(ticker) -> bytes:
+    return json.dumps(asdict(ticker), sort_keys=True).encode()
+
+
+def test_generate_ticker_is_byte_identical_across_calls():
+    for index in (0, 7, 999):
+        assert dump(generate_ticker(index, DAYS, seed=42, embedding_dim=8)) == \
+            dump(generate_ticker(index, DAYS, seed=42, embedding_dim=8))
+    assert dump(generate_ticker(3, DAYS, seed=42)) != dump(generate_ticker(3, DAYS, seed=43))
+
+
+def test_ticker_i_does_not_depend_on_universe_size():
+    small = [dump(t) for t in iter_universe(10, years=2, embedding_dim=8)]
+    large = [dump(t) for t in islice(iter_universe(1000, years=2, embedding_dim=8), 10)]
+    assert small == large
+    assert len(set(small)) == 10
+
+
+def test_ohlc_bars_are_consistent():
+    for index in range(5):
+        ticker = generate_ticker(index, DAYS)
+        assert len(ticker.quotes) == len(DAYS)
+        assert [q["date"] for q in ticker.quotes] == [d.isoformat() for d in DAYS]
+        for q in ticker.quotes:
+            assert 0 < q["low"] <= min(q["open"], q["close"])
+            assert max(q["open"], q["close"]) <= q["high"]
+            assert q["volume"] > 0
+
+
+def test_earnings_follow_calendar_quarters():
+    ticker = generate_ticker(1, DAYS)
+    periods = [r["fiscal_period"] for r in ticker.earnings]
+    assert periods == sorted(set(periods))
+    assert all(r["pe_ratio"] is None for r in ticker.earnings[:3])   # no TTM yet
+    assert all(r["eps_growth"] is None for r in ticker.earnings[:7])  # no prior TTM yet
+
+
+def test_sinks_reuse_the_generated_data():
+    ticker = generate_ticker(2, DAYS, embedding_dim=4)
+    payload = to_stock_payload(ticker)
+    assert payload["symbol"] == ticker.symbol
+    assert len(payload["daily_kline"]) == len(ticker.quotes)
+    assert [n["title"] for n in payload["news"]] == [n["title"] for n in reversed(ticker.news)]
+    
+    records = to_pipeline_records(ticker)
+    assert records["company"][0]["embedding"] == ticker.embedding
+    assert all("tickers" not in n for n in records["news"])
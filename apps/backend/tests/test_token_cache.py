@@ -0,0 +1,134 @@
+"""
+Verified-claims cache tests (libs.auth.token_utils + per-request memoization).
+
+No Neo4j required.
+"""
+
+import time
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI
+from neo4j_repo.connection import reset_settings_cache
+from starlette.testclient import TestClient
+
+from apps.backend import dependencies
+from apps.backend.dependencies import get_current_user_id, require_auth
+from libs.auth import token_utils
+from libs.auth.token_utils import clear_token_cache, decode_token
+
+SECRET = "token-cache-test-secret-0123456789abcdef"
+
+
+@pytest.fixture(autouse=True)
+def jwt_settings(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+    monkeypatch.setenv("JWT_CACHE_SIZE", "3")
+    reset_settings_cache()
+    clear_token_cache()
+    yield
+    clear_token_cache()
+    reset_settings_cache()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Counts real signature verifications."""
+    calls = []
+    real_decode = jwt.decode
+    
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+    
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    return calls
+
+
+def make_token(user_id=1, ttl=300, secret=SECRET, **claims):
+    if ttl is not None:
+        claims["exp"] = int(time.time()) + ttl
+    return jwt.encode({"user_id": user_id, **claims}, secret, algorithm="HS256")
+
+
+def test_valid_token_is_verified_once(decode_calls):
+    token = make_token()
+    assert decode_token(token)["user_id"] == 1
+    assert decode_token(token)["user_id"] == 1
+    assert len(decode_calls) == 1
+
+
+def test_expired_token_is_not_served_from_cache(decode_calls):
+    exp = int(time.time()) + 1
+    token = make_token(ttl=None, exp=exp)
+    assert decode_token(token) is not None
+    assert decode_token(token) is not None
+    time.sleep(exp - time.time() + 0.05)
+    assert decode_token(token) is None
+    assert len(decode_calls) == 2   # cached once, re-verified (and rejected) after exp
+
+
+def test_rotated_secret_invalidates_entries(monkeypatch, decode_calls):
+    token = make_token()
+    assert decode_token(token) is not None
+    monkeypatch.setenv("JWT_SECRET_KEY", "rotated-token-cache-secret-0123456789abcdef")
+    reset_settings_cache()
+    assert decode_token(token) is None
+    assert decode_token(make_token(secret="rotated-token-cache-secret-0123456789abcdef")) is not None
+
+
+def test_invalid_and_no_exp_tokens_are_not_cached(decode_calls):
+    forged = make_token(secret="someone-else-entirely-0123456789abcdef")
+    no_exp = make_token(ttl=None)
+    for _ in range(2):
+        assert decode_token(forged) is None
+        assert decode_token(no_exp)["user_id"] == 1
+    assert len(decode_calls) == 4
+    assert len(token_utils._cache) == 0
+
+
+def test_cache_is_bounded_lru(decode_calls):
+    tokens = [make_token(user_id=i) for i in range(4)]
+    for token in tokens[:3]:
+        decode_token(token)
+    decode_token(tokens[0])          # most recently used
+    decode_token(tokens[3])          # evicts tokens[1]
+    assert len(token_utils._cache) == 3
+    
+    decode_calls.clear()
+    decode_token(tokens[0])
+    decode_token(tokens[1])
+    assert decode_calls == [tokens[1]]
+
+
+def test_callers_get_a_copy():
+    token = make_token()
+    claims = decode_token(token)
+    claims["user_id"] = 999
+    claims["is_staff"] = True
+    assert decode_token(token) == {"user_id": 1, "exp": claims["exp"]}
+
+
+def test_one_verification_per_request(monkeypatch):
+    """get_current_user_id and require_auth share the request's decoded claims."""
+    verified = []
+    real_verify = dependencies.verify_token
+    
+    def counting_verify(token):
+        verified.append(token)
+        return real_verify(token)
+    
+    monkeypatch.setattr(dependencies, "verify_token", counting_verify)
+    app = FastAPI()
+    
+    @app.get("/me")
+    def me(user_id=Depends(get_current_user_id), required=Depends(require_auth)):
+        return {"user_id": user_id, "required": required}
+    
+    with TestClient(app) as client:
+        response = client.get("/me", headers={"Authorization": f"Bearer {make_token(user_id=7)}"})
+        assert response.json() == {"user_id": 7, "required": 7}
+        assert len(verified) == 1
+        
+        assert client.get("/me").status_code == 401
+        assert len(verified) == 1   # no token, nothing to verify
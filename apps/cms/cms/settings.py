@@ -196,6 +196,7 @@ UNFOLD = {
                 "items": [
                     {"title": "Data Batches", "icon": "inventory_2", "link": "/admin/pipeline/databatchproxy/"},
                     {"title": "Crawler Tasks", "icon": "schedule", "link": "/admin/pipeline/crawlertaskproxy/"},
+                    {"title": "Pipeline Jobs", "icon": "pending_actions", "link": "/admin/pipeline/pipelinejob/"},
                 ],
             },
             {
@@ -5,11 +5,18 @@ Custom admin views for CRUD operations on Neo4j nodes.
 Models are imported from libs/neo4j_models/ (SSOT).
 """
 
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
 from django.contrib import admin, messages
+from django.core.cache import cache
 from django.db import models
 from django.http import HttpRequest, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import path, reverse
+from neomodel import DateTimeProperty, FloatProperty, IntegerProperty, db
 from unfold.admin import ModelAdmin
 
 from libs.neo4j_models import (
@@ -81,11 +88,25 @@ class SectorProxy(models.Model):
 # =============================================================================
 
 class Neo4jModelAdmin(ModelAdmin):
-    """Base admin class for Neo4j nodes."""
+    """
+    Base admin class for Neo4j nodes.
+    
+    Lists nodes with keyset pagination on `keyset_field` (an indexed
+    property, `uid` tiebreak), so any page costs one index seek instead of
+    SKIP over every earlier row. Totals come from a cached count() query.
+    Search and filters are pushed into the Cypher WHERE clause.
+    """
     
     neo4j_model = None
     list_display_fields = []
     list_per_page = 50
+    keyset_field = 'uid'
+    count_cache_seconds = 60
+    
+    # Indexed properties only; see build_filters()
+    neo4j_search_fields: List[str] = []
+    neo4j_filter_fields: List[str] = []
+    neo4j_range_fields: List[str] = []
     
     def get_urls(self):
         urls = super().get_urls()
@@ -96,20 +117,150 @@ class Neo4jModelAdmin(ModelAdmin):
         ]
         return custom_urls + urls
     
+    @property
+    def label(self) -> str:
+        return self.neo4j_model.__label__
+    
+    def count_nodes(self, where: str = '', params: Optional[Dict[str, Any]] = None) -> int:
+        """Node count for the label (and filters), cached briefly."""
+        params = params or {}
+        cache_key = "graph_admin_count:" + hashlib.sha1(
+            f"{self.label}|{where}|{sorted(params.items())}".encode()
+        ).hexdigest()
+        total = cache.get(cache_key)
+        if total is None:
+            rows, _ = db.cypher_query(f"MATCH (n:`{self.label}`) {where} RETURN count(n)", params)
+            total = rows[0][0]
+            cache.set(cache_key, total, self.count_cache_seconds)
+        return total
+    
+    def _coerce(self, field: str, value: str):
+        """URL values are text; match the stored property type."""
+        prop = self.neo4j_model.defined_properties(rels=False).get(field)
+        if isinstance(prop, IntegerProperty):
+            return int(value)
+        if isinstance(prop, DateTimeProperty):
+            try:
+                return float(value)
+            except ValueError:
+                parsed = datetime.fromisoformat(value)
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=dt_timezone.utc)
+                return parsed.timestamp()
+        if isinstance(prop, FloatProperty):
+            return float(value)
+        return value
+    
+    def build_filters(self, query) -> Tuple[List[str], Dict[str, Any], Dict[str, str]]:
+        """
+        Turn GET params into Cypher predicates on indexed properties.
+        
+        - `q`: prefix match on `neo4j_search_fields` (tickers are upper-cased)
+        - `<field>`: equality, for fields in `neo4j_filter_fields`
+        - `<field>__gte` / `<field>__lte`: range, for fields in `neo4j_range_fields`
+        
+        Field names come only from the admin's declared lists, never from
+        the request. Returns (predicates, params, active_filters).
+        """
+        clauses, params, active = [], {}, {}
+        
+        term = (query.get('q') or '').strip()
+        if term and self.neo4j_search_fields:
+            parts = []
+            for i, field in enumerate(self.neo4j_search_fields):
+                params[f"q{i}"] = term.upper() if field == 'ticker' else term
+                parts.append(f"n.{field} STARTS WITH $q{i}")
+            clauses.append(f"({' OR '.join(parts)})")
+            active['q'] = term
+        
+        for field in self.neo4j_filter_fields:
+            value = (query.get(field) or '').strip()
+            if value:
+                params[f"f_{field}"] = self._coerce(field, value.upper() if field == 'ticker' else value)
+                clauses.append(f"n.{field} = $f_{field}")
+                active[field] = value
+        
+        for field in self.neo4j_range_fields:
+            for suffix, op in (('gte', '>='), ('lte', '<=')):
+                name = f"{field}__{suffix}"
+                value = (query.get(name) or '').strip()
+                if value:
+                    params[f"r_{field}_{suffix}"] = self._coerce(field, value)
+                    clauses.append(f"n.{field} {op} $r_{field}_{suffix}")
+                    active[name] = value
+        
+        return clauses, params, active
+    
+    def fetch_page(self, after=None, before=None, clauses=None, params=None):
+        """
+        Fetch one page after/before a (key, uid) cursor, under filter predicates.
+        
+        Returns (nodes, first_cursor, last_cursor, has_more).
+        """
+        field = self.keyset_field
+        tiebreak = field != 'uid'
+        order = f"n.{field}, n.uid" if tiebreak else "n.uid"
+        clauses = list(clauses or [])
+        params = {**(params or {}), 'limit': self.list_per_page + 1}
+        
+        cursor = after or before
+        if cursor:
+            op = '>' if after else '<'
+            params['key'] = self._coerce(field, cursor[0])
+            if tiebreak:
+                params['uid'] = cursor[1]
+                clauses.append(f"(n.{field} {op} $key OR (n.{field} = $key AND n.uid {op} $uid))")
+            else:
+                clauses.append(f"n.uid {op} $key")
+        if before:
+            order = f"n.{field} DESC, n.uid DESC" if tiebreak else "n.uid DESC"
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows, _ = db.cypher_query(
+            f"MATCH (n:`{self.label}`) {where} "
+            f"RETURN n, n.{field} AS key, n.uid AS uid "
+            f"ORDER BY {order} LIMIT $limit",
+            params,
+            resolve_objects=True,
+        )
+        has_more = len(rows) > self.list_per_page
+        rows = rows[:self.list_per_page]
+        if before:
+            rows.reverse()
+        if not rows:
+            return [], None, None, False
+        nodes = [row[0] for row in rows]
+        first = (rows[0][1], rows[0][2])
+        last = (rows[-1][1], rows[-1][2])
+        return nodes, first, last, has_more
+    
     def changelist_view_neo4j(self, request: HttpRequest):
         if not self.neo4j_model:
             messages.error(request, "No Neo4j model configured")
             return HttpResponseRedirect(reverse('admin:index'))
         
-        page = int(request.GET.get('p', 0))
+        after = before = None
+        if 'after' in request.GET:
+            after = (request.GET['after'], request.GET.get('after_uid', ''))
+        elif 'before' in request.GET:
+            before = (request.GET['before'], request.GET.get('before_uid', ''))
+        
+        active = {}
         try:
-            start = page * self.list_per_page
-            end = start + self.list_per_page
-            nodes = list(self.neo4j_model.nodes.all()[start:end])
-            total = len(self.neo4j_model.nodes)
+            clauses, params, active = self.build_filters(request.GET)
+            nodes, first, last, has_more = self.fetch_page(
+                after=after, before=before, clauses=clauses, params=params,
+            )
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+            total = self.count_nodes(where, params)
         except Exception as e:
             messages.error(request, f"Neo4j error: {e}")
-            nodes, total = [], 0
+            nodes, first, last, has_more, total = [], None, None, False, 0
+        
+        # Paging forward: more rows means a next page; we came from a previous one.
+        # Paging backward: more rows means a previous page; we came from a next one.
+        has_next = bool(last) and (has_more if not before else True)
+        has_prev = bool(first) and (has_more if before else after is not None)
         
         context = {
             **self.admin_site.each_context(request),
@@ -118,11 +269,28 @@ class Neo4jModelAdmin(ModelAdmin):
             'fields': self.list_display_fields,
             'model_name': self.model._meta.model_name,
             'total_count': total,
-            'page': page,
-            'has_next': (page + 1) * self.list_per_page < total,
-            'has_prev': page > 0,
+            'has_next': has_next,
+            'has_prev': has_prev,
+            'filter_query': urlencode(active),
+            'next_query': urlencode({**active, 'after': last[0], 'after_uid': last[1]}) if has_next else '',
+            'prev_query': urlencode({**active, 'before': first[0], 'before_uid': first[1]}) if has_prev else '',
+            'search_enabled': bool(self.neo4j_search_fields),
+            'search_term': active.get('q', ''),
+            'filter_inputs': self._filter_inputs(active),
         }
         return render(request, 'admin/graph/neo4j_changelist.html', context)
+    
+    def _filter_inputs(self, active: Dict[str, str]) -> List[Dict[str, str]]:
+        """Form inputs for the declared filters, prefilled from the request."""
+        inputs = [
+            {'name': f, 'label': f.replace('_', ' ').title(), 'value': active.get(f, '')}
+            for f in self.neo4j_filter_fields
+        ]
+        for f in self.neo4j_range_fields:
+            label = f.replace('_', ' ').title()
+            inputs.append({'name': f"{f}__gte", 'label': f"{label} from", 'value': active.get(f"{f}__gte", '')})
+            inputs.append({'name': f"{f}__lte", 'label': f"{label} to", 'value': active.get(f"{f}__lte", '')})
+        return inputs
 
 
 # =============================================================================
@@ -133,33 +301,46 @@ class Neo4jModelAdmin(ModelAdmin):
 class CompanyAdmin(Neo4jModelAdmin):
     neo4j_model = Company
     list_display_fields = ['ticker', 'name', 'exchange', 'sector', 'industry']
+    keyset_field = 'ticker'
+    neo4j_search_fields = ['ticker']
+    neo4j_filter_fields = ['exchange', 'sector', 'industry']
 
 
 @admin.register(DailyQuoteProxy)
 class DailyQuoteAdmin(Neo4jModelAdmin):
     neo4j_model = DailyQuote
     list_display_fields = ['ticker', 'date', 'close', 'volume']
+    keyset_field = 'date'
+    neo4j_filter_fields = ['ticker']
+    neo4j_range_fields = ['date']
 
 
 @admin.register(EarningsReportProxy)
 class EarningsReportAdmin(Neo4jModelAdmin):
     neo4j_model = EarningsReport
     list_display_fields = ['ticker', 'fiscal_period', 'eps', 'revenue']
+    neo4j_filter_fields = ['ticker', 'fiscal_period']
 
 
 @admin.register(NewsArticleProxy)
 class NewsArticleAdmin(Neo4jModelAdmin):
     neo4j_model = NewsArticle
     list_display_fields = ['title', 'source_name', 'published_at']
+    keyset_field = 'article_id'
+    neo4j_filter_fields = ['source_name']
+    neo4j_range_fields = ['published_at']
 
 
 @admin.register(DataSourceProxy)
 class DataSourceAdmin(Neo4jModelAdmin):
     neo4j_model = DataSource
     list_display_fields = ['name', 'source_type', 'is_active']
+    keyset_field = 'name'
 
 
 @admin.register(SectorProxy)
 class SectorAdmin(Neo4jModelAdmin):
     neo4j_model = Sector
-    list_display_fields = ['name', 'code']
+    list_display_fields = ['name', 'code', 'company_count', 'pe_median', 'peg_median', 'growth_median']
+    keyset_field = 'name'
+    neo4j_search_fields = ['name']
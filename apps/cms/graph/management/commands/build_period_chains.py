@@ -0,0 +1,37 @@
+"""
+Create or repair NEXT_PERIOD chains for quotes and earnings.
+
+Usage:
+    python manage.py build_period_chains                  # incremental, both chains
+    python manage.py build_period_chains --full --kind quote
+    python manage.py build_period_chains --tickers AAPL
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.chains import CHAINS, build_chains
+
+
+class Command(BaseCommand):
+    help = 'Bulk-build NEXT_PERIOD edges between consecutive quotes / earnings reports'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(CHAINS), help='Only this chain (default: all)')
+        parser.add_argument('--tickers', nargs='*', help='Limit to these tickers')
+        parser.add_argument('--full', action='store_true', help='Relink every ticker, not just new periods')
+    
+    def handle(self, *args, **options):
+        kinds = [options['kind']] if options['kind'] else sorted(CHAINS)
+        for kind in kinds:
+            started = time.monotonic()
+            written = build_chains(
+                kind,
+                tickers=options['tickers'],
+                incremental=not options['full'],
+            )
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{kind}: linked {written} periods in {elapsed:.1f}s"
+            ))
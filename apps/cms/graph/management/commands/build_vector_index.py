@@ -0,0 +1,31 @@
+"""
+Rebuild the on-disk ANN indexes over stored embeddings.
+
+Usage:
+    python manage.py build_vector_index                  # every kind
+    python manage.py build_vector_index --kind company --lists 256
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.vectors import VECTOR_SOURCES, build_vector_index, index_root
+
+
+class Command(BaseCommand):
+    help = 'Build IVF vector indexes for Company/NewsArticle/EarningsReport/DailyQuote embeddings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(VECTOR_SOURCES), help='Only this kind (default: all)')
+        parser.add_argument('--lists', type=int, help='Number of IVF lists (default: sqrt(n))')
+    
+    def handle(self, *args, **options):
+        kinds = [options['kind']] if options['kind'] else sorted(VECTOR_SOURCES)
+        for kind in kinds:
+            started = time.monotonic()
+            count = build_vector_index(kind, n_lists=options['lists'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{kind}: indexed {count} vectors in {elapsed:.1f}s -> {index_root() / kind}"
+            ))
@@ -0,0 +1,27 @@
+"""
+Rebuild COMPETES_WITH edges from Company embeddings.
+
+Usage:
+    python manage.py compute_competitors
+    python manage.py compute_competitors --k 20 --block-size 2048
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.competitors import BLOCK_SIZE, DEFAULT_K, refresh_competitors
+
+
+class Command(BaseCommand):
+    help = 'Write top-k most similar companies (universe + same sector) as COMPETES_WITH edges'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=DEFAULT_K, help=f'Peers per company and scope (default: {DEFAULT_K})')
+        parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='Rows per similarity block')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = refresh_competitors(k=options['k'], block_size=options['block_size'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} COMPETES_WITH edges in {elapsed:.1f}s"))
@@ -0,0 +1,28 @@
+"""
+Recompute percentile / z-score factors on the PegCandidate table.
+
+Metrics come from FACTOR_METRICS (libs.config); compute_peg_screener
+already runs this after rebuilding the table.
+
+Usage:
+    python manage.py compute_factors
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.factors import factor_names, refresh_factors
+
+
+class Command(BaseCommand):
+    help = 'Compute universe/sector percentile ranks and z-scores for screener metrics'
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        result = refresh_factors()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed {result['factors']} factors for {result['rows']} tickers in {elapsed:.1f}s"
+        ))
+        self.stdout.write(f"Layout: {', '.join(factor_names())}")
@@ -0,0 +1,35 @@
+"""
+Compute DailyQuote technical indicators (SMA 20/50/200, RSI 14).
+
+Usage:
+    python manage.py compute_indicators                 # incremental, all tickers
+    python manage.py compute_indicators --full          # recompute full history
+    python manage.py compute_indicators --tickers AAPL MSFT
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.indicators import refresh_indicators
+
+
+class Command(BaseCommand):
+    help = 'Compute SMA/RSI indicators for DailyQuote nodes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tickers', nargs='*', help='Limit to these tickers')
+        parser.add_argument('--full', action='store_true', help='Recompute full history, not just new bars')
+        parser.add_argument('--group-size', type=int, default=200, help='Tickers loaded per query')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = refresh_indicators(
+            tickers=options['tickers'],
+            incremental=not options['full'],
+            group_size=options['group_size'],
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated indicators on {written} quotes in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,45 @@
+"""
+Rebuild the PegCandidate screener table from EarningsReport history.
+
+Cross-sectional factors (libs.analytics.factors) are recomputed afterwards
+unless --skip-factors is given.
+
+Usage:
+    python manage.py compute_peg_screener
+    python manage.py compute_peg_screener --quarters 12
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.factors import refresh_factors
+from libs.analytics.screener import DEFAULT_QUARTERS, refresh_peg_candidates
+
+
+class Command(BaseCommand):
+    help = 'Compute TTM EPS / growth / PEG for all tickers and rank them'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--quarters', type=int, default=DEFAULT_QUARTERS,
+            help='Latest quarters loaded per ticker (>= 8 for YoY TTM growth)',
+        )
+        parser.add_argument('--skip-factors', action='store_true', help='Do not recompute factors')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = refresh_peg_candidates(quarters=options['quarters'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Screened {count} tickers in {elapsed:.1f}s"
+        ))
+        if options['skip_factors']:
+            return
+        
+        started = time.monotonic()
+        result = refresh_factors()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed {result['factors']} factors for {result['rows']} tickers in {elapsed:.1f}s"
+        ))
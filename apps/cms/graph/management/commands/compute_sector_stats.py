@@ -0,0 +1,29 @@
+"""
+Recompute sector aggregates (median/quartile PE, PEG, growth; breadth).
+
+Usage:
+    python manage.py compute_sector_stats                      # every sector
+    python manage.py compute_sector_stats --sectors Technology
+    python manage.py compute_sector_stats --tickers AAPL MSFT  # sectors of these tickers
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from libs.analytics.sectors import refresh_sector_stats
+
+
+class Command(BaseCommand):
+    help = 'Materialize per-sector PE/PEG/growth aggregates on Sector nodes'
+    
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument('--sectors', nargs='+', help='Only these sector names')
+        scope.add_argument('--tickers', nargs='+', help='Only the sectors of these tickers')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = refresh_sector_stats(sectors=options['sectors'], tickers=options['tickers'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Updated {written} sectors in {elapsed:.1f}s"))
@@ -0,0 +1,44 @@
+"""
+Install (or verify) Neo4j indexes and constraints for all graph models.
+
+Covers single-property indexes / uniqueness constraints declared on the
+neomodel classes plus the composite indexes in libs.neo4j_models.schema,
+for the current DB_TABLE_PREFIX labels.
+
+Usage:
+    python manage.py install_graph_schema
+    python manage.py install_graph_schema --check
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from libs.neo4j_models.schema import GRAPH_MODELS, install_schema, missing_schema
+from libs.neo4j_repo.models import CrawlerJobNode, StockDocumentNode, TrackingRecordNode
+
+MODELS = GRAPH_MODELS + [StockDocumentNode, CrawlerJobNode, TrackingRecordNode]
+
+
+class Command(BaseCommand):
+    help = 'Install and verify Neo4j indexes/constraints for graph models'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report missing items; exit non-zero if any',
+        )
+    
+    def handle(self, *args, **options):
+        if not options['check']:
+            missing = missing_schema(MODELS)
+            if missing:
+                self.stdout.write(f"Installing {len(missing)} schema item(s)...")
+                for item in install_schema(items=missing):
+                    self.stdout.write(f"  ✓ {item}")
+        
+        missing = missing_schema(MODELS)
+        if missing:
+            for item in missing:
+                self.stderr.write(f"  ✗ missing: {item}")
+            raise CommandError(f"{len(missing)} schema item(s) missing")
+        
+        self.stdout.write(self.style.SUCCESS('Graph schema OK'))
@@ -0,0 +1,202 @@
+"""
+Neo4j admin list tests (keyset paging, filters, cached counts).
+
+Run with `python manage.py test graph` (no Neo4j calls; db.cypher_query is faked).
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase
+
+from graph.admin import (
+    CompanyAdmin,
+    CompanyProxy,
+    DailyQuoteAdmin,
+    DailyQuoteProxy,
+    NewsArticleAdmin,
+    NewsArticleProxy,
+)
+from libs.neo4j_models import Company
+
+
+class FakeKeysetGraph:
+    """
+    Evaluates fetch_page's Cypher on a list of nodes.
+    
+    Cursor predicates compare (key, uid) tuples, which is what
+    `n.key > $key OR (n.key = $key AND n.uid > $uid)` means.
+    """
+    
+    def __init__(self, field, nodes):
+        self.field = field
+        self.nodes = nodes
+        self.queries = []
+    
+    def cypher_query(self, query, params, resolve_objects=False):
+        self.queries.append((query, params))
+        rows = sorted(((getattr(n, self.field), n.uid), n) for n in self.nodes)
+        if 'key' in params:
+            cursor = (params['key'], params.get('uid', params['key']))
+            if f"n.{self.field} > $key" in query:
+                rows = [row for row in rows if row[0] > cursor]
+            else:
+                rows = [row for row in rows if row[0] < cursor]
+        if ' DESC' in query:
+            rows.reverse()
+        return [[n, key, uid] for (key, uid), n in rows[:params['limit']]], None
+
+
+class KeysetPagingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.admin = DailyQuoteAdmin(DailyQuoteProxy, admin.site)
+        self.admin.list_per_page = 2
+        # Five quotes on two dates: duplicate keys are split only by uid
+        self.nodes = [
+            SimpleNamespace(date='2024-01-02', uid='a'),
+            SimpleNamespace(date='2024-01-02', uid='c'),
+            SimpleNamespace(date='2024-01-02', uid='b'),
+            SimpleNamespace(date='2024-01-03', uid='a'),
+            SimpleNamespace(date='2024-01-03', uid='b'),
+        ]
+        self.graph = FakeKeysetGraph('date', self.nodes)
+        patcher = mock.patch('graph.admin.db', self.graph)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def keys(self, nodes):
+        return [(n.date, n.uid) for n in nodes]
+    
+    def test_next_pages_walk_duplicate_keys_by_uid(self):
+        nodes, first, last, has_more = self.admin.fetch_page()
+        self.assertEqual(self.keys(nodes), [('2024-01-02', 'a'), ('2024-01-02', 'b')])
+        self.assertEqual((first, last), (('2024-01-02', 'a'), ('2024-01-02', 'b')))
+        self.assertTrue(has_more)
+        
+        nodes, first, last, has_more = self.admin.fetch_page(after=last)
+        self.assertEqual(self.keys(nodes), [('2024-01-02', 'c'), ('2024-01-03', 'a')])
+        self.assertTrue(has_more)
+        
+        nodes, first, last, has_more = self.admin.fetch_page(after=last)
+        self.assertEqual(self.keys(nodes), [('2024-01-03', 'b')])
+        self.assertFalse(has_more)
+    
+    def test_cursor_predicate_uses_uid_tiebreak(self):
+        self.admin.fetch_page(after=('2024-01-02', 'b'))
+        query, params = self.graph.queries[-1]
+        self.assertIn("(n.date > $key OR (n.date = $key AND n.uid > $uid))", query)
+        self.assertIn("ORDER BY n.date, n.uid LIMIT $limit", query)
+        self.assertEqual((params['key'], params['uid'], params['limit']), ('2024-01-02', 'b', 3))
+    
+    def test_prev_page_is_returned_in_ascending_order(self):
+        nodes, first, last, has_more = self.admin.fetch_page(before=('2024-01-03', 'b'))
+        self.assertEqual(self.keys(nodes), [('2024-01-02', 'c'), ('2024-01-03', 'a')])
+        self.assertEqual(first, ('2024-01-02', 'c'))
+        self.assertTrue(has_more)
+        query, _ = self.graph.queries[-1]
+        self.assertIn("ORDER BY n.date DESC, n.uid DESC", query)
+        
+        nodes, first, last, has_more = self.admin.fetch_page(before=first)
+        self.assertEqual(self.keys(nodes), [('2024-01-02', 'a'), ('2024-01-02', 'b')])
+        self.assertFalse(has_more)
+    
+    def test_has_more_at_exact_page_boundary(self):
+        """A last page that is exactly full does not claim a next page."""
+        self.graph.nodes = self.nodes[:4]
+        _, _, last, has_more = self.admin.fetch_page()
+        self.assertTrue(has_more)
+        nodes, _, last, has_more = self.admin.fetch_page(after=last)
+        self.assertEqual(len(nodes), 2)
+        self.assertFalse(has_more)
+        
+        self.assertEqual(self.admin.fetch_page(after=last), ([], None, None, False))
+    
+    def test_uid_keyset_has_no_tiebreak(self):
+        self.admin.keyset_field = 'uid'
+        self.graph.field = 'uid'
+        self.graph.nodes = [SimpleNamespace(uid=u) for u in 'abc']
+        self.admin.fetch_page(after=('a', ''))
+        query, params = self.graph.queries[-1]
+        self.assertIn("n.uid > $key", query)
+        self.assertNotIn('$uid', query)
+
+
+class FilterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.companies = CompanyAdmin(CompanyProxy, admin.site)
+        self.news = NewsArticleAdmin(NewsArticleProxy, admin.site)
+        self.quotes = DailyQuoteAdmin(DailyQuoteProxy, admin.site)
+    
+    def test_only_declared_fields_become_predicates(self):
+        query = QueryDict('q=aap&exchange=NASDAQ&name=Apple&uid=x&n.ticker%20%3D%201=1')
+        clauses, params, active = self.companies.build_filters(query)
+        self.assertEqual(clauses, ["(n.ticker STARTS WITH $q0)", "n.exchange = $f_exchange"])
+        self.assertEqual(params, {'q0': 'AAP', 'f_exchange': 'NASDAQ'})
+        self.assertEqual(active, {'q': 'aap', 'exchange': 'NASDAQ'})
+    
+    def test_unknown_and_blank_params_are_ignored(self):
+        query = QueryDict('foo=bar&exchange=%20&published_at__gte=2024-01-01&after=AAPL&page=3')
+        self.assertEqual(self.companies.build_filters(query), ([], {}, {}))
+        # Search is off for admins without neo4j_search_fields
+        self.assertEqual(self.news.build_filters(QueryDict('q=fed')), ([], {}, {}))
+    
+    def test_range_bounds_are_coerced_to_the_property_type(self):
+        query = QueryDict('published_at__gte=2024-01-02&published_at__lte=1704326400&source_name=Reuters')
+        clauses, params, active = self.news.build_filters(query)
+        self.assertEqual(clauses, [
+            "n.source_name = $f_source_name",
+            "n.published_at >= $r_published_at_gte",
+            "n.published_at <= $r_published_at_lte",
+        ])
+        self.assertEqual(params['r_published_at_gte'], datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(params['r_published_at_lte'], 1704326400.0)
+        self.assertEqual(active['published_at__gte'], '2024-01-02')
+        
+        # DateProperty values stay ISO strings, tickers are upper-cased
+        clauses, params, _ = self.quotes.build_filters(QueryDict('ticker=msft&date__gte=2024-01-01'))
+        self.assertEqual(params, {'f_ticker': 'MSFT', 'r_date_gte': '2024-01-01'})
+        self.assertEqual(clauses, ["n.ticker = $f_ticker", "n.date >= $r_date_gte"])
+    
+    def test_malformed_range_value_raises(self):
+        """The changelist turns this into an error message instead of a query."""
+        with self.assertRaises(ValueError):
+            self.news.build_filters(QueryDict('published_at__gte=yesterday'))
+
+
+class CountCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.admin = CompanyAdmin(CompanyProxy, admin.site)
+        patcher = mock.patch('graph.admin.db')
+        self.db = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db.cypher_query.return_value = ([[42]], None)
+    
+    def test_count_is_cached_per_filter(self):
+        where = "WHERE n.exchange = $f_exchange"
+        self.assertEqual(self.admin.count_nodes(where, {'f_exchange': 'NASDAQ'}), 42)
+        self.assertEqual(self.admin.count_nodes(where, {'f_exchange': 'NASDAQ'}), 42)
+        self.assertEqual(self.db.cypher_query.call_count, 1)
+        self.db.cypher_query.assert_called_with(
+            f"MATCH (n:`{Company.__label__}`) WHERE n.exchange = $f_exchange RETURN count(n)",
+            {'f_exchange': 'NASDAQ'},
+        )
+        
+        self.db.cypher_query.return_value = ([[7]], None)
+        self.assertEqual(self.admin.count_nodes(where, {'f_exchange': 'NYSE'}), 7)
+        self.assertEqual(self.admin.count_nodes(), 7)
+        self.assertEqual(self.db.cypher_query.call_count, 3)
+        self.assertEqual(self.admin.count_nodes(where, {'f_exchange': 'NASDAQ'}), 42)
+    
+    def test_count_key_includes_the_label(self):
+        self.admin.count_nodes()
+        NewsArticleAdmin(NewsArticleProxy, admin.site).count_nodes()
+        self.assertEqual(self.db.cypher_query.call_count, 2)
@@ -7,7 +7,8 @@ from django.contrib import messages
 from django_fsm import can_proceed
 from unfold.admin import ModelAdmin
 
-from .models import DataBatchRecord, CrawlerTaskRecord
+from .models import DataBatchRecord, CrawlerTaskRecord, PipelineJob
+from .services import pipeline_service
 
 
 @admin.register(DataBatchRecord)
@@ -17,19 +18,21 @@ class DataBatchAdmin(ModelAdmin):
     list_display = ['batch_id', 'source', 'data_type', 'record_count', 'error_count', 'status', 'created_at']
     list_filter = ['status', 'source', 'data_type', 'created_at']
     search_fields = ['batch_id', 'source']
-    readonly_fields = ['batch_id', 'neo4j_uid', 'created_at', 'updated_at', 'reviewed_at']
+    readonly_fields = [
+        'batch_id', 'neo4j_uid', 'created_at', 'updated_at', 'reviewed_at',
+        'commit_cursor', 'commit_started_at',
+        'inserted_count', 'updated_count', 'unchanged_count',
+    ]
     
     actions = ['action_start_cleaning', 'action_submit_review', 'action_approve', 'action_commit']
     
-    @admin.action(description="Start Cleaning")
+    @admin.action(description="Start Cleaning (background)")
     def action_start_cleaning(self, request, queryset):
         for batch in queryset:
-            if can_proceed(batch.start_cleaning):
-                batch.start_cleaning()
-                batch.save()
-                messages.success(request, f"Started cleaning: {batch.batch_id}")
-            else:
+            if not can_proceed(batch.start_cleaning):
                 messages.warning(request, f"Cannot start cleaning: {batch.batch_id} (status={batch.status})")
+                continue
+            self._enqueue(request, batch, PipelineJob.ACTION_CLEAN)
     
     @admin.action(description="Submit for Review")
     def action_submit_review(self, request, queryset):
@@ -47,13 +50,46 @@ class DataBatchAdmin(ModelAdmin):
                 batch.save()
                 messages.success(request, f"Approved: {batch.batch_id}")
     
-    @admin.action(description="Commit to Neo4j")
+    @admin.action(description="Commit to Neo4j (background)")
     def action_commit(self, request, queryset):
         for batch in queryset:
-            if can_proceed(batch.commit):
-                batch.commit()
-                batch.save()
-                messages.success(request, f"Committed: {batch.batch_id}")
+            if not can_proceed(batch.commit):
+                messages.warning(request, f"Cannot commit: {batch.batch_id} (status={batch.status})")
+                continue
+            self._enqueue(request, batch, PipelineJob.ACTION_COMMIT)
+    
+    def _enqueue(self, request, batch, action):
+        job = pipeline_service.enqueue_job(batch, action, user=request.user)
+        if job:
+            messages.success(request, f"Queued {action}: {batch.batch_id} (job #{job.pk})")
+        else:
+            messages.warning(request, f"Job already queued or running: {batch.batch_id}")
+
+
+@admin.register(PipelineJob)
+class PipelineJobAdmin(ModelAdmin):
+    """Admin for background PipelineJob queue."""
+    
+    list_display = ['id', 'batch', 'action', 'status', 'progress_display', 'attempts', 'worker', 'created_at']
+    list_filter = ['status', 'action']
+    search_fields = ['batch__batch_id']
+    readonly_fields = [
+        'batch', 'action', 'processed', 'total', 'attempts', 'worker',
+        'last_error', 'created_at', 'started_at', 'heartbeat_at', 'finished_at', 'created_by',
+    ]
+    actions = ['action_requeue']
+    
+    @admin.display(description="Progress")
+    def progress_display(self, obj):
+        return f"{obj.processed}/{obj.total} ({obj.progress:.0%})"
+    
+    @admin.action(description="Requeue")
+    def action_requeue(self, request, queryset):
+        for job in queryset:
+            if can_proceed(job.requeue):
+                job.requeue()
+                job.save()
+                messages.success(request, f"Requeued job #{job.pk}")
 
 
 @admin.register(CrawlerTaskRecord)
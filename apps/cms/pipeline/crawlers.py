@@ -0,0 +1,57 @@
+"""
+Crawler Registry - Maps a task's source_type to a fetch function.
+
+A crawler receives the task's target symbols and returns
+(data_type, records); records go through the normal batch pipeline.
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import yfinance
+except ImportError:  # pragma: no cover
+    yfinance = None  # type: ignore
+
+CrawlerResult = Tuple[str, List[Dict[str, Any]]]
+Crawler = Callable[[List[str]], CrawlerResult]
+
+CRAWLERS: Dict[str, Crawler] = {}
+
+
+def register_crawler(source_type: str):
+    """Decorator registering a crawler for a source_type."""
+    def decorator(fn: Crawler) -> Crawler:
+        CRAWLERS[source_type] = fn
+        return fn
+    return decorator
+
+
+def get_crawler(source_type: str) -> Crawler:
+    try:
+        return CRAWLERS[source_type]
+    except KeyError:
+        raise ValueError(f"No crawler registered for source_type: {source_type}")
+
+
+@register_crawler('yfinance')
+def crawl_yfinance_quotes(symbols: List[str]) -> CrawlerResult:
+    """Fetch the last few daily bars for each symbol."""
+    if yfinance is None:
+        raise RuntimeError("yfinance is not installed")
+    
+    records = []
+    for symbol in symbols:
+        history = yfinance.Ticker(symbol).history(period='5d', auto_adjust=False)
+        for ts, row in history.iterrows():
+            day: date = ts.date()
+            records.append({
+                'ticker': symbol.upper(),
+                'date': day.isoformat(),
+                'open': float(row['Open']),
+                'high': float(row['High']),
+                'low': float(row['Low']),
+                'close': float(row['Close']),
+                'volume': float(row['Volume']),
+            })
+    return 'quote', records
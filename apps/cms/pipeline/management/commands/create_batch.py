@@ -1,42 +1,63 @@
 """
-Create a test data batch.
+Create a data batch.
 
 Usage:
     python manage.py create_batch --source yfinance --type company --data '[{"ticker":"AAPL","name":"Apple"}]'
+    python manage.py create_batch --source yfinance --type quote --file quotes.ndjson.gz
+    python manage.py create_batch --source yfinance --type quote --file quotes.csv --chunk-size 10000
 """
 
 import json
 
 from django.core.management.base import BaseCommand
 
+from pipeline.readers import FORMATS, iter_records
 from pipeline.services import pipeline_service
 
 
 class Command(BaseCommand):
-    help = 'Create a data batch for testing'
+    help = 'Create a data batch from inline JSON or a streamed NDJSON/CSV file'
     
     def add_arguments(self, parser):
         parser.add_argument('--source', required=True, help='Data source name')
         parser.add_argument('--type', required=True, help='Data type: company/quote/earnings/news')
-        parser.add_argument('--data', required=True, help='JSON array of records')
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument('--data', help='JSON array of records')
+        group.add_argument('--file', help='NDJSON or CSV file (optionally .gz), streamed in chunks')
+        parser.add_argument('--format', choices=FORMATS, help='File format (default: from extension)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=pipeline_service.STORAGE_CHUNK_SIZE,
+            help='Records per stored chunk when reading --file',
+        )
     
     def handle(self, *args, **options):
         source = options['source']
         data_type = options['type']
         
-        try:
-            raw_data = json.loads(options['data'])
-        except json.JSONDecodeError as e:
-            self.stderr.write(f"Invalid JSON: {e}")
-            return
-        
-        batch = pipeline_service.create_batch(
-            source=source,
-            data_type=data_type,
-            raw_data=raw_data,
-        )
+        if options['file']:
+            try:
+                batch = pipeline_service.create_batch_from_stream(
+                    source=source,
+                    data_type=data_type,
+                    records=iter_records(options['file'], options['format']),
+                    chunk_size=options['chunk_size'],
+                )
+            except (OSError, ValueError) as e:
+                self.stderr.write(f"Cannot read {options['file']}: {e}")
+                return
+        else:
+            try:
+                raw_data = json.loads(options['data'])
+            except json.JSONDecodeError as e:
+                self.stderr.write(f"Invalid JSON: {e}")
+                return
+            
+            batch = pipeline_service.create_batch(
+                source=source,
+                data_type=data_type,
+                raw_data=raw_data,
+            )
         
         self.stdout.write(self.style.SUCCESS(
             f"Created batch: {batch.batch_id} ({batch.record_count} records)"
         ))
-
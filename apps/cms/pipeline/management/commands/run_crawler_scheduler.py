@@ -0,0 +1,62 @@
+"""
+Run the crawler cron scheduler.
+
+Usage:
+    python manage.py run_crawler_scheduler
+    python manage.py run_crawler_scheduler --once
+"""
+
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from libs.config import settings as app_settings
+from pipeline.scheduler import CrawlerScheduler
+
+
+class Command(BaseCommand):
+    help = 'Run due crawler tasks on their schedule_cron'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-workers', type=int, default=app_settings.crawler_max_workers,
+            help='Max crawler tasks running at once',
+        )
+        parser.add_argument(
+            '--source-concurrency', type=int, default=app_settings.crawler_source_concurrency,
+            help='Max concurrent runs per source_type',
+        )
+        parser.add_argument(
+            '--source-min-interval', type=float, default=0.0,
+            help='Min seconds between dispatches to the same source_type',
+        )
+        parser.add_argument('--tick', type=float, default=30.0, help='Seconds between schedule checks')
+        parser.add_argument('--once', action='store_true', help='Dispatch due tasks once and exit')
+        parser.add_argument(
+            '--recover-after', type=int, default=3600,
+            help='Fail tasks left running longer than this many seconds (crashed schedulers)',
+        )
+    
+    def handle(self, *args, **options):
+        scheduler = CrawlerScheduler(
+            max_workers=options['max_workers'],
+            source_concurrency=options['source_concurrency'],
+            source_min_interval=options['source_min_interval'],
+            tick_seconds=options['tick'],
+        )
+        
+        recovered = scheduler.recover_stale_tasks(timedelta(seconds=options['recover_after']))
+        if recovered:
+            self.stdout.write(f"Failed {recovered} stale running task(s)")
+        
+        signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Scheduler running (max_workers={scheduler.max_workers})"
+        ))
+        try:
+            scheduler.run(once=options['once'])
+        except KeyboardInterrupt:
+            scheduler.stop()
+        self.stdout.write('Scheduler stopped')
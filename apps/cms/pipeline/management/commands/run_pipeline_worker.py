@@ -0,0 +1,57 @@
+"""
+Run the background pipeline worker.
+
+Usage:
+    python manage.py run_pipeline_worker --concurrency 4
+    python manage.py run_pipeline_worker --once
+"""
+
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from libs.config import settings as app_settings
+from pipeline.worker import PipelineWorker
+
+
+class Command(BaseCommand):
+    help = 'Run queued pipeline clean/commit jobs'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=app_settings.pipeline_worker_concurrency,
+            help='Max jobs running at once',
+        )
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between polls')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+        parser.add_argument(
+            '--recover-after', type=int, default=600,
+            help='Requeue running jobs with no heartbeat for this many seconds (dead workers)',
+        )
+        parser.add_argument(
+            '--heartbeat-interval', type=float, default=30.0,
+            help='Seconds between heartbeats of a running job (keep well below --recover-after)',
+        )
+    
+    def handle(self, *args, **options):
+        worker = PipelineWorker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            heartbeat_interval=options['heartbeat_interval'],
+        )
+        
+        recovered = worker.recover_stale_jobs(timedelta(seconds=options['recover_after']))
+        if recovered:
+            self.stdout.write(f"Requeued {recovered} stale job(s)")
+        
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {worker.name} running (concurrency={worker.concurrency})"
+        ))
+        try:
+            worker.run(once=options['once'])
+        except KeyboardInterrupt:
+            worker.stop()
+        self.stdout.write('Worker stopped')
@@ -16,7 +16,8 @@ SAMPLE_SOURCES = [
 ]
 
 SAMPLE_TASKS = [
-    {'name': 'SP500 Daily Quotes', 'source_type': 'yfinance', 'status': 'pending'},
+    {'name': 'SP500 Daily Quotes', 'source_type': 'yfinance', 'status': 'pending',
+     'schedule_cron': '30 21 * * 1-5', 'target_symbols': ['AAPL', 'MSFT', 'NVDA']},
     {'name': 'SEC Quarterly Filings', 'source_type': 'sec_edgar', 'status': 'pending'},
 ]
 
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='databatchrecord',
+            name='commit_cursor',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='databatchrecord',
+            name='commit_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0003_pipelinejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='databatchrecord',
+            name='inserted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='databatchrecord',
+            name='updated_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='databatchrecord',
+            name='unchanged_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
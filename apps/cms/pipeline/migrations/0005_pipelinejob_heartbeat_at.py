@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0004_databatchrecord_commit_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipelinejob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
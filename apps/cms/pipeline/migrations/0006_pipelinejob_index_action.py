@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0005_pipelinejob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipelinejob',
+            name='action',
+            field=models.CharField(choices=[('clean', 'Clean'), ('commit', 'Commit'), ('index', 'Rebuild vector index')], max_length=20),
+        ),
+    ]
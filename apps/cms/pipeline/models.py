@@ -47,6 +47,16 @@ class DataBatchRecord(models.Model):
     reviewed_at = models.DateTimeField(null=True, blank=True)
     review_note = models.TextField(blank=True)
     
+    # Commit checkpoint: number of cleaned records already written to Neo4j.
+    # Advanced once per chunk so an interrupted commit resumes from here.
+    commit_cursor = models.IntegerField(default=0)
+    commit_started_at = models.DateTimeField(null=True, blank=True)
+    
+    # Commit outcome per record (content-hash change detection)
+    inserted_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    unchanged_count = models.IntegerField(default=0)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Data Batch'
@@ -55,6 +65,28 @@ class DataBatchRecord(models.Model):
     def __str__(self):
         return f"{self.batch_id} ({self.status})"
     
+    @property
+    def commit_progress(self) -> float:
+        """Fraction of records committed so far (0.0 - 1.0)."""
+        if self.status == 'committed':
+            return 1.0
+        if not self.record_count:
+            return 0.0
+        return min(self.commit_cursor / self.record_count, 1.0)
+    
+    def save_checkpoint(self, cursor: int, inserted: int = 0, updated: int = 0, unchanged: int = 0) -> None:
+        """Persist commit progress and chunk counts without touching FSM state."""
+        self.commit_cursor = cursor
+        self.inserted_count += inserted
+        self.updated_count += updated
+        self.unchanged_count += unchanged
+        if self.commit_started_at is None:
+            self.commit_started_at = timezone.now()
+        self.save(update_fields=[
+            'commit_cursor', 'commit_started_at',
+            'inserted_count', 'updated_count', 'unchanged_count', 'updated_at',
+        ])
+    
     # ==========================================================================
     # FSM Transitions
     # ==========================================================================
@@ -147,3 +179,98 @@ class CrawlerTaskRecord(models.Model):
     def reset(self):
         pass
 
+
+
+class PipelineJob(models.Model):
+    """
+    DB-backed queue entry for running a pipeline step in the background.
+    
+    Admin actions enqueue jobs; `manage.py run_pipeline_worker` claims
+    and executes them outside the HTTP request. Commits queue `index`
+    jobs to rebuild the vector index of the batch's data type.
+    """
+    
+    ACTION_CLEAN = 'clean'
+    ACTION_COMMIT = 'commit'
+    ACTION_INDEX = 'index'
+    ACTION_CHOICES = [
+        (ACTION_CLEAN, 'Clean'),
+        (ACTION_COMMIT, 'Commit'),
+        (ACTION_INDEX, 'Rebuild vector index'),
+    ]
+    
+    # Statuses that block enqueueing another job for the same batch
+    ACTIVE_STATUSES = ['queued', 'running']
+    
+    batch = models.ForeignKey(
+        DataBatchRecord, on_delete=models.CASCADE, related_name='jobs'
+    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    
+    # FSM State: queued → running → succeeded / failed
+    status = FSMField(default='queued', protected=True, db_index=True)
+    
+    # Progress
+    processed = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    # Audit
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Bumped on start and every progress report; a running job whose
+    # heartbeat goes stale belongs to a dead worker.
+    heartbeat_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    created_by = models.ForeignKey(
+        'auth.User', on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='pipeline_jobs'
+    )
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Pipeline Job'
+        verbose_name_plural = 'Pipeline Jobs'
+    
+    def __str__(self):
+        return f"{self.action}:{self.batch.batch_id} ({self.status})"
+    
+    @property
+    def progress(self) -> float:
+        """Fraction of records processed (0.0 - 1.0)."""
+        if self.status == 'succeeded':
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.processed / self.total, 1.0)
+    
+    def report_progress(self, processed: int) -> None:
+        """Persist progress and heartbeat without touching FSM state."""
+        self.processed = processed
+        self.heartbeat_at = timezone.now()
+        self.save(update_fields=['processed', 'heartbeat_at'])
+    
+    # FSM Transitions
+    
+    @transition(field=status, source='queued', target='running')
+    def start(self, worker: str):
+        self.worker = worker
+        self.attempts += 1
+        self.started_at = timezone.now()
+        self.heartbeat_at = self.started_at
+    
+    @transition(field=status, source='running', target='succeeded')
+    def succeed(self):
+        self.last_error = ''
+        self.finished_at = timezone.now()
+    
+    @transition(field=status, source='running', target='failed')
+    def fail(self, error: str):
+        self.last_error = error[:1000]
+        self.finished_at = timezone.now()
+    
+    @transition(field=status, source=['running', 'failed'], target='queued')
+    def requeue(self):
+        self.worker = ''
@@ -0,0 +1,82 @@
+"""
+Record Readers - Stream records from NDJSON / CSV files.
+
+Both readers yield one dict per line and never load the whole file;
+`.gz` files are decompressed on the fly.
+"""
+
+import csv
+import gzip
+import io
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+FORMATS = ('ndjson', 'csv')
+
+# CSV columns kept as text even when they look numeric ("1234", "NAN", "2024")
+TEXT_COLUMNS = frozenset({'ticker', 'article_id', 'fiscal_period'})
+
+
+def detect_format(path: str) -> str:
+    """Guess format from extension (.ndjson/.jsonl/.csv, optionally .gz)."""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes = suffixes[:-1]
+    ext = suffixes[-1] if suffixes else ''
+    if ext in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    if ext == '.csv':
+        return 'csv'
+    raise ValueError(f"Cannot detect format of {path}; pass --format")
+
+
+def open_text(path: str) -> io.TextIOBase:
+    if path.lower().endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def iter_ndjson(stream) -> Iterator[Dict[str, Any]]:
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no}: {e}")
+
+
+def _coerce(value: str) -> Any:
+    """CSV cells are text; restore numbers (not NaN/inf spellings) and empty cells."""
+    if value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return number if math.isfinite(number) else value
+
+
+def iter_csv(stream) -> Iterator[Dict[str, Any]]:
+    for row in csv.DictReader(stream):
+        yield {
+            key: (value or None) if key in TEXT_COLUMNS else _coerce(value)
+            for key, value in row.items()
+        }
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream records from a file."""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    reader = iter_ndjson if fmt == 'ndjson' else iter_csv
+    with open_text(path) as stream:
+        yield from reader(stream)
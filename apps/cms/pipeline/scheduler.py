@@ -0,0 +1,286 @@
+"""
+Crawler Scheduler - Fires CrawlerTaskRecord / CrawlerTask on their cron.
+
+Each tick finds active tasks whose next cron fire time (after last_run_at)
+has passed, moves them to `running` and hands them to a bounded thread
+pool. Claims are atomic (row lock for Django tasks, a conditional Cypher
+SET for Neo4j tasks) and a task already `running` is never picked up
+again, so runs of the same task cannot overlap, even across schedulers.
+Tasks left `running` by a crashed scheduler are failed by
+`recover_stale_tasks` so they become due again. Per-source limits cap
+concurrent runs and the spacing between dispatches against one upstream API.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable, Dict, List, Optional
+
+from croniter import CroniterBadCronError, croniter
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from neomodel import db
+
+from libs.neo4j_models import CrawlerTask
+
+from .crawlers import get_crawler
+from .models import CrawlerTaskRecord
+from .services import pipeline_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledRun:
+    """A due task, independent of whether it lives in Django or Neo4j."""
+    key: str
+    name: str
+    source_type: str
+    target_symbols: List[str]
+    complete: Callable[[], None]
+    fail: Callable[[str], None]
+
+
+class SourceRateLimiter:
+    """Per-source concurrency cap plus minimum spacing between dispatches."""
+    
+    def __init__(self, max_concurrent: int = 1, min_interval: float = 0.0) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._last_dispatch: Dict[str, float] = {}
+    
+    def try_acquire(self, source: str) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._running.get(source, 0) >= self.max_concurrent:
+                return False
+            if now - self._last_dispatch.get(source, float('-inf')) < self.min_interval:
+                return False
+            self._running[source] = self._running.get(source, 0) + 1
+            self._last_dispatch[source] = now
+            return True
+    
+    def release(self, source: str) -> None:
+        with self._lock:
+            self._running[source] = max(0, self._running.get(source, 0) - 1)
+
+
+def next_fire_time(expr: str, after: datetime) -> Optional[datetime]:
+    """Next cron fire time strictly after `after`, or None if expr is invalid."""
+    if after.tzinfo is None:
+        after = after.replace(tzinfo=dt_timezone.utc)
+    try:
+        return croniter(expr, after).get_next(datetime)
+    except (CroniterBadCronError, ValueError, KeyError):
+        return None
+
+
+def is_due(expr: str, last_run_at: Optional[datetime], created_at: Optional[datetime], now: datetime) -> bool:
+    if not expr:
+        return False
+    fire = next_fire_time(expr, last_run_at or created_at or now)
+    if fire is None:
+        logger.warning("Invalid cron expression: %r", expr)
+        return False
+    return fire <= now
+
+
+class CrawlerScheduler:
+    """Polls for due crawler tasks and runs them in a bounded pool."""
+    
+    def __init__(
+        self,
+        max_workers: int = 4,
+        source_concurrency: int = 1,
+        source_min_interval: float = 0.0,
+        tick_seconds: float = 30.0,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.tick_seconds = tick_seconds
+        self.limiter = SourceRateLimiter(source_concurrency, source_min_interval)
+        self._slots = threading.Semaphore(self.max_workers)
+        self._stopping = threading.Event()
+    
+    # -------------------------------------------------------------------------
+    # Claiming due tasks
+    # -------------------------------------------------------------------------
+    
+    def _claim_record(self, record_id: int) -> Optional[ScheduledRun]:
+        """Move a Django task to running; None if someone else got it."""
+        with transaction.atomic():
+            task = (
+                CrawlerTaskRecord.objects
+                .select_for_update(skip_locked=True)
+                .filter(pk=record_id, is_active=True)
+                .exclude(status='running')
+                .first()
+            )
+            if task is None:
+                return None
+            if task.status != 'pending':
+                task.reset()
+            task.start()
+            task.save()
+        
+        def complete():
+            task.complete()
+            task.save()
+        
+        def fail(error: str):
+            task.fail(error=error)
+            task.save()
+        
+        return ScheduledRun(
+            key=f"record:{task.pk}",
+            name=task.name,
+            source_type=task.source_type,
+            target_symbols=list(task.target_symbols or []),
+            complete=complete,
+            fail=fail,
+        )
+    
+    def _claim_node(self, node: CrawlerTask) -> Optional[ScheduledRun]:
+        """
+        Move a Neo4j task to running in one conditional SET; None if someone
+        else got it (it is running, or has run since `node` was read).
+        last_run_at is an epoch float, compared to the millisecond because
+        inflating it to a datetime drops sub-microsecond digits.
+        """
+        last_run_at = node.last_run_at
+        rows, _ = db.cypher_query(
+            f"MATCH (t:`{CrawlerTask.__label__}` {{uid: $uid}}) "
+            "WHERE t.status <> 'running' AND t.is_active "
+            "AND abs(coalesce(t.last_run_at, -1.0) - $last_run_at) < 0.001 "
+            "SET t.status = 'running', t.last_run_at = $now, t.updated_at = $now "
+            "RETURN t",
+            {
+                'uid': node.uid,
+                'last_run_at': CrawlerTask.last_run_at.deflate(last_run_at) if last_run_at else -1.0,
+                'now': time.time(),
+            },
+            resolve_objects=True,
+        )
+        if not rows:
+            return None
+        node = rows[0][0]
+        return ScheduledRun(
+            key=f"node:{node.uid}",
+            name=node.name,
+            source_type=node.source_type,
+            target_symbols=list(node.target_symbols or []),
+            complete=node.mark_completed,
+            fail=node.mark_failed,
+        )
+    
+    def recover_stale_tasks(self, stale_after: timedelta) -> int:
+        """
+        Fail tasks left `running` (by a crashed scheduler) for longer than
+        `stale_after`, so they are picked up again at their next cron fire.
+        """
+        cutoff = timezone.now() - stale_after
+        error = f"Interrupted: still running after {int(stale_after.total_seconds())}s"
+        count = 0
+        with transaction.atomic():
+            stale = (
+                CrawlerTaskRecord.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='running', last_run_at__lt=cutoff)
+            )
+            for task in stale:
+                task.fail(error=error)
+                task.save()
+                count += 1
+        rows, _ = db.cypher_query(
+            f"MATCH (t:`{CrawlerTask.__label__}`) "
+            "WHERE t.status = 'running' AND coalesce(t.last_run_at, 0) < $cutoff "
+            "SET t.status = 'failed', t.last_error = $error, t.updated_at = $now "
+            "RETURN count(t)",
+            {'cutoff': cutoff.timestamp(), 'error': error, 'now': time.time()},
+        )
+        return count + rows[0][0]
+    
+    def due_records(self, now: datetime) -> List[CrawlerTaskRecord]:
+        candidates = (
+            CrawlerTaskRecord.objects
+            .filter(is_active=True)
+            .exclude(schedule_cron='')
+            .exclude(status='running')
+        )
+        return [
+            t for t in candidates
+            if is_due(t.schedule_cron, t.last_run_at, t.created_at, now)
+        ]
+    
+    def due_nodes(self, now: datetime) -> List[CrawlerTask]:
+        candidates = CrawlerTask.nodes.filter(is_active=True).exclude(status='running')
+        return [
+            t for t in candidates
+            if is_due(t.schedule_cron, t.last_run_at, t.created_at, now)
+        ]
+    
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+    
+    def execute(self, run: ScheduledRun) -> None:
+        try:
+            crawler = get_crawler(run.source_type)
+            data_type, records = crawler(run.target_symbols)
+            if records:
+                pipeline_service.create_batch(
+                    source=run.source_type,
+                    data_type=data_type,
+                    raw_data=records,
+                )
+        except Exception as exc:
+            logger.exception("Crawler task %s failed", run.key)
+            run.fail(str(exc))
+        else:
+            run.complete()
+        finally:
+            self.limiter.release(run.source_type)
+            self._slots.release()
+            close_old_connections()
+    
+    def tick(self, pool: ThreadPoolExecutor) -> int:
+        """Dispatch every due task that fits the limits. Returns dispatch count."""
+        now = timezone.now()
+        dispatched = 0
+        
+        due = [('record', t) for t in self.due_records(now)]
+        due += [('node', t) for t in self.due_nodes(now)]
+        
+        for kind, task in due:
+            if not self._slots.acquire(blocking=False):
+                break
+            if not self.limiter.try_acquire(task.source_type):
+                self._slots.release()
+                continue
+            
+            run = self._claim_record(task.pk) if kind == 'record' else self._claim_node(task)
+            if run is None:
+                self.limiter.release(task.source_type)
+                self._slots.release()
+                continue
+            
+            logger.info("Dispatching crawler task %s (%s)", run.key, run.name)
+            pool.submit(self.execute, run)
+            dispatched += 1
+        
+        return dispatched
+    
+    def run(self, once: bool = False) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while not self._stopping.is_set():
+                self.tick(pool)
+                if once:
+                    break
+                self._stopping.wait(self.tick_seconds)
+    
+    def stop(self) -> None:
+        self._stopping.set()
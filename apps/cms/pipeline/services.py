@@ -7,15 +7,24 @@ Uses:
 - libs/neo4j_models/ for graph operations
 """
 
+import hashlib
+import json
+import logging
 import uuid
-from typing import Any, Dict, List
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from django.contrib.auth.models import User
+from neomodel import db
 
-from libs.neo4j_models import Company, DailyQuote, DataSource, EarningsReport, NewsArticle
+from libs.events import bus, publish_events, relay_configured
+from libs.neo4j_models import Company, DailyQuote, DataBatchChunk, DataSource, EarningsReport, NewsArticle
 from libs.schema.whitelist import validate_company, validate_earnings, validate_news, validate_quote
 
-from .models import DataBatchRecord
+from .models import DataBatchRecord, PipelineJob
+
+logger = logging.getLogger(__name__)
 
 
 class PipelineService:
@@ -28,6 +37,23 @@ class PipelineService:
         'news': validate_news,
     }
     
+    # Records written per Neo4j transaction / checkpoint during commit
+    COMMIT_CHUNK_SIZE = 500
+    
+    # Records per DataBatchChunk node for streamed batches
+    STORAGE_CHUNK_SIZE = 5000
+    
+    # Validation error details kept on the batch (the count is always exact)
+    MAX_STORED_ERRORS = 1000
+    
+    # Natural key per data type, used for upserts and change detection
+    NATURAL_KEYS = {
+        'company': ('ticker',),
+        'quote': ('ticker', 'date'),
+        'earnings': ('ticker', 'fiscal_period'),
+        'news': ('article_id',),
+    }
+    
     MODELS = {
         'company': Company,
         'quote': DailyQuote,
@@ -43,7 +69,7 @@ class PipelineService:
         user: User = None,
     ) -> DataBatchRecord:
         """Create a new data batch record."""
-        batch_id = f"{source}_{data_type}_{uuid.uuid4().hex[:8]}"
+        batch_id = self._new_batch_id(source, data_type)
         
         batch = DataBatchRecord.objects.create(
             batch_id=batch_id,
@@ -69,38 +95,146 @@ class PipelineService:
         
         return batch
     
-    def clean_batch(self, batch: DataBatchRecord) -> DataBatchRecord:
-        """Clean and validate batch data using FSM transition."""
+    def create_batch_from_stream(
+        self,
+        source: str,
+        data_type: str,
+        records: Iterable[Dict[str, Any]],
+        user: User = None,
+        chunk_size: int = None,
+    ) -> DataBatchRecord:
+        """
+        Create a batch from a record iterator.
+        
+        Records are written to DataBatchChunk nodes as they are read, so
+        only one chunk is ever held in memory. If reading or storing fails
+        part way, the partial batch (record, node and chunks) is deleted
+        and the error re-raised.
+        """
         from libs.neo4j_models import DataBatch as Neo4jDataBatch
         
-        # Start cleaning
-        batch.start_cleaning()
+        chunk_size = chunk_size or self.STORAGE_CHUNK_SIZE
+        batch_id = self._new_batch_id(source, data_type)
+        
+        batch = DataBatchRecord.objects.create(
+            batch_id=batch_id,
+            source=source,
+            data_type=data_type,
+            created_by=user,
+        )
+        try:
+            neo4j_batch = Neo4jDataBatch(
+                batch_id=batch_id,
+                source=source,
+                data_type=data_type,
+                status='raw',
+            )
+            neo4j_batch.save()
+            
+            iterator = iter(records)
+            total = 0
+            index = 0
+            while True:
+                block = list(islice(iterator, chunk_size))
+                if not block:
+                    break
+                chunk = DataBatchChunk(
+                    batch_id=batch_id,
+                    chunk_index=index,
+                    record_count=len(block),
+                    raw_data=block,
+                )
+                chunk.save()
+                neo4j_batch.chunks.connect(chunk)
+                total += len(block)
+                index += 1
+            
+            neo4j_batch.chunk_count = index
+            neo4j_batch.record_count = total
+            neo4j_batch.save()
+        except BaseException:
+            self._delete_partial_batch(batch)
+            raise
+        
+        batch.neo4j_uid = neo4j_batch.uid
+        batch.record_count = total
         batch.save()
         
+        return batch
+    
+    def _delete_partial_batch(self, batch: DataBatchRecord) -> None:
+        """Remove a batch whose creation failed, with any chunks already stored."""
+        from libs.neo4j_models import DataBatch as Neo4jDataBatch
+        
+        try:
+            for model_class in (DataBatchChunk, Neo4jDataBatch):
+                db.cypher_query(
+                    f"MATCH (n:`{model_class.__label__}` {{batch_id: $batch_id}}) DETACH DELETE n",
+                    {'batch_id': batch.batch_id},
+                )
+        except Exception:
+            logger.exception("Could not delete Neo4j nodes of partial batch %s", batch.batch_id)
+        batch.delete()
+    
+    def clean_batch(
+        self,
+        batch: DataBatchRecord,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> DataBatchRecord:
+        """Clean and validate batch data using FSM transition."""
+        from libs.neo4j_models import DataBatch as Neo4jDataBatch
+        
+        # Start cleaning (a requeued job may find the batch already cleaning)
+        if batch.status != 'cleaning':
+            batch.start_cleaning()
+            batch.save()
+        
         # Get Neo4j batch
         neo4j_batch = Neo4jDataBatch.nodes.get(batch_id=batch.batch_id)
         
         # Validate using whitelist
         validator = self.VALIDATORS.get(batch.data_type)
         errors = []
+        error_count = 0
+        processed = 0
         
-        if validator:
-            for record in neo4j_batch.raw_data or []:
-                is_valid, record_errors = validator(record)
-                if record_errors:
-                    errors.append({'record': record, 'errors': record_errors})
+        def validate(records: List[Dict[str, Any]]) -> int:
+            failed = 0
+            if validator:
+                for record in records:
+                    is_valid, record_errors = validator(record)
+                    if record_errors:
+                        failed += 1
+                        if len(errors) < self.MAX_STORED_ERRORS:
+                            errors.append({'record': record, 'errors': record_errors})
+            return failed
+        
+        if neo4j_batch.chunk_count:
+            for chunk in self._iter_chunks(neo4j_batch):
+                error_count += validate(chunk.raw_data or [])
+                chunk.cleaned_data = chunk.raw_data  # All fields pass through
+                chunk.save()
+                processed += chunk.record_count
+                if on_progress:
+                    on_progress(processed)
+        else:
+            error_count = validate(neo4j_batch.raw_data or [])
+            neo4j_batch.cleaned_data = neo4j_batch.raw_data  # All fields pass through
+            processed = len(neo4j_batch.raw_data or [])
         
         # Update Neo4j batch
-        neo4j_batch.cleaned_data = neo4j_batch.raw_data  # All fields pass through
         neo4j_batch.validation_errors = errors
-        neo4j_batch.error_count = len(errors)
+        neo4j_batch.error_count = error_count
         neo4j_batch.status = 'clean'
         neo4j_batch.save()
         
         # Finish cleaning
-        batch.finish_cleaning(error_count=len(errors))
+        batch.finish_cleaning(error_count=error_count)
         batch.save()
         
+        if on_progress:
+            on_progress(processed)
+        
         return batch
     
     def submit_for_review(self, batch: DataBatchRecord) -> DataBatchRecord:
@@ -132,10 +266,28 @@ class PipelineService:
         
         return batch
     
-    def commit_batch(self, batch: DataBatchRecord) -> int:
-        """Commit approved batch to Neo4j."""
+    def commit_batch(
+        self,
+        batch: DataBatchRecord,
+        chunk_size: int = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Commit approved batch to Neo4j.
+        
+        Records are written in chunks, each inside one Neo4j transaction.
+        After every chunk the offset is checkpointed on the batch record,
+        so a retry after a crash resumes from the last committed chunk.
+        Upserts are keyed on natural keys, so replaying a chunk is safe.
+        
+        Records whose content hash matches the stored node are skipped;
+        inserted/updated/unchanged counts are accumulated on the batch.
+        """
         from libs.neo4j_models import DataBatch as Neo4jDataBatch
         
+        if batch.status == 'committed':
+            return batch.commit_cursor
+        
         neo4j_batch = Neo4jDataBatch.nodes.get(batch_id=batch.batch_id)
         
         model_class = self.MODELS.get(batch.data_type)
@@ -143,16 +295,14 @@ class PipelineService:
             raise ValueError(f"Unknown data type: {batch.data_type}")
         
         source = self._get_or_create_source(batch.source)
-        count = 0
+        chunk_size = chunk_size or self.COMMIT_CHUNK_SIZE
         
-        for record in neo4j_batch.cleaned_data or []:
-            node = self._upsert_record(model_class, record)
-            if node and hasattr(node, 'provenance'):
-                try:
-                    node.provenance.connect(source)
-                except:
-                    pass
-            count += 1
+        for start, chunk in self._iter_cleaned(neo4j_batch, chunk_size, batch.commit_cursor):
+            with db.transaction:
+                stats = self._commit_chunk(batch.data_type, model_class, chunk, source)
+            batch.save_checkpoint(start + len(chunk), **stats)
+            if on_progress:
+                on_progress(batch.commit_cursor)
         
         # Update states
         batch.commit()
@@ -161,7 +311,151 @@ class PipelineService:
         neo4j_batch.status = 'committed'
         neo4j_batch.save()
         
-        return count
+        if batch.inserted_count or batch.updated_count:
+            self._after_commit(batch, neo4j_batch)
+        
+        return batch.commit_cursor
+    
+    def enqueue_job(self, batch: DataBatchRecord, action: str, user: User = None) -> Optional[PipelineJob]:
+        """
+        Queue a background clean/commit job for a batch.
+        
+        Returns None if the batch already has a queued or running job.
+        """
+        if batch.jobs.filter(status__in=PipelineJob.ACTIVE_STATUSES).exists():
+            return None
+        return PipelineJob.objects.create(
+            batch=batch,
+            action=action,
+            total=batch.record_count,
+            created_by=user,
+        )
+    
+    def run_job(self, job: PipelineJob) -> None:
+        """Execute a claimed job's pipeline step."""
+        batch = job.batch
+        if job.action == PipelineJob.ACTION_CLEAN:
+            self.clean_batch(batch, on_progress=job.report_progress)
+        elif job.action == PipelineJob.ACTION_COMMIT:
+            self.commit_batch(batch, on_progress=job.report_progress)
+        elif job.action == PipelineJob.ACTION_INDEX:
+            from libs.analytics.vectors import build_vector_index
+            job.report_progress(build_vector_index(batch.data_type))
+        else:
+            raise ValueError(f"Unknown job action: {job.action}")
+    
+    def enqueue_index_job(self, batch: DataBatchRecord) -> Optional[PipelineJob]:
+        """
+        Queue a vector index rebuild for the batch's data type.
+        
+        Returns None if a rebuild of that type is already queued (it will
+        see this batch's records too).
+        """
+        pending = PipelineJob.objects.filter(
+            action=PipelineJob.ACTION_INDEX, status='queued', batch__data_type=batch.data_type,
+        )
+        if pending.exists():
+            return None
+        return PipelineJob.objects.create(batch=batch, action=PipelineJob.ACTION_INDEX)
+    
+    def _after_commit(self, batch: DataBatchRecord, neo4j_batch) -> None:
+        """
+        Refresh derived data that depends on the committed records.
+        
+        - Sector aggregates: sectors of the batch's tickers (earnings), or
+          all sectors when company records (and so memberships) changed.
+        - Vector indexes: a rebuild job is queued for kinds that already
+          have one (created once with `manage.py build_vector_index`); the
+          k-means build runs in the worker, not in the commit.
+        - Live events: latest bar per ticker (quote) and each article per
+          mentioned ticker (news), published for the backend's GraphQL
+          subscriptions (relayed there via EVENTS_RELAY_URL).
+        
+        Failures are logged, not raised: the batch itself is committed and
+        the derived data can be rebuilt with its management command.
+        """
+        from libs.analytics.sectors import refresh_sector_stats
+        from libs.analytics.vectors import VECTOR_SOURCES, index_root
+        
+        try:
+            if batch.data_type == 'earnings':
+                tickers = {
+                    record.get('ticker', '').upper()
+                    for _, chunk in self._iter_cleaned(neo4j_batch, self.STORAGE_CHUNK_SIZE)
+                    for record in chunk
+                }
+                refresh_sector_stats(tickers=tickers)
+            elif batch.data_type == 'company':
+                refresh_sector_stats()
+        except Exception:
+            logger.exception("Sector aggregate refresh failed after batch %s", batch.batch_id)
+        
+        if batch.data_type in VECTOR_SOURCES and (index_root() / batch.data_type / 'CURRENT').exists():
+            try:
+                self.enqueue_index_job(batch)
+            except Exception:
+                logger.exception("Could not queue vector index rebuild after batch %s", batch.batch_id)
+        
+        if batch.data_type in ('quote', 'news') and (bus.has_subscribers(batch.data_type) or relay_configured()):
+            try:
+                publish_events(self._live_events(batch.data_type, neo4j_batch))
+            except Exception:
+                logger.exception("Live event publish failed after batch %s", batch.batch_id)
+    
+    def _live_events(self, data_type: str, neo4j_batch) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(topic, symbol, data) events for a committed quote/news batch, data shaped like the stock payload."""
+        records = (record for _, chunk in self._iter_cleaned(neo4j_batch, self.STORAGE_CHUNK_SIZE) for record in chunk)
+        if data_type == 'quote':
+            latest: Dict[str, Dict[str, Any]] = {}
+            for record in records:
+                ticker = record.get('ticker', '').upper()
+                if ticker and (ticker not in latest or _parse_date(record['date']) > _parse_date(latest[ticker]['date'])):
+                    latest[ticker] = record
+            return [('quote', ticker, _quote_event(record)) for ticker, record in latest.items()]
+        events = []
+        for record in records:
+            tickers = record.get('tickers') or ([record['ticker']] if record.get('ticker') else [])
+            data = _news_event(record)
+            events.extend(('news', ticker.upper(), data) for ticker in tickers)
+        return events
+    
+    def _new_batch_id(self, source: str, data_type: str) -> str:
+        return f"{source}_{data_type}_{uuid.uuid4().hex[:8]}"
+    
+    def _iter_chunks(self, neo4j_batch, start_index: int = 0) -> Iterator[DataBatchChunk]:
+        """Load a streamed batch's chunks one at a time, in order."""
+        for index in range(start_index, neo4j_batch.chunk_count or 0):
+            yield DataBatchChunk.nodes.get(batch_id=neo4j_batch.batch_id, chunk_index=index)
+    
+    def _iter_cleaned(self, neo4j_batch, chunk_size: int, offset: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (start_offset, records) slices of cleaned records from `offset` on.
+        
+        For streamed batches, storage chunks wholly before `offset` are
+        skipped using their stored record counts, without loading data.
+        """
+        if neo4j_batch.chunk_count:
+            rows, _ = db.cypher_query(
+                f"MATCH (c:`{DataBatchChunk.__label__}` {{batch_id: $batch_id}}) "
+                "RETURN c.chunk_index, c.record_count ORDER BY c.chunk_index",
+                {'batch_id': neo4j_batch.batch_id},
+            )
+            base = 0
+            start_index = len(rows)
+            for index, count in rows:
+                if base + (count or 0) > offset:
+                    start_index = index
+                    break
+                base += count or 0
+            blocks = ((chunk.cleaned_data or []) for chunk in self._iter_chunks(neo4j_batch, start_index))
+        else:
+            base = 0
+            blocks = iter([neo4j_batch.cleaned_data or []])
+        
+        for records in blocks:
+            for i in range(max(0, offset - base), len(records), chunk_size):
+                yield base + i, records[i:i + chunk_size]
+            base += len(records)
     
     def _get_or_create_source(self, name: str) -> DataSource:
         try:
@@ -171,7 +465,54 @@ class PipelineService:
             source.save()
             return source
     
-    def _upsert_record(self, model_class, record: Dict[str, Any]):
+    def _natural_key(self, data_type: str, record: Dict[str, Any]) -> Tuple[str, ...]:
+        """Natural key of a record, normalized to match stored node values."""
+        key = []
+        for field in self.NATURAL_KEYS[data_type]:
+            value = str(record.get(field) or '')
+            if field == 'ticker':
+                value = value.upper()
+            elif field == 'date':
+                value = value[:10]
+            key.append(value)
+        return tuple(key)
+    
+    def _load_hashes(self, data_type: str, model_class, keys: List[Tuple[str, ...]]) -> Dict[Tuple[str, ...], Optional[str]]:
+        """Fetch stored content hashes for a chunk's keys in one query."""
+        fields = self.NATURAL_KEYS[data_type]
+        exprs = [f"toString(n.{f})" if f == 'date' else f"n.{f}" for f in fields]
+        where = ' AND '.join(f"{expr} IN $k{i}" for i, expr in enumerate(exprs))
+        params = {f"k{i}": sorted({key[i] for key in keys}) for i in range(len(fields))}
+        query = (
+            f"MATCH (n:`{model_class.__label__}`) WHERE {where} "
+            f"RETURN [{', '.join(exprs)}] AS key, n.content_hash AS content_hash"
+        )
+        rows, _ = db.cypher_query(query, params)
+        return {tuple(key): digest for key, digest in rows}
+    
+    def _commit_chunk(self, data_type: str, model_class, chunk: List[Dict[str, Any]], source: DataSource) -> Dict[str, int]:
+        """Write a chunk, skipping records whose content is unchanged."""
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        keyed = [(self._natural_key(data_type, r), r, content_hash(r)) for r in chunk]
+        stored = self._load_hashes(data_type, model_class, [key for key, _, _ in keyed])
+        
+        for key, record, digest in keyed:
+            if key in stored and stored[key] == digest:
+                stats['unchanged'] += 1
+                continue
+            node = self._upsert_record(model_class, record, digest)
+            if node is None:
+                continue
+            stats['updated' if key in stored else 'inserted'] += 1
+            stored[key] = digest
+            if hasattr(node, 'provenance'):
+                try:
+                    node.provenance.connect(source)
+                except:
+                    pass
+        return stats
+    
+    def _upsert_record(self, model_class, record: Dict[str, Any], digest: Optional[str] = None):
         """Upsert a single record."""
         if model_class == Company:
             ticker = record.get('ticker', '').upper()
@@ -180,29 +521,117 @@ class PipelineService:
                 for k, v in record.items():
                     if hasattr(obj, k) and k != 'ticker':
                         setattr(obj, k, v)
-                obj.save()
             except Company.DoesNotExist:
                 obj = Company(**record)
                 obj.ticker = ticker
-                obj.save()
+            obj.content_hash = digest
+            obj.save()
             return obj
         
         elif model_class == DailyQuote:
             ticker = record.get('ticker', '').upper()
-            date = record.get('date')
-            existing = DailyQuote.nodes.filter(ticker=ticker, date=date).first()
-            if existing:
+            quote_date = _parse_date(record.get('date'))
+            obj = DailyQuote.nodes.first_or_none(ticker=ticker, date=quote_date)
+            if obj:
                 for k, v in record.items():
-                    if hasattr(existing, k):
-                        setattr(existing, k, v)
-                existing.save()
-                return existing
-            obj = DailyQuote(**record)
-            obj.ticker = ticker
+                    if hasattr(obj, k) and k not in ('ticker', 'date'):
+                        setattr(obj, k, v)
+            else:
+                obj = DailyQuote(**{**record, 'date': quote_date})
+                obj.ticker = ticker
+            obj.content_hash = digest
             obj.save()
             return obj
         
+        elif model_class == EarningsReport:
+            ticker = record.get('ticker', '').upper()
+            period = record.get('fiscal_period')
+            record = _with_parsed(record, _parse_date, ('report_date', 'filing_date'))
+            obj = EarningsReport.nodes.first_or_none(ticker=ticker, fiscal_period=period)
+            if obj:
+                for k, v in record.items():
+                    if hasattr(obj, k) and k not in ('ticker', 'fiscal_period'):
+                        setattr(obj, k, v)
+            else:
+                obj = EarningsReport(**record)
+                obj.ticker = ticker
+            obj.content_hash = digest
+            obj.save()
+            return obj
+        
+        elif model_class == NewsArticle:
+            article_id = record.get('article_id')
+            record = _with_parsed(record, _parse_datetime, ('published_at',))
+            obj = NewsArticle.nodes.get_or_none(article_id=article_id)
+            if obj:
+                for k, v in record.items():
+                    if hasattr(obj, k) and k != 'article_id':
+                        setattr(obj, k, v)
+            else:
+                obj = NewsArticle(**record)
+            obj.content_hash = digest
+            obj.save()
+            return obj
+        
+        return None
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable digest of a cleaned record (key order independent)."""
+    encoded = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value is None or value == '':
         return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """ISO-8601 text (or a date) as a UTC-aware datetime; naive values are taken as UTC."""
+    if value is None or value == '':
+        return None
+    if not isinstance(value, datetime):
+        if isinstance(value, date):
+            value = datetime(value.year, value.month, value.day)
+        else:
+            value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _with_parsed(record: Dict[str, Any], parser: Callable[[Any], Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Copy of `record` with the present `fields` run through `parser` (neomodel needs date objects)."""
+    return {**record, **{f: parser(record[f]) for f in fields if f in record}}
+
+
+def _epoch_ms(value: Any) -> Optional[float]:
+    value = _parse_datetime(value)
+    return None if value is None else value.timestamp() * 1000
+
+
+def _quote_event(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Quote record as a daily_kline row."""
+    return {
+        'timestamp': _epoch_ms(_parse_date(record['date'])),
+        **{field: record.get(field) for field in ('open', 'high', 'low', 'close', 'volume')},
+    }
+
+
+def _news_event(record: Dict[str, Any]) -> Dict[str, Any]:
+    """News record as a stock payload news item."""
+    return {
+        'title': record.get('title', ''),
+        'url': record.get('url'),
+        'source': record.get('source_name'),
+        'published_at': _epoch_ms(record.get('published_at')),
+    }
 
 
 # Singleton
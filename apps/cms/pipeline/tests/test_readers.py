@@ -0,0 +1,48 @@
+"""
+Record reader tests (no database or Neo4j needed).
+"""
+
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from pipeline.readers import detect_format, iter_csv, iter_ndjson, iter_records
+
+
+class ReaderTests(SimpleTestCase):
+
+    def test_csv_restores_numbers_but_keeps_key_columns_as_text(self):
+        stream = io.StringIO(
+            "ticker,fiscal_period,article_id,close,volume,name,note\n"
+            "NAN,2024Q1,0012,1.5,100,NaN Holdings,\n"
+            "1234,2024Q2,7,2,,Infinity,inf\n"
+        )
+        rows = list(iter_csv(stream))
+        self.assertEqual(rows[0], {
+            'ticker': 'NAN', 'fiscal_period': '2024Q1', 'article_id': '0012',
+            'close': 1.5, 'volume': 100, 'name': 'NaN Holdings', 'note': None,
+        })
+        self.assertEqual(rows[1]['ticker'], '1234')
+        self.assertEqual(rows[1]['article_id'], '7')
+        self.assertEqual(rows[1]['volume'], None)
+        self.assertEqual(rows[1]['name'], 'Infinity')
+        self.assertEqual(rows[1]['note'], 'inf')
+    
+    def test_ndjson_reports_bad_line(self):
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            list(iter_ndjson(io.StringIO('{"a": 1}\n{bad\n')))
+    
+    def test_gzip_ndjson_is_streamed(self):
+        records = [{'ticker': 'AAPL', 'close': 1.0}, {'ticker': 'MSFT', 'close': 2.0}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'quotes.ndjson.gz')
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                f.write('\n'.join(json.dumps(r) for r in records))
+            self.assertEqual(detect_format(path), 'ndjson')
+            self.assertEqual(list(iter_records(path)), records)
+        with self.assertRaises(ValueError):
+            detect_format('quotes.parquet')
@@ -0,0 +1,87 @@
+"""
+Crawler scheduler tests.
+
+Run with `python manage.py test pipeline`.
+The Neo4j task tests require a running Neo4j instance.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from libs.neo4j_models import CrawlerTask
+
+from pipeline.models import CrawlerTaskRecord
+from pipeline.scheduler import CrawlerScheduler, SourceRateLimiter, is_due
+
+
+class CronTests(SimpleTestCase):
+
+    def test_is_due_after_next_fire(self):
+        last = datetime(2024, 1, 1, 0, 0, tzinfo=dt_timezone.utc)
+        self.assertFalse(is_due('0 * * * *', last, None, last + timedelta(minutes=59)))
+        self.assertTrue(is_due('0 * * * *', last, None, last + timedelta(minutes=60)))
+        self.assertFalse(is_due('not a cron', last, None, last + timedelta(days=1)))
+        self.assertFalse(is_due('', last, None, last + timedelta(days=1)))
+    
+    def test_source_limiter_caps_concurrency(self):
+        limiter = SourceRateLimiter(max_concurrent=1)
+        self.assertTrue(limiter.try_acquire('sec'))
+        self.assertFalse(limiter.try_acquire('sec'))
+        self.assertTrue(limiter.try_acquire('news'))
+        limiter.release('sec')
+        self.assertTrue(limiter.try_acquire('sec'))
+
+
+class RecordClaimTests(TestCase):
+
+    def setUp(self):
+        self.scheduler = CrawlerScheduler()
+        self.task = CrawlerTaskRecord.objects.create(name='test', source_type='sec', schedule_cron='* * * * *')
+    
+    def test_task_is_claimed_once(self):
+        self.assertIsNotNone(self.scheduler._claim_record(self.task.pk))
+        self.assertIsNone(self.scheduler._claim_record(self.task.pk))
+    
+    def test_stale_running_task_is_failed(self):
+        self.scheduler._claim_record(self.task.pk)
+        self.assertEqual(self.scheduler.recover_stale_tasks(timedelta(hours=1)), 0)
+        
+        CrawlerTaskRecord.objects.filter(pk=self.task.pk).update(last_run_at=timezone.now() - timedelta(hours=2))
+        self.assertGreaterEqual(self.scheduler.recover_stale_tasks(timedelta(hours=1)), 1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'failed')
+        self.assertIsNotNone(self.scheduler._claim_record(self.task.pk))
+
+
+class NodeClaimTests(TestCase):
+
+    def setUp(self):
+        self.scheduler = CrawlerScheduler()
+        self.node = CrawlerTask(name='zzt-scheduler-test', source_type='sec', schedule_cron='* * * * *').save()
+    
+    def tearDown(self):
+        self.node.delete()
+    
+    def test_task_is_claimed_once(self):
+        """A second claim from the same (now outdated) read loses."""
+        stale_copy = CrawlerTask.nodes.get(uid=self.node.uid)
+        run = self.scheduler._claim_node(self.node)
+        self.assertIsNotNone(run)
+        self.assertIsNone(self.scheduler._claim_node(stale_copy))
+        
+        run.complete()
+        self.assertIsNone(self.scheduler._claim_node(stale_copy))
+        self.assertIsNotNone(self.scheduler._claim_node(CrawlerTask.nodes.get(uid=self.node.uid)))
+    
+    def test_stale_running_task_is_failed(self):
+        self.scheduler._claim_node(self.node)
+        self.assertEqual(self.scheduler.recover_stale_tasks(timedelta(hours=1)), 0)
+        
+        node = CrawlerTask.nodes.get(uid=self.node.uid)
+        node.last_run_at = datetime.now(dt_timezone.utc) - timedelta(hours=2)
+        node.save()
+        self.assertEqual(self.scheduler.recover_stale_tasks(timedelta(hours=1)), 1)
+        node.refresh()
+        self.assertEqual(node.status, 'failed')
@@ -0,0 +1,152 @@
+"""
+PipelineService tests.
+
+Run with `python manage.py test pipeline`.
+Requires a running Neo4j instance; graph nodes created here use the
+ZZT* tickers / zzt-* article ids and are deleted after each test.
+"""
+
+from datetime import date, datetime, timezone
+
+from django.test import TestCase
+from neomodel import db
+
+from libs.neo4j_models import DailyQuote, DataBatchChunk, EarningsReport, NewsArticle
+
+from pipeline.models import DataBatchRecord
+from pipeline.services import PipelineService
+
+
+class PipelineGraphTestCase(TestCase):
+    """Creates batches and walks them through review to `approved`."""
+    
+    def setUp(self):
+        self.service = PipelineService()
+        self.batch_ids = []
+    
+    def tearDown(self):
+        db.cypher_query(
+            "MATCH (n) WHERE n.ticker STARTS WITH 'ZZT' OR n.article_id STARTS WITH 'zzt-' "
+            "OR n.batch_id IN $batch_ids DETACH DELETE n",
+            {'batch_ids': self.batch_ids},
+        )
+    
+    def approved_batch(self, data_type, records):
+        batch = self.service.create_batch('test', data_type, records)
+        self.batch_ids.append(batch.batch_id)
+        self.service.clean_batch(batch)
+        self.service.submit_for_review(batch)
+        batch.approve(reviewer=None)
+        batch.save()
+        return batch
+    
+    def commit(self, data_type, records, **kwargs):
+        batch = self.approved_batch(data_type, records)
+        self.service.commit_batch(batch, **kwargs)
+        return batch
+
+
+class CommitCountsTests(PipelineGraphTestCase):
+
+    QUOTES = [
+        {'ticker': 'ZZTA', 'date': '2024-01-02', 'close': 10.0},
+        {'ticker': 'ZZTA', 'date': '2024-01-03', 'close': 11.0},
+        {'ticker': 'ZZTB', 'date': '2024-01-02', 'close': 20.0},
+    ]
+    
+    def test_first_run_inserts_and_rerun_is_unchanged(self):
+        batch = self.commit('quote', self.QUOTES)
+        self.assertEqual(
+            (batch.inserted_count, batch.updated_count, batch.unchanged_count), (3, 0, 0)
+        )
+        
+        batch = self.commit('quote', self.QUOTES)
+        self.assertEqual(
+            (batch.inserted_count, batch.updated_count, batch.unchanged_count), (0, 0, 3)
+        )
+    
+    def test_changed_record_is_updated(self):
+        self.commit('quote', self.QUOTES)
+        changed = [{**self.QUOTES[0], 'close': 12.5}, *self.QUOTES[1:]]
+        batch = self.commit('quote', changed)
+        self.assertEqual(
+            (batch.inserted_count, batch.updated_count, batch.unchanged_count), (0, 1, 2)
+        )
+        quote = DailyQuote.nodes.get(ticker='ZZTA', date=date(2024, 1, 2))
+        self.assertEqual(quote.close, 12.5)
+    
+    def test_earnings_rerun_counts(self):
+        reports = [{'ticker': 'ZZTA', 'fiscal_period': '2024Q1', 'eps': 1.5}]
+        self.assertEqual(self.commit('earnings', reports).inserted_count, 1)
+        self.assertEqual(self.commit('earnings', reports).unchanged_count, 1)
+
+
+class CheckpointTests(PipelineGraphTestCase):
+
+    def test_commit_resumes_from_cursor(self):
+        """Records before commit_cursor are not written again on retry."""
+        records = [{'ticker': f'ZZT{i}', 'date': '2024-01-02', 'close': float(i)} for i in range(5)]
+        batch = self.approved_batch('quote', records)
+        batch.save_checkpoint(2)
+        self.service.commit_batch(batch, chunk_size=2)
+        
+        self.assertEqual(batch.status, 'committed')
+        self.assertEqual(batch.commit_cursor, 5)
+        self.assertEqual(batch.inserted_count, 3)
+        self.assertIsNone(DailyQuote.nodes.get_or_none(ticker='ZZT0'))
+
+
+class StreamBatchTests(PipelineGraphTestCase):
+
+    def test_stream_is_stored_in_chunks(self):
+        records = ({'ticker': f'ZZT{i}', 'date': '2024-01-02', 'close': float(i)} for i in range(5))
+        batch = self.service.create_batch_from_stream('test', 'quote', records, chunk_size=2)
+        self.batch_ids.append(batch.batch_id)
+        self.assertEqual(batch.record_count, 5)
+        self.assertEqual(
+            [c.record_count for c in DataBatchChunk.nodes.filter(batch_id=batch.batch_id).order_by('chunk_index')],
+            [2, 2, 1],
+        )
+    
+    def test_read_error_leaves_no_partial_batch(self):
+        def records():
+            yield {'ticker': 'ZZTA', 'date': '2024-01-02'}
+            yield {'ticker': 'ZZTB', 'date': '2024-01-02'}
+            raise ValueError("Invalid JSON on line 3")
+        
+        with self.assertRaises(ValueError):
+            self.service.create_batch_from_stream('zzt-broken', 'quote', records(), chunk_size=1)
+        self.assertFalse(DataBatchRecord.objects.filter(source='zzt-broken').exists())
+        rows, _ = db.cypher_query(
+            f"MATCH (n:`{DataBatchChunk.__label__}`) WHERE n.batch_id STARTS WITH 'zzt-broken_' RETURN count(n)"
+        )
+        self.assertEqual(rows[0][0], 0)
+
+
+class DateParsingTests(PipelineGraphTestCase):
+
+    def test_iso_dates_are_stored_as_dates(self):
+        """ISO strings from NDJSON/CSV are parsed before neomodel deflates them."""
+        self.commit('earnings', [{
+            'ticker': 'ZZTA',
+            'fiscal_period': '2024Q1',
+            'report_date': '2024-04-25',
+            'filing_date': '2024-05-01T00:00:00',
+        }])
+        report = EarningsReport.nodes.get(ticker='ZZTA', fiscal_period='2024Q1')
+        self.assertEqual(report.report_date, date(2024, 4, 25))
+        self.assertEqual(report.filing_date, date(2024, 5, 1))
+        
+        self.commit('earnings', [{'ticker': 'ZZTA', 'fiscal_period': '2024Q1', 'report_date': '2024-04-26'}])
+        report.refresh()
+        self.assertEqual(report.report_date, date(2024, 4, 26))
+    
+    def test_iso_datetimes_are_stored_as_datetimes(self):
+        record = {'article_id': 'zzt-1', 'title': 'Earnings beat', 'published_at': '2024-04-25T13:30:00Z'}
+        self.commit('news', [record])
+        article = NewsArticle.nodes.get(article_id='zzt-1')
+        self.assertEqual(article.published_at, datetime(2024, 4, 25, 13, 30, tzinfo=timezone.utc))
+        
+        self.commit('news', [{**record, 'published_at': '2024-04-25T14:00:00'}])
+        article.refresh()
+        self.assertEqual(article.published_at, datetime(2024, 4, 25, 14, 0, tzinfo=timezone.utc))
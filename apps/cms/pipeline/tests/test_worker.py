@@ -0,0 +1,89 @@
+"""
+PipelineJob queue and worker tests.
+
+Run with `python manage.py test pipeline` (database only, no Neo4j calls).
+"""
+
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from pipeline.models import DataBatchRecord, PipelineJob
+from pipeline.worker import PipelineWorker
+
+
+class WorkerQueueTests(TestCase):
+
+    def setUp(self):
+        self.worker = PipelineWorker()
+        self.batch = DataBatchRecord.objects.create(batch_id='test_quote_job', source='test', data_type='quote')
+    
+    def enqueue(self, batch=None):
+        return PipelineJob.objects.create(batch=batch or self.batch, action=PipelineJob.ACTION_CLEAN)
+    
+    def test_claim_next_starts_oldest_job(self):
+        first = self.enqueue()
+        other = DataBatchRecord.objects.create(batch_id='test_quote_job2', source='test', data_type='quote')
+        self.enqueue(other)
+        
+        job = self.worker.claim_next()
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.heartbeat_at, job.started_at)
+    
+    def test_report_progress_bumps_heartbeat(self):
+        self.enqueue()
+        job = self.worker.claim_next()
+        job.heartbeat_at = timezone.now() - timedelta(hours=1)
+        job.report_progress(10)
+        job.refresh_from_db()
+        self.assertEqual(job.processed, 10)
+        self.assertGreater(job.heartbeat_at, timezone.now() - timedelta(minutes=1))
+    
+    def test_recover_requeues_only_jobs_with_stale_heartbeat(self):
+        """A job started long ago but still reporting progress keeps running."""
+        self.enqueue()
+        job = self.worker.claim_next()
+        long_ago = timezone.now() - timedelta(hours=2)
+        PipelineJob.objects.filter(pk=job.pk).update(started_at=long_ago, heartbeat_at=timezone.now())
+        self.assertEqual(self.worker.recover_stale_jobs(timedelta(minutes=10)), 0)
+        
+        PipelineJob.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        self.assertEqual(self.worker.recover_stale_jobs(timedelta(minutes=10)), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+    
+    def test_beat_bumps_only_running_jobs(self):
+        self.enqueue()
+        job = self.worker.claim_next()
+        long_ago = timezone.now() - timedelta(hours=1)
+        PipelineJob.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        self.worker.beat(job)
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, timezone.now() - timedelta(minutes=1))
+        
+        PipelineJob.objects.filter(pk=job.pk).update(status='succeeded', heartbeat_at=long_ago)
+        self.worker.beat(job)
+        job.refresh_from_db()
+        self.assertEqual(job.heartbeat_at, long_ago)
+    
+    def test_execute_beats_while_the_job_runs(self):
+        """A job that reports no progress until the end still heartbeats."""
+        self.worker.heartbeat_interval = 0.02
+        self.enqueue()
+        job = self.worker.claim_next()
+        self.worker._slots.acquire()
+        
+        with mock.patch.object(self.worker, 'beat') as beat, \
+                mock.patch('pipeline.worker.pipeline_service.run_job', side_effect=lambda job: time.sleep(0.2)):
+            self.worker.execute(job)
+            beats = beat.call_count
+            time.sleep(0.1)
+            self.assertEqual(beat.call_count, beats)  # stopped with the job
+        self.assertGreaterEqual(beats, 3)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
@@ -0,0 +1,131 @@
+"""
+Pipeline Worker - Runs queued PipelineJob rows in a local thread pool.
+
+The PostgreSQL table is the queue: jobs are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so several worker processes can
+poll the same table without double-running a job. While a job runs, a
+timer thread bumps its heartbeat every `heartbeat_interval` seconds, so
+jobs that report progress only at the end (non-chunked clean, index) are
+not requeued as stale.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import PipelineJob
+from .services import pipeline_service
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineWorker:
+    """Polls the job table and runs up to `concurrency` jobs at once."""
+    
+    def __init__(self, concurrency: int = 2, poll_interval: float = 2.0, heartbeat_interval: float = 30.0) -> None:
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._slots = threading.Semaphore(self.concurrency)
+        self._stopping = threading.Event()
+    
+    def claim_next(self) -> Optional[PipelineJob]:
+        """Atomically move the oldest queued job to running."""
+        with transaction.atomic():
+            job = (
+                PipelineJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='queued')
+                .order_by('created_at')
+                .first()
+            )
+            if job is None:
+                return None
+            job.start(worker=self.name)
+            job.save()
+        return job
+    
+    def recover_stale_jobs(self, stale_after: timedelta) -> int:
+        """
+        Requeue jobs left `running` by a dead worker.
+        
+        A job is stale when its heartbeat (bumped on every progress report)
+        is older than `stale_after`, so long-running jobs that still make
+        progress are left alone. Safe because clean is idempotent and commit
+        resumes from its checkpoint.
+        """
+        cutoff = timezone.now() - stale_after
+        stale = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+        count = 0
+        with transaction.atomic():
+            jobs = PipelineJob.objects.select_for_update(skip_locked=True).filter(stale, status='running')
+            for job in jobs:
+                job.requeue()
+                job.save()
+                count += 1
+        return count
+    
+    def beat(self, job: PipelineJob) -> None:
+        """Bump the heartbeat of a still-running job (row update only)."""
+        PipelineJob.objects.filter(pk=job.pk, status='running').update(heartbeat_at=timezone.now())
+    
+    def _heartbeat(self, job: PipelineJob, done: threading.Event) -> None:
+        try:
+            while not done.wait(self.heartbeat_interval):
+                try:
+                    self.beat(job)
+                except Exception:
+                    logger.exception("Heartbeat for pipeline job %s failed", job.pk)
+        finally:
+            connection.close()  # this thread's own connection
+    
+    def execute(self, job: PipelineJob) -> None:
+        """Run a claimed job and record the outcome."""
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, done), name=f"heartbeat-{job.pk}", daemon=True,
+        )
+        heartbeat.start()
+        try:
+            pipeline_service.run_job(job)
+        except Exception as exc:
+            logger.exception("Pipeline job %s failed", job.pk)
+            job.fail(error=str(exc))
+        else:
+            job.succeed()
+        finally:
+            done.set()
+            heartbeat.join()
+            job.save()
+            close_old_connections()
+            self._slots.release()
+    
+    def run(self, once: bool = False) -> None:
+        """
+        Main loop. With `once=True`, drain the queue and return.
+        """
+        logger.info("Pipeline worker %s started (concurrency=%d)", self.name, self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stopping.is_set():
+                self._slots.acquire()
+                job = self.claim_next()
+                if job is None:
+                    self._slots.release()
+                    if once:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                pool.submit(self.execute, job)
+    
+    def stop(self) -> None:
+        self._stopping.set()
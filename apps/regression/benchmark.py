@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+GraphQL load test / benchmark against a running backend.
+
+Drives `ping`, `pegStocks` and `singleStock` (metadata only, and with the
+full kline + news payload for each symbol) at one or more concurrency levels.
+It records throughput, p50/p95/p99 latency, error rate and response size,
+then writes a JSON report under x-log/benchmarks/.
+
+With a baseline (x-log/benchmarks/baseline.json, or --baseline), every
+scenario is compared against it and the script exits 1 on a regression
+beyond --tolerance. Save the current run as the new baseline with
+--save-baseline.
+
+Usage:
+    python3 apps/regression/benchmark.py
+    python3 apps/regression/benchmark.py --concurrency 1 8 32 --requests 500
+    python3 apps/regression/benchmark.py --scenarios singleStock --symbols AAPL MSFT --duration 30
+    python3 apps/regression/benchmark.py --save-baseline
+
+Environment Variables:
+    PEGSCANNER_GRAPHQL_URL: Override the endpoint (default http://127.0.0.1:8000/graphql).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+GRAPHQL_URL = os.environ.get("PEGSCANNER_GRAPHQL_URL", "http://127.0.0.1:8000/graphql")
+ROOT = Path(__file__).resolve().parents[2]
+OUTPUT_DIR = ROOT / "x-log" / "benchmarks"
+
+PING_QUERY = "query { ping { message agent timestampMs } }"
+PEG_QUERY = "query { pegStocks { symbol name peRatio earningsGrowth pegRatio } }"
+STOCK_META_QUERY = """
+query ($symbol: String!) {
+  singleStock(symbol: $symbol) {
+    stock { symbol name exchange currency companyInfo { sector industry } }
+  }
+}
+"""
+STOCK_FULL_QUERY = """
+query ($symbol: String!) {
+  singleStock(symbol: $symbol) {
+    stock {
+      symbol name exchange currency
+      companyInfo {
+        symbol description sector industry
+        valuation { psRatio peRatio pbRatio }
+        indicators { eps fcf currentRatio roe }
+      }
+    }
+    dailyKline { timestamp open high low close volume }
+    news { title url source publishedAt }
+  }
+}
+"""
+
+
+@dataclass
+class Scenario:
+    name: str
+    query: str
+    variables: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Sample:
+    latency_ms: float
+    ok: bool
+    size: int
+    kline_points: int = 0
+
+
+def build_scenarios(names: List[str], symbols: List[str]) -> List[Scenario]:
+    scenarios = []
+    for name in names:
+        if name == "ping":
+            scenarios.append(Scenario("ping", PING_QUERY))
+        elif name == "pegStocks":
+            scenarios.append(Scenario("pegStocks", PEG_QUERY))
+        elif name == "singleStock":
+            for symbol in symbols:
+                scenarios.append(Scenario(f"singleStock:meta:{symbol}", STOCK_META_QUERY, {"symbol": symbol}))
+                scenarios.append(Scenario(f"singleStock:full:{symbol}", STOCK_FULL_QUERY, {"symbol": symbol}))
+        else:
+            raise SystemExit(f"Unknown scenario: {name}")
+    return scenarios
+
+
+class Client:
+    """One keep-alive HTTP connection per worker thread."""
+    
+    def __init__(self, url: str, timeout: float) -> None:
+        self.url = urlparse(url)
+        self.timeout = timeout
+        self.local = threading.local()
+    
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.url.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.url.hostname, self.url.port, timeout=self.timeout)
+            conn.connect()
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.local.conn = conn
+        return conn
+    
+    def request(self, scenario: Scenario) -> Sample:
+        body = json.dumps({"query": scenario.query, "variables": scenario.variables}).encode("utf-8")
+        started = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request("POST", self.url.path or "/", body, {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            payload = resp.read()
+            latency = (time.perf_counter() - started) * 1000
+            if resp.status != 200:
+                return Sample(latency, False, len(payload))
+            data = json.loads(payload)
+        except (OSError, http.client.HTTPException, ValueError):
+            self.local.conn = None
+            return Sample((time.perf_counter() - started) * 1000, False, 0)
+        
+        ok = "errors" not in data
+        page = (data.get("data") or {}).get("singleStock") or {}
+        return Sample(latency, ok, len(payload), len(page.get("dailyKline") or []))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(
+    client: Client,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    duration: Optional[float],
+    warmup: int,
+) -> Dict[str, Any]:
+    for _ in range(warmup):
+        client.request(scenario)
+    
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration if duration else None
+    remaining = [requests]
+    
+    def worker() -> None:
+        while True:
+            with lock:
+                if deadline is None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                elif time.monotonic() >= deadline:
+                    return
+            sample = client.request(scenario)
+            with lock:
+                samples.append(sample)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+    
+    latencies = sorted(s.latency_ms for s in samples)
+    errors = sum(1 for s in samples if not s.ok)
+    count = len(samples)
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 3) if count else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "response_bytes_mean": round(sum(s.size for s in samples) / count) if count else 0,
+        "kline_points": max((s.kline_points for s in samples), default=0),
+    }
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Human-readable regressions of `current` vs `baseline` (same scenario + concurrency)."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for result in current:
+        base = previous.get((result["scenario"], result["concurrency"]))
+        if not base:
+            continue
+        label = f"{result['scenario']} @c={result['concurrency']}"
+        for pct in ("p50", "p95", "p99"):
+            old, new = base["latency_ms"][pct], result["latency_ms"][pct]
+            if old and new > old * (1 + tolerance):
+                regressions.append(f"{label}: {pct} {old:.1f}ms -> {new:.1f}ms")
+        old, new = base["throughput_rps"], result["throughput_rps"]
+        if old and new < old * (1 - tolerance):
+            regressions.append(f"{label}: throughput {old:.1f} -> {new:.1f} req/s")
+        if result["error_rate"] > base["error_rate"]:
+            regressions.append(f"{label}: error rate {base['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=GRAPHQL_URL)
+    parser.add_argument("--scenarios", nargs="+", default=["ping", "pegStocks", "singleStock"])
+    parser.add_argument("--symbols", nargs="+", default=["AAPL"], help="singleStock symbols (pick different history lengths)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--duration", type=float, help="Seconds per scenario instead of a request count")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON (default: <output-dir>/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression (0.15 = 15%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    client = Client(args.url, args.timeout)
+    scenarios = build_scenarios(args.scenarios, args.symbols)
+    
+    print(f"\n{'='*60}")
+    print(f"GraphQL Benchmark - {args.url}")
+    print(f"{'='*60}\n")
+    print(f"{'scenario':<32} {'c':>4} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>6}")
+    
+    results = []
+    for scenario in scenarios:
+        for concurrency in args.concurrency:
+            result = run_scenario(client, scenario, concurrency, args.requests, args.duration, args.warmup)
+            results.append(result)
+            lat = result["latency_ms"]
+            print(
+                f"{result['scenario']:<32} {concurrency:>4} {result['throughput_rps']:>9.1f} "
+                f"{lat['p50']:>8.1f} {lat['p95']:>8.1f} {lat['p99']:>8.1f} {result['error_rate']:>6.1%}"
+            )
+    
+    report = {
+        "meta": {
+            "url": args.url,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "duration": args.duration,
+        },
+        "results": results,
+    }
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    out_path = args.output_dir / f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out_path.write_text(json.dumps(report, indent=2))
+    print(f"\nReport: {out_path}")
+    
+    baseline_path = args.baseline or args.output_dir / "baseline.json"
+    exit_code = 0
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(results, baseline.get("results", []), args.tolerance)
+        if regressions:
+            print(f"\n❌ Regressions vs {baseline_path} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            exit_code = 1
+        else:
+            print(f"\n✅ No regressions vs {baseline_path}")
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved: {baseline_path}")
+    
+    if any(r["requests"] and r["error_rate"] == 1.0 for r in results):
+        print("\n❌ Some scenarios failed every request", file=sys.stderr)
+        exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Import-time report and cold-start check for the backend.
+
+1. Breakdown: runs `python -X importtime -c "import <module>"` in a fresh
+   interpreter and prints the slowest modules (cumulative) and the
+   top-level packages that account for the most self time.
+2. Cold start: median wall time of N fresh `import <module>` runs.
+3. With --serve: time from launching `uvicorn apps.backend.main:app` until
+   `GET /` answers (import + lifespan startup). Set GRAPH_BACKEND=memory
+   to leave the database out of the measurement.
+
+Each measured figure is compared with its budget; the script exits 1 when
+one is exceeded. A JSON report is written under x-log/benchmarks/.
+
+Usage:
+    python3 apps/regression/import_time.py
+    python3 apps/regression/import_time.py --module libs.analytics.vectors --top 15
+    GRAPH_BACKEND=memory python3 apps/regression/import_time.py --serve
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+OUTPUT_DIR = ROOT / "x-log" / "benchmarks"
+PYTHONPATH = os.pathsep.join(str(ROOT / p) for p in ("apps/backend", "libs", "."))
+
+# Cold-start targets (ms)
+IMPORT_BUDGET_MS = 1200
+SERVE_BUDGET_MS = 3000
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PYTHONPATH, env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_breakdown(module: str) -> List[Dict[str, Any]]:
+    """(module, self_us, cumulative_us, depth) for every import, in import order."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    return rows
+
+
+def package_totals(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Self time summed per top-level package, largest first."""
+    totals: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        totals[row["module"].split(".", 1)[0]] += row["self_us"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def cold_import_ms(module: str, runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, env=_env(), check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_ms(app: str, timeout: float) -> Optional[float]:
+    """Launch uvicorn and time until `GET /` answers; None on timeout."""
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=_env(),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                return None
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.02)
+        return None
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="apps.backend.main")
+    parser.add_argument("--top", type=int, default=25, help="Rows in the breakdown tables")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters for the cold import median")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Cold import target (median)")
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn until the first response")
+    parser.add_argument("--app", default="apps.backend.main:app")
+    parser.add_argument("--serve-budget-ms", type=float, default=SERVE_BUDGET_MS)
+    parser.add_argument("--serve-timeout", type=float, default=60.0)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    
+    print(f"\n{'='*60}")
+    print(f"Import time - {args.module}")
+    print(f"{'='*60}\n")
+    
+    rows = import_breakdown(args.module)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in sorted(rows, key=lambda r: -r["cumulative_us"])[:args.top]:
+        print(f"{row['cumulative_us'] / 1000:>14.1f} {row['self_us'] / 1000:>9.1f}  {'  ' * row['depth']}{row['module']}")
+    
+    totals = package_totals(rows)
+    print(f"\n{'self ms':>9}  package")
+    for package, self_us in list(totals.items())[:args.top]:
+        print(f"{self_us / 1000:>9.1f}  {package}")
+    
+    exit_code = 0
+    timings = cold_import_ms(args.module, args.runs)
+    median = statistics.median(timings)
+    status = "✅" if median <= args.budget_ms else "❌"
+    print(f"\n{status} cold import: median {median:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        exit_code = 1
+    
+    serve = None
+    if args.serve:
+        serve = serve_ms(args.app, args.serve_timeout)
+        if serve is None:
+            print(f"❌ uvicorn {args.app} did not answer within {args.serve_timeout:.0f} s")
+            exit_code = 1
+        else:
+            status = "✅" if serve <= args.serve_budget_ms else "❌"
+            print(f"{status} uvicorn first response: {serve:.0f} ms (budget {args.serve_budget_ms:.0f} ms)")
+            if serve > args.serve_budget_ms:
+                exit_code = 1
+    
+    report = {
+        "meta": {
+            "module": args.module,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "graph_backend": os.environ.get("GRAPH_BACKEND", "neo4j"),
+        },
+        "cold_import_ms": {"median": round(median, 1), "runs": [round(t, 1) for t in timings], "budget": args.budget_ms},
+        "serve_ms": None if serve is None else {"first_response": round(serve, 1), "budget": args.serve_budget_ms},
+        "packages_self_ms": {name: round(us / 1000, 2) for name, us in totals.items()},
+        "modules": rows,
+    }
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    out_path = args.output_dir / f"import-time-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out_path.write_text(json.dumps(report, indent=2))
+    print(f"\nReport: {out_path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,11 @@
+"""
+Analytics Engines
+
+Vectorized (numpy) computations over graph data, materialized back into
+Neo4j in bulk. Each module keeps pure array math separate from graph I/O.
+
+Usage:
+    from libs.analytics.indicators import refresh_indicators
+    
+    refresh_indicators(incremental=True)
+"""
@@ -0,0 +1,122 @@
+"""
+NEXT_PERIOD chain builder for DailyQuote and EarningsReport.
+
+Sorts each ticker's periods and creates the (earlier)-[:NEXT_PERIOD]->(later)
+edges with batched UNWIND ... MERGE, deleting any outgoing NEXT_PERIOD edge
+that no longer points at the correct successor (e.g. after a backfill).
+
+Incremental mode only touches tickers that have unlinked nodes, and only
+writes the pairs around those nodes.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from neomodel import StructuredNode, db
+
+from libs.neo4j_models import DailyQuote, EarningsReport
+
+WRITE_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class ChainSpec:
+    """How to order one model's nodes into a chain."""
+    model: Type[StructuredNode]
+    period_expr: str    # Cypher expression on `n` giving a sortable period key
+    period_type: str
+
+
+CHAINS: Dict[str, ChainSpec] = {
+    'quote': ChainSpec(DailyQuote, 'toString(n.date)', 'daily'),
+    'earnings': ChainSpec(EarningsReport, 'n.fiscal_period', 'quarterly'),
+}
+
+
+def _unlinked_tickers(spec: ChainSpec) -> List[str]:
+    """Tickers with at least one node that has no NEXT_PERIOD edge at all."""
+    rows, _ = db.cypher_query(
+        f"MATCH (n:`{spec.model.__label__}`) WHERE NOT (n)-[:NEXT_PERIOD]-() "
+        "RETURN DISTINCT n.ticker"
+    )
+    return [row[0] for row in rows if row[0]]
+
+
+def _all_tickers(spec: ChainSpec) -> List[str]:
+    rows, _ = db.cypher_query(
+        f"MATCH (n:`{spec.model.__label__}`) RETURN DISTINCT n.ticker"
+    )
+    return [row[0] for row in rows if row[0]]
+
+
+def _load_periods(spec: ChainSpec, tickers: List[str]) -> Dict[str, List[Tuple[str, str, bool]]]:
+    """(uid, period, is_unlinked) per ticker, sorted by period."""
+    rows, _ = db.cypher_query(
+        f"MATCH (n:`{spec.model.__label__}`) WHERE n.ticker IN $tickers "
+        f"WITH n, {spec.period_expr} AS period WHERE period IS NOT NULL "
+        "RETURN n.ticker, n.uid, period, NOT (n)-[:NEXT_PERIOD]-() AS unlinked "
+        "ORDER BY n.ticker, period",
+        {'tickers': tickers},
+    )
+    grouped: Dict[str, List[Tuple[str, str, bool]]] = {}
+    for ticker, uid, period, unlinked in rows:
+        grouped.setdefault(ticker, []).append((uid, period, unlinked))
+    return grouped
+
+
+def chain_pairs(periods: List[Tuple[str, str, bool]], incremental: bool) -> List[Dict[str, Optional[str]]]:
+    """
+    Expected (uid -> next uid) pairs for one ticker's sorted periods.
+    
+    The last node maps to None so a stale outgoing edge on it is removed.
+    In incremental mode only pairs touching an unlinked node are returned.
+    """
+    pairs = []
+    for i, (uid, _, unlinked) in enumerate(periods):
+        nxt = periods[i + 1] if i + 1 < len(periods) else None
+        if incremental and not (unlinked or (nxt and nxt[2])):
+            continue
+        pairs.append({'a': uid, 'b': nxt[0] if nxt else None})
+    return pairs
+
+
+def write_pairs(spec: ChainSpec, pairs: List[Dict[str, Optional[str]]]) -> None:
+    label = spec.model.__label__
+    for start in range(0, len(pairs), WRITE_BATCH_SIZE):
+        batch = pairs[start:start + WRITE_BATCH_SIZE]
+        # Drop edges to anything but the expected successor
+        db.cypher_query(
+            f"UNWIND $pairs AS p MATCH (a:`{label}` {{uid: p.a}})-[r:NEXT_PERIOD]->(x) "
+            "WHERE p.b IS NULL OR x.uid <> p.b DELETE r",
+            {'pairs': batch},
+        )
+        db.cypher_query(
+            f"UNWIND $pairs AS p WITH p WHERE p.b IS NOT NULL "
+            f"MATCH (a:`{label}` {{uid: p.a}}) MATCH (b:`{label}` {{uid: p.b}}) "
+            "MERGE (a)-[r:NEXT_PERIOD]->(b) "
+            "ON CREATE SET r.period_type = $period_type, r.created_at = timestamp() / 1000.0",
+            {'pairs': batch, 'period_type': spec.period_type},
+        )
+
+
+def build_chains(
+    kind: str,
+    tickers: Optional[Iterable[str]] = None,
+    incremental: bool = True,
+    group_size: int = 200,
+) -> int:
+    """Create/repair NEXT_PERIOD edges for one model. Returns pairs written."""
+    spec = CHAINS[kind]
+    if tickers:
+        tickers = [t.upper() for t in tickers]
+    else:
+        tickers = _unlinked_tickers(spec) if incremental else _all_tickers(spec)
+    
+    written = 0
+    for start in range(0, len(tickers), group_size):
+        pairs = []
+        for periods in _load_periods(spec, tickers[start:start + group_size]).values():
+            pairs.extend(chain_pairs(periods, incremental))
+        write_pairs(spec, pairs)
+        written += len(pairs)
+    return written
@@ -0,0 +1,142 @@
+"""
+Competitor graph from Company embeddings.
+
+Computes each company's top-k most similar peers by cosine similarity,
+once across the whole universe and once within its own sector, using
+blocked matrix multiplication (one `block x n` score matrix in memory at a
+time). The union is written as COMPETES_WITH edges carrying
+`similarity_score`, so peer lookups are a one-hop read.
+
+Edges written by a previous run and not reproduced are deleted; edges
+without `computed_at` (curated by hand) are left alone.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from neomodel import db
+
+from libs.neo4j_models import Company
+
+from .vectors import normalize
+
+DEFAULT_K = 10
+BLOCK_SIZE = 1024
+WRITE_BATCH_SIZE = 5000
+
+
+@dataclass
+class CompanyEmbeddings:
+    tickers: List[str]
+    sectors: List[Optional[str]]
+    matrix: np.ndarray          # L2-normalized, shape (tickers, dim)
+
+
+# =============================================================================
+# Array math
+# =============================================================================
+
+def top_k_similar(matrix: np.ndarray, k: int, block_size: int = BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k neighbours per row of a normalized matrix, excluding the row itself.
+    
+    Returns (indices, scores), both shape (n, min(k, n - 1)), best first.
+    """
+    n = len(matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64), np.zeros((n, 0), dtype=np.float32)
+    
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        sims = matrix[start:end] @ matrix.T
+        sims[np.arange(end - start), np.arange(start, end)] = -np.inf
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices[start:end] = np.take_along_axis(top, order, axis=1)
+        scores[start:end] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+def competitor_pairs(data: CompanyEmbeddings, k: int, block_size: int = BLOCK_SIZE) -> Dict[Tuple[int, int], Tuple[float, bool]]:
+    """Union of universe-wide and same-sector top-k: (i, j) -> (score, same_sector)."""
+    pairs: Dict[Tuple[int, int], Tuple[float, bool]] = {}
+    
+    indices, scores = top_k_similar(data.matrix, k, block_size)
+    for i in range(len(indices)):
+        for j, score in zip(indices[i], scores[i]):
+            same = data.sectors[i] is not None and data.sectors[i] == data.sectors[j]
+            pairs[(i, int(j))] = (float(score), same)
+    
+    members = defaultdict(list)
+    for i, sector in enumerate(data.sectors):
+        if sector:
+            members[sector].append(i)
+    for rows in members.values():
+        rows = np.array(rows)
+        indices, scores = top_k_similar(data.matrix[rows], k, block_size)
+        for local, i in enumerate(rows):
+            for j, score in zip(indices[local], scores[local]):
+                pairs[(int(i), int(rows[j]))] = (float(score), True)
+    return pairs
+
+
+# =============================================================================
+# Graph I/O
+# =============================================================================
+
+def load_company_embeddings() -> CompanyEmbeddings:
+    """Active companies with embeddings of the most common dimension."""
+    rows, _ = db.cypher_query(
+        f"MATCH (c:`{Company.__label__}`) "
+        "WHERE c.embedding IS NOT NULL AND coalesce(c.is_active, true) "
+        "RETURN c.ticker, c.sector, c.embedding ORDER BY c.ticker"
+    )
+    if not rows:
+        return CompanyEmbeddings([], [], np.zeros((0, 0), dtype=np.float32))
+    dim = Counter(len(vec) for _, _, vec in rows).most_common(1)[0][0]
+    rows = [row for row in rows if len(row[2]) == dim]
+    return CompanyEmbeddings(
+        tickers=[ticker for ticker, _, _ in rows],
+        sectors=[sector for _, sector, _ in rows],
+        matrix=normalize(np.array([vec for _, _, vec in rows], dtype=np.float32)),
+    )
+
+
+def write_competitors(data: CompanyEmbeddings, pairs: Dict[Tuple[int, int], Tuple[float, bool]]) -> int:
+    """MERGE COMPETES_WITH edges and drop ones from earlier runs."""
+    computed_at = datetime.now(timezone.utc).timestamp()
+    rows = [
+        {'a': data.tickers[i], 'b': data.tickers[j], 'score': score, 'same_sector': same}
+        for (i, j), (score, same) in pairs.items()
+    ]
+    
+    label = Company.__label__
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        db.cypher_query(
+            f"UNWIND $rows AS r MATCH (a:`{label}` {{ticker: r.a}}) MATCH (b:`{label}` {{ticker: r.b}}) "
+            "MERGE (a)-[rel:COMPETES_WITH]->(b) "
+            "ON CREATE SET rel.created_at = $now, rel.confidence = 1.0 "
+            "SET rel.similarity_score = r.score, rel.same_sector = r.same_sector, rel.computed_at = $now",
+            {'rows': rows[start:start + WRITE_BATCH_SIZE], 'now': computed_at},
+        )
+    db.cypher_query(
+        f"MATCH (:`{label}`)-[rel:COMPETES_WITH]->(:`{label}`) "
+        "WHERE rel.computed_at < $now DELETE rel",
+        {'now': computed_at},
+    )
+    return len(rows)
+
+
+def refresh_competitors(k: int = DEFAULT_K, block_size: int = BLOCK_SIZE) -> int:
+    """Recompute the competitor graph. Returns the number of edges written."""
+    data = load_company_embeddings()
+    if len(data.tickers) < 2:
+        return 0
+    return write_competitors(data, competitor_pairs(data, k, block_size))
@@ -0,0 +1,131 @@
+"""
+Cross-sectional factors: percentile rank and z-score per metric.
+
+For each metric in `Settings.factor_metrics` (PegCandidate fields, falling
+back to Company fields, e.g. `market_cap`), every screener row gets its
+percentile and z-score within the universe and within its sector. The
+values are stored as one float array `PegCandidate.factors`, laid out by
+`factor_names()`, so `pegStocks` can filter and sort on `factors[i]` in
+Cypher without ranking anything per request.
+
+Percentile is the mid-rank fraction (less + ties / 2) / n in (0, 1);
+a missing metric, or a missing sector for sector factors, is stored as NaN.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from neomodel import db
+
+from libs.config.settings import get_settings
+from libs.neo4j_models import Company, PegCandidate
+
+SCOPES = ('universe', 'sector')
+KINDS = ('pct', 'z')
+WRITE_BATCH_SIZE = 5000
+
+
+def factor_names(metrics: Optional[Sequence[str]] = None) -> List[str]:
+    """Layout of PegCandidate.factors, e.g. `peg_ratio_sector_pct`."""
+    metrics = get_settings().factor_metrics if metrics is None else metrics
+    return [f"{metric}_{scope}_{kind}" for metric in metrics for scope in SCOPES for kind in KINDS]
+
+
+# =============================================================================
+# Array math
+# =============================================================================
+
+def _grouped(values: np.ndarray, groups: np.ndarray):
+    """Finite values with a group (>= 0), sorted by (group, value)."""
+    index = np.flatnonzero(np.isfinite(values) & (groups >= 0))
+    order = np.lexsort((values[index], groups[index]))
+    return index[order], values[index][order], groups[index][order]
+
+
+def grouped_percentile(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Mid-rank percentile of each value within its group."""
+    out = np.full(len(values), np.nan)
+    index, v, g = _grouped(values, groups)
+    if not len(index):
+        return out
+    sizes = np.bincount(g)
+    group_start = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    new_run = np.concatenate([[True], (g[1:] != g[:-1]) | (v[1:] != v[:-1])])
+    run_start = np.flatnonzero(new_run)
+    run_len = np.diff(np.append(run_start, len(v)))
+    run_id = np.cumsum(new_run) - 1
+    less = run_start[run_id] - group_start[g]
+    out[index] = (less + 0.5 * run_len[run_id]) / sizes[g]
+    return out
+
+
+def grouped_zscore(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """(value - group mean) / group std; 0 where the group has no spread."""
+    out = np.full(len(values), np.nan)
+    index, v, g = _grouped(values, groups)
+    if not len(index):
+        return out
+    sizes = np.bincount(g)
+    mean = np.bincount(g, weights=v) / np.maximum(sizes, 1)
+    std = np.sqrt(np.bincount(g, weights=(v - mean[g]) ** 2) / np.maximum(sizes, 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[index] = np.where(std[g] > 0, (v - mean[g]) / std[g], 0.0)
+    return out
+
+
+def compute_factors(values: np.ndarray, sectors: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    values: (rows, metrics) with NaN for missing.
+    Returns (rows, metrics * 4) in factor_names() order.
+    """
+    codes = {name: i for i, name in enumerate(sorted({s for s in sectors if s}))}
+    sector_groups = np.array([codes.get(s, -1) if s else -1 for s in sectors], dtype=np.int64)
+    universe_groups = np.zeros(len(sectors), dtype=np.int64)
+    
+    columns = []
+    for m in range(values.shape[1]):
+        for groups in (universe_groups, sector_groups):
+            columns.append(grouped_percentile(values[:, m], groups))
+            columns.append(grouped_zscore(values[:, m], groups))
+    return np.column_stack(columns) if columns else np.zeros((len(sectors), 0))
+
+
+# =============================================================================
+# Graph I/O
+# =============================================================================
+
+def load_metrics(metrics: Sequence[str]):
+    """(tickers, sectors, values) for every screener row."""
+    rows, _ = db.cypher_query(
+        f"MATCH (p:`{PegCandidate.__label__}`) "
+        f"OPTIONAL MATCH (c:`{Company.__label__}` {{ticker: p.ticker}}) "
+        "RETURN p.ticker, coalesce(p.sector, c.sector), [m IN $metrics | coalesce(p[m], c[m])] "
+        "ORDER BY p.ticker",
+        {'metrics': list(metrics)},
+    )
+    values = np.array(
+        [[np.nan if v is None else float(v) for v in row[2]] for row in rows],
+        dtype=float,
+    ).reshape(len(rows), len(metrics))
+    return [row[0] for row in rows], [row[1] for row in rows], values
+
+
+def write_factors(tickers: List[str], factors: np.ndarray) -> int:
+    rows = [{'ticker': t, 'factors': factors[i].tolist()} for i, t in enumerate(tickers)]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        db.cypher_query(
+            f"UNWIND $rows AS r MATCH (p:`{PegCandidate.__label__}` {{ticker: r.ticker}}) "
+            "SET p.factors = r.factors",
+            {'rows': rows[start:start + WRITE_BATCH_SIZE]},
+        )
+    return len(rows)
+
+
+def refresh_factors(metrics: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """Recompute factors for every screener row (run after the screener)."""
+    metrics = list(get_settings().factor_metrics if metrics is None else metrics)
+    tickers, sectors, values = load_metrics(metrics)
+    if not tickers:
+        return {'rows': 0, 'factors': 0}
+    factors = compute_factors(values, sectors)
+    return {'rows': write_factors(tickers, factors), 'factors': factors.shape[1]}
@@ -0,0 +1,218 @@
+"""
+Technical indicators for DailyQuote: SMA 20/50/200 and Wilder RSI 14.
+
+Each ticker's closes are loaded as one contiguous float64 array; rolling
+means come from a cumulative sum and RSI smoothing from a blockwise
+closed-form EMA, so there is no per-bar Python loop. Results are written
+back with batched UNWIND statements.
+
+Incremental mode recomputes only rows after the last bar that already has
+indicators, using a warm-up tail long enough for SMA 200 and for Wilder
+smoothing to converge.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from neomodel import db
+
+from libs.neo4j_models import DailyQuote
+
+SMA_WINDOWS = (20, 50, 200)
+RSI_PERIOD = 14
+
+# Bars of history loaded before the first bar to recompute (incremental).
+# Wilder weights decay as (13/14)^n, negligible (<1e-8) after 250 bars.
+WARMUP_BARS = 250
+# Calendar-day lookback that safely covers WARMUP_BARS trading days
+WARMUP_DAYS = 400
+
+WRITE_BATCH_SIZE = 5000
+
+# Block length for the closed-form EMA; keeps (1-a)^-k well inside float64
+_EMA_BLOCK = 256
+
+
+# =============================================================================
+# Array math
+# =============================================================================
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average; NaN until `window` values are available."""
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def wilder_smooth(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """
+    y[t] = (1 - alpha) * y[t-1] + alpha * values[t], with y[-1] = initial.
+    
+    Within a block, y[t] = d^t * (d * carry + alpha * sum_k d^-k x[k]) with
+    d = 1 - alpha, which is a cumsum; blocks chain through `carry`.
+    """
+    decay = 1.0 - alpha
+    out = np.empty(len(values))
+    carry = initial
+    powers = decay ** np.arange(_EMA_BLOCK)
+    inverse = 1.0 / powers
+    for start in range(0, len(values), _EMA_BLOCK):
+        block = values[start:start + _EMA_BLOCK]
+        n = len(block)
+        acc = np.cumsum(block * inverse[:n])
+        out[start:start + n] = powers[:n] * (decay * carry + alpha * acc)
+        carry = out[start + n - 1]
+    return out
+
+
+def rsi(closes: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """Wilder RSI aligned to `closes`; NaN for the first `period` bars."""
+    out = np.full(closes.shape, np.nan)
+    if len(closes) <= period:
+        return out
+    delta = np.diff(closes)
+    gains = np.clip(delta, 0, None)
+    losses = np.clip(-delta, 0, None)
+    
+    alpha = 1.0 / period
+    avg_gain = np.empty(len(delta) - period + 1)
+    avg_loss = np.empty(len(delta) - period + 1)
+    avg_gain[0] = gains[:period].mean()
+    avg_loss[0] = losses[:period].mean()
+    avg_gain[1:] = wilder_smooth(gains[period:], alpha, avg_gain[0])
+    avg_loss[1:] = wilder_smooth(losses[period:], alpha, avg_loss[0])
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + rs)
+    values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), values)
+    out[period:] = values
+    return out
+
+
+def compute_indicators(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """All DailyQuote indicator columns for one close series."""
+    result = {f"sma_{w}": rolling_mean(closes, w) for w in SMA_WINDOWS}
+    result[f"rsi_{RSI_PERIOD}"] = rsi(closes)
+    return result
+
+
+# =============================================================================
+# Graph I/O
+# =============================================================================
+
+@dataclass
+class Series:
+    """One ticker's quotes, ordered by date."""
+    ticker: str
+    uids: List[str]
+    dates: List[str]
+    closes: np.ndarray
+    write_from: int = 0  # first index whose indicators should be written
+
+
+def _label() -> str:
+    return DailyQuote.__label__
+
+
+def list_tickers() -> List[str]:
+    rows, _ = db.cypher_query(f"MATCH (q:`{_label()}`) RETURN DISTINCT q.ticker ORDER BY q.ticker")
+    return [row[0] for row in rows if row[0]]
+
+
+def _last_computed_dates(tickers: Sequence[str]) -> Dict[str, Optional[str]]:
+    """Latest date per ticker that already carries indicators."""
+    rows, _ = db.cypher_query(
+        f"MATCH (q:`{_label()}`) WHERE q.ticker IN $tickers "
+        "WITH q.ticker AS ticker, "
+        "     max(CASE WHEN q.sma_20 IS NOT NULL OR q.rsi_14 IS NOT NULL THEN toString(q.date) END) AS done "
+        "RETURN ticker, done",
+        {'tickers': list(tickers)},
+    )
+    return {ticker: done for ticker, done in rows}
+
+
+def load_series(tickers: Sequence[str], incremental: bool = False) -> List[Series]:
+    """Load close series for a group of tickers in one query."""
+    cutoffs: Dict[str, Optional[str]] = {}
+    done: Dict[str, Optional[str]] = {}
+    if incremental:
+        done = _last_computed_dates(tickers)
+        for ticker, last in done.items():
+            if last:
+                cutoffs[ticker] = (date.fromisoformat(last[:10]) - timedelta(days=WARMUP_DAYS)).isoformat()
+    
+    rows, _ = db.cypher_query(
+        f"MATCH (q:`{_label()}`) WHERE q.ticker IN $tickers AND q.close IS NOT NULL "
+        "AND ($cutoffs[q.ticker] IS NULL OR toString(q.date) >= $cutoffs[q.ticker]) "
+        "RETURN q.ticker, q.uid, toString(q.date) AS day, q.close "
+        "ORDER BY q.ticker, day",
+        {'tickers': list(tickers), 'cutoffs': cutoffs},
+    )
+    
+    grouped: Dict[str, List[tuple]] = {}
+    for ticker, uid, day, close in rows:
+        grouped.setdefault(ticker, []).append((uid, day, close))
+    
+    series = []
+    for ticker, items in grouped.items():
+        s = Series(
+            ticker=ticker,
+            uids=[i[0] for i in items],
+            dates=[i[1] for i in items],
+            closes=np.fromiter((i[2] for i in items), dtype=np.float64, count=len(items)),
+        )
+        last = done.get(ticker)
+        if last:
+            s.write_from = int(np.searchsorted(np.array(s.dates), last, side='right'))
+        series.append(s)
+    return series
+
+
+def _to_rows(series: Series) -> List[Dict[str, Optional[float]]]:
+    values = compute_indicators(series.closes)
+    rows = []
+    for i in range(series.write_from, len(series.uids)):
+        row = {'uid': series.uids[i]}
+        for name, column in values.items():
+            v = column[i]
+            row[name] = None if np.isnan(v) else float(v)
+        rows.append(row)
+    return rows
+
+
+def write_rows(rows: List[Dict[str, Optional[float]]]) -> None:
+    columns = [f"sma_{w}" for w in SMA_WINDOWS] + [f"rsi_{RSI_PERIOD}"]
+    assignments = ', '.join(f"q.{c} = r.{c}" for c in columns)
+    query = (
+        f"UNWIND $rows AS r MATCH (q:`{_label()}` {{uid: r.uid}}) "
+        f"SET {assignments}"
+    )
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        db.cypher_query(query, {'rows': rows[start:start + WRITE_BATCH_SIZE]})
+
+
+def refresh_indicators(
+    tickers: Optional[Iterable[str]] = None,
+    incremental: bool = True,
+    group_size: int = 200,
+) -> int:
+    """
+    Recompute and store indicators. Returns the number of quotes written.
+    
+    Tickers are processed in groups of `group_size` so memory stays bounded.
+    """
+    tickers = [t.upper() for t in tickers] if tickers else list_tickers()
+    written = 0
+    for start in range(0, len(tickers), group_size):
+        rows = []
+        for series in load_series(tickers[start:start + group_size], incremental=incremental):
+            rows.extend(_to_rows(series))
+        write_rows(rows)
+        written += len(rows)
+    return written
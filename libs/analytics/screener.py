@@ -0,0 +1,177 @@
+"""
+PEG screener over EarningsReport history.
+
+Loads the latest `quarters` reports for every ticker into a
+(tickers x quarters) EPS matrix, then computes TTM EPS, year-over-year TTM
+growth and PEG column-wise. Column k holds the quarter k quarters before the
+ticker's latest fiscal_period, so a missing quarter is a NaN column (and
+voids the TTM windows that contain it) instead of shifting older reports in.
+P/E comes from the latest report only. The ranked result replaces the PegCandidate
+table, which `pegStocks` reads directly.
+
+PEG follows EarningsReport.peg_ratio: pe_ratio / (growth * 100), defined
+only for positive P/E and positive growth.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import re
+
+import numpy as np
+from neomodel import db
+
+from libs.neo4j_models import Company, EarningsReport, PegCandidate
+
+DEFAULT_QUARTERS = 8
+FISCAL_PERIOD = re.compile(r'^(\d{4})Q([1-4])$')
+WRITE_BATCH_SIZE = 5000
+
+
+@dataclass
+class EarningsMatrix:
+    """Latest-first quarterly EPS per ticker, NaN-padded."""
+    tickers: List[str]
+    periods: List[str]          # latest fiscal_period per ticker
+    eps: np.ndarray             # shape (tickers, quarters); column k = latest quarter - k
+    pe: np.ndarray              # pe_ratio of the latest report per ticker
+    names: List[Optional[str]]
+    sectors: List[Optional[str]]
+
+
+# =============================================================================
+# Array math
+# =============================================================================
+
+def quarter_number(fiscal_period: Optional[str]) -> Optional[int]:
+    """Consecutive quarter count for `YYYYQN` (2024Q1 - 2023Q4 == 1); None if malformed."""
+    match = FISCAL_PERIOD.match(fiscal_period or '')
+    if not match:
+        return None
+    return int(match.group(1)) * 4 + int(match.group(2)) - 1
+
+
+def align_quarters(fiscal_periods: List[str], values: List[Optional[float]], quarters: int) -> np.ndarray:
+    """
+    Place values (latest first) at column `latest quarter - period`.
+    
+    Missing quarters stay NaN; malformed periods and periods more than
+    `quarters - 1` quarters before the latest are dropped.
+    """
+    out = np.full(quarters, np.nan)
+    numbers = [quarter_number(p) for p in fiscal_periods]
+    latest = max((n for n in numbers if n is not None), default=None)
+    if latest is None:
+        return out
+    for number, value in zip(numbers, values):
+        if number is None or value is None:
+            continue
+        column = latest - number
+        if 0 <= column < quarters and np.isnan(out[column]):
+            out[column] = value
+    return out
+
+
+def ttm(eps: np.ndarray, offset: int = 0) -> np.ndarray:
+    """Sum of 4 quarters starting at column `offset`; NaN if any is missing."""
+    window = eps[:, offset:offset + 4]
+    if window.shape[1] < 4:
+        return np.full(eps.shape[0], np.nan)
+    return window.sum(axis=1)  # NaN propagates
+
+
+def screen(matrix: EarningsMatrix) -> Dict[str, np.ndarray]:
+    """TTM EPS, growth, PEG and rank columns for every ticker."""
+    ttm_now = ttm(matrix.eps, 0)
+    ttm_prev = ttm(matrix.eps, 4)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(ttm_prev > 0, ttm_now / ttm_prev - 1.0, np.nan)
+        peg = np.where((matrix.pe > 0) & (growth > 0), matrix.pe / (growth * 100.0), np.nan)
+    
+    # Rank 1 = lowest PEG; tickers without a PEG get no rank
+    rank = np.full(len(peg), -1, dtype=np.int64)
+    valid = np.flatnonzero(~np.isnan(peg))
+    order = valid[np.argsort(peg[valid], kind='stable')]
+    rank[order] = np.arange(1, len(order) + 1)
+    
+    return {'ttm_eps': ttm_now, 'eps_growth': growth, 'peg_ratio': peg, 'rank': rank}
+
+
+# =============================================================================
+# Graph I/O
+# =============================================================================
+
+def load_matrix(quarters: int = DEFAULT_QUARTERS) -> EarningsMatrix:
+    """Latest `quarters` reports for every ticker, in one query, aligned by quarter."""
+    rows, _ = db.cypher_query(
+        f"MATCH (e:`{EarningsReport.__label__}`) "
+        "WITH e ORDER BY e.fiscal_period DESC "
+        "WITH e.ticker AS ticker, collect(e)[..$quarters] AS reports "
+        f"OPTIONAL MATCH (c:`{Company.__label__}` {{ticker: ticker}}) "
+        "RETURN ticker, c.name, c.sector, "
+        "       [r IN reports | r.fiscal_period], [r IN reports | r.eps], "
+        "       head(reports).pe_ratio "
+        "ORDER BY ticker",
+        {'quarters': quarters},
+    )
+    
+    eps = np.full((len(rows), quarters), np.nan)
+    pe = np.full(len(rows), np.nan)
+    tickers, periods, names, sectors = [], [], [], []
+    for i, (ticker, name, sector, fiscal_periods, eps_values, pe_ratio) in enumerate(rows):
+        tickers.append(ticker)
+        names.append(name)
+        sectors.append(sector)
+        periods.append(fiscal_periods[0] if fiscal_periods else None)
+        eps[i] = align_quarters(fiscal_periods, eps_values, quarters)
+        if pe_ratio is not None:
+            pe[i] = pe_ratio
+    
+    return EarningsMatrix(tickers, periods, eps, pe, names, sectors)
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def write_candidates(matrix: EarningsMatrix, result: Dict[str, np.ndarray]) -> int:
+    """Replace the PegCandidate table with the new ranking."""
+    computed_at = datetime.now(timezone.utc).timestamp()
+    rows = [
+        {
+            'ticker': ticker,
+            'name': matrix.names[i] or ticker,
+            'sector': matrix.sectors[i],
+            'latest_period': matrix.periods[i],
+            'ttm_eps': _nullable(result['ttm_eps'][i]),
+            'eps_growth': _nullable(result['eps_growth'][i]),
+            'pe_ratio': _nullable(matrix.pe[i]),
+            'peg_ratio': _nullable(result['peg_ratio'][i]),
+            'rank': int(result['rank'][i]) if result['rank'][i] > 0 else None,
+        }
+        for i, ticker in enumerate(matrix.tickers)
+    ]
+    
+    label = PegCandidate.__label__
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        db.cypher_query(
+            f"UNWIND $rows AS r MERGE (p:`{label}` {{ticker: r.ticker}}) "
+            "ON CREATE SET p.uid = randomUUID(), p.created_at = $now "
+            "SET p += r, p.computed_at = $now, p.updated_at = $now",
+            {'rows': rows[start:start + WRITE_BATCH_SIZE], 'now': computed_at},
+        )
+    db.cypher_query(
+        f"MATCH (p:`{label}`) WHERE p.computed_at < $now DETACH DELETE p",
+        {'now': computed_at},
+    )
+    return len(rows)
+
+
+def refresh_peg_candidates(quarters: int = DEFAULT_QUARTERS) -> int:
+    """Recompute the screener table. Returns the number of tickers written."""
+    matrix = load_matrix(quarters)
+    if not matrix.tickers:
+        return 0
+    return write_candidates(matrix, screen(matrix))
@@ -0,0 +1,135 @@
+"""
+Sector aggregates over member companies' latest earnings.
+
+For each sector, takes every active member company (HAS_SECTOR edge or
+Company.sector name) and its latest EarningsReport, then stores counts,
+medians and quartiles of P/E, PEG and EPS growth plus the share of members
+with positive growth on the Sector node. `sectors` in the backend reads
+these values directly.
+
+P/E only counts positive values; PEG follows EarningsReport.peg_ratio
+(pe_ratio / (growth * 100), positive P/E and growth only).
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from neomodel import db
+
+from libs.neo4j_models import Company, EarningsReport, Sector
+
+WRITE_BATCH_SIZE = 1000
+
+
+# =============================================================================
+# Array math
+# =============================================================================
+
+def _quartiles(values: np.ndarray, prefix: str) -> Dict[str, Optional[float]]:
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {f'{prefix}_p25': None, f'{prefix}_median': None, f'{prefix}_p75': None}
+    p25, median, p75 = np.percentile(values, [25, 50, 75])
+    return {f'{prefix}_p25': float(p25), f'{prefix}_median': float(median), f'{prefix}_p75': float(p75)}
+
+
+def sector_stats(pe: np.ndarray, growth: np.ndarray) -> Dict[str, Optional[float]]:
+    """Aggregates for one sector; NaN marks a member without the metric."""
+    pe = np.where(pe > 0, pe, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peg = np.where(growth > 0, pe / (growth * 100), np.nan)
+    known_growth = growth[np.isfinite(growth)]
+    stats = {
+        'company_count': int(len(pe)),
+        'reporting_count': int(np.sum(np.isfinite(pe) | np.isfinite(growth))),
+        'positive_growth_ratio': float(np.mean(known_growth > 0)) if len(known_growth) else None,
+    }
+    stats.update(_quartiles(pe, 'pe'))
+    stats.update(_quartiles(peg, 'peg'))
+    stats.update(_quartiles(growth, 'growth'))
+    return stats
+
+
+# =============================================================================
+# Graph I/O
+# =============================================================================
+
+def all_sector_names() -> List[str]:
+    """Sector nodes plus any sector name only present on Company.sector."""
+    rows, _ = db.cypher_query(
+        f"MATCH (s:`{Sector.__label__}`) RETURN s.name AS name "
+        "UNION "
+        f"MATCH (c:`{Company.__label__}`) WHERE c.sector IS NOT NULL RETURN DISTINCT c.sector AS name"
+    )
+    return sorted(row[0] for row in rows if row[0])
+
+
+def sectors_for_tickers(tickers: Iterable[str]) -> List[str]:
+    rows, _ = db.cypher_query(
+        f"MATCH (c:`{Company.__label__}`) WHERE c.ticker IN $tickers "
+        f"OPTIONAL MATCH (c)-[:HAS_SECTOR]->(s:`{Sector.__label__}`) "
+        "RETURN c.sector, s.name",
+        {'tickers': [t.upper() for t in tickers]},
+    )
+    return sorted({name for row in rows for name in row if name})
+
+
+def load_members(sectors: List[str]) -> Dict[str, List[tuple]]:
+    """(ticker, latest pe_ratio, latest eps_growth) per sector, in one query."""
+    rows, _ = db.cypher_query(
+        "UNWIND $sectors AS name "
+        "CALL { "
+        f"  WITH name MATCH (c:`{Company.__label__}`)-[:HAS_SECTOR]->(:`{Sector.__label__}` {{name: name}}) RETURN c "
+        "  UNION "
+        f"  WITH name MATCH (c:`{Company.__label__}` {{sector: name}}) RETURN c "
+        "} "
+        "WITH name, c WHERE coalesce(c.is_active, true) "
+        f"OPTIONAL MATCH (e:`{EarningsReport.__label__}` {{ticker: c.ticker}}) "
+        "WITH name, c, e ORDER BY e.fiscal_period DESC "
+        "WITH name, c, head(collect(e)) AS latest "
+        "RETURN name, c.ticker, latest.pe_ratio, latest.eps_growth",
+        {'sectors': sectors},
+    )
+    members = defaultdict(list)
+    for name, ticker, pe_ratio, eps_growth in rows:
+        members[name].append((ticker, pe_ratio, eps_growth))
+    return members
+
+
+def write_sector_stats(stats: Dict[str, Dict[str, Optional[float]]]) -> int:
+    computed_at = datetime.now(timezone.utc).timestamp()
+    rows = [{'name': name, 'stats': values} for name, values in stats.items()]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        db.cypher_query(
+            f"UNWIND $rows AS r MERGE (s:`{Sector.__label__}` {{name: r.name}}) "
+            "ON CREATE SET s.uid = randomUUID(), s.created_at = $now "
+            "SET s += r.stats, s.stats_computed_at = $now, s.updated_at = $now",
+            {'rows': rows[start:start + WRITE_BATCH_SIZE], 'now': computed_at},
+        )
+    return len(rows)
+
+
+def refresh_sector_stats(sectors: Optional[Iterable[str]] = None, tickers: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute aggregates for the given sectors, the sectors of `tickers`,
+    or (neither given) every sector. Returns the number of sectors written.
+    """
+    if sectors is not None:
+        names = sorted(set(sectors))
+    elif tickers is not None:
+        names = sectors_for_tickers(tickers)
+    else:
+        names = all_sector_names()
+    if not names:
+        return 0
+    
+    members = load_members(names)
+    stats = {}
+    for name in names:
+        rows = members.get(name, [])
+        pe = np.array([np.nan if r[1] is None else r[1] for r in rows], dtype=float)
+        growth = np.array([np.nan if r[2] is None else r[2] for r in rows], dtype=float)
+        stats[name] = sector_stats(pe, growth)
+    return write_sector_stats(stats)
@@ -0,0 +1,36 @@
+"""
+NEXT_PERIOD chain pair tests.
+"""
+
+from libs.analytics.chains import chain_pairs
+
+
+def periods(*unlinked):
+    """Sorted (uid, period, unlinked) rows: u0, u1, ... in order."""
+    return [(f"u{i}", f"2024Q{i + 1}", flag) for i, flag in enumerate(unlinked)]
+
+
+def test_full_chain_links_each_period_to_the_next():
+    assert chain_pairs(periods(False, False, False), incremental=False) == [
+        {"a": "u0", "b": "u1"},
+        {"a": "u1", "b": "u2"},
+        {"a": "u2", "b": None},
+    ]
+
+
+def test_incremental_only_touches_pairs_around_unlinked_nodes():
+    """A backfilled middle period re-links its predecessor and itself."""
+    assert chain_pairs(periods(False, False, True, False, False), incremental=True) == [
+        {"a": "u1", "b": "u2"},
+        {"a": "u2", "b": "u3"},
+    ]
+    assert chain_pairs(periods(False, False, True), incremental=True) == [
+        {"a": "u1", "b": "u2"},
+        {"a": "u2", "b": None},
+    ]
+    assert chain_pairs(periods(False, False), incremental=True) == []
+
+
+def test_single_and_empty_series():
+    assert chain_pairs(periods(True), incremental=True) == [{"a": "u0", "b": None}]
+    assert chain_pairs([], incremental=False) == []
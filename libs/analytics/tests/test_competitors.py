@@ -0,0 +1,46 @@
+"""
+COMPETES_WITH neighbour search tests against a brute-force reference.
+"""
+
+import numpy as np
+
+from libs.analytics.competitors import CompanyEmbeddings, competitor_pairs, top_k_similar
+from libs.analytics.vectors import normalize
+
+
+def brute_force(matrix, k):
+    sims = matrix @ matrix.T
+    np.fill_diagonal(sims, -np.inf)
+    return [list(np.argsort(-row, kind="stable")[:k]) for row in sims]
+
+
+def test_top_k_similar_matches_brute_force_across_blocks():
+    matrix = normalize(np.random.default_rng(5).normal(size=(50, 12)))
+    indices, scores = top_k_similar(matrix, k=4, block_size=16)
+    assert indices.shape == scores.shape == (50, 4)
+    assert [list(row) for row in indices] == brute_force(matrix, 4)
+    np.testing.assert_allclose(scores, np.take_along_axis(matrix @ matrix.T, indices, axis=1), rtol=1e-5)
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_top_k_similar_caps_k_to_other_rows():
+    matrix = normalize(np.eye(3))
+    indices, _ = top_k_similar(matrix, k=10)
+    assert indices.shape == (3, 2)
+    assert all(i not in row for i, row in enumerate(indices))
+    assert top_k_similar(matrix[:1], k=5)[0].shape == (1, 0)
+
+
+def test_competitor_pairs_add_same_sector_neighbours():
+    """B's nearest overall is A (other sector); its sector peer C is added too."""
+    matrix = normalize(np.array([
+        [1.0, 0.0],   # A  tech
+        [0.9, 0.1],   # B  energy
+        [0.0, 1.0],   # C  energy
+    ]))
+    data = CompanyEmbeddings(tickers=["A", "B", "C"], sectors=["tech", "energy", "energy"], matrix=matrix)
+    pairs = competitor_pairs(data, k=1)
+    
+    assert set(pairs) == {(0, 1), (1, 0), (2, 1), (1, 2)}
+    assert pairs[(1, 0)][1] is False
+    assert pairs[(1, 2)] == (float(matrix[1] @ matrix[2]), True)
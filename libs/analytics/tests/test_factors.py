@@ -0,0 +1,70 @@
+"""
+Percentile / z-score factor tests against loop references, including NaN handling.
+"""
+
+import math
+
+import numpy as np
+
+from libs.analytics.factors import compute_factors, factor_names, grouped_percentile, grouped_zscore
+
+NAN = float("nan")
+
+
+def loop_percentile(values, groups):
+    out = []
+    for v, g in zip(values, groups):
+        peers = [p for p, q in zip(values, groups) if q == g and q >= 0 and math.isfinite(p)]
+        if g < 0 or not math.isfinite(v):
+            out.append(NAN)
+            continue
+        less = sum(p < v for p in peers)
+        equal = sum(p == v for p in peers)
+        out.append((less + 0.5 * equal) / len(peers))
+    return out
+
+
+def loop_zscore(values, groups):
+    out = []
+    for v, g in zip(values, groups):
+        peers = [p for p, q in zip(values, groups) if q == g and q >= 0 and math.isfinite(p)]
+        if g < 0 or not math.isfinite(v):
+            out.append(NAN)
+            continue
+        mean = sum(peers) / len(peers)
+        std = math.sqrt(sum((p - mean) ** 2 for p in peers) / len(peers))
+        out.append((v - mean) / std if std > 0 else 0.0)
+    return out
+
+
+def test_grouped_factors_match_loop_with_ties_nan_and_ungrouped_rows():
+    rng = np.random.default_rng(6)
+    values = rng.integers(0, 5, size=60).astype(float)   # plenty of ties
+    values[::7] = NAN
+    values[3] = np.inf
+    groups = rng.integers(-1, 3, size=60)                # -1 = no sector
+    np.testing.assert_allclose(grouped_percentile(values, groups), loop_percentile(values, groups), equal_nan=True)
+    np.testing.assert_allclose(grouped_zscore(values, groups), loop_zscore(values, groups), equal_nan=True, atol=1e-12)
+
+
+def test_constant_group_has_zero_zscore_and_mid_percentile():
+    values = np.array([2.0, 2.0, 2.0])
+    groups = np.zeros(3, dtype=np.int64)
+    np.testing.assert_array_equal(grouped_zscore(values, groups), 0.0)
+    np.testing.assert_array_equal(grouped_percentile(values, groups), 0.5)
+    assert np.isnan(grouped_percentile(np.array([NAN, NAN]), np.zeros(2, dtype=np.int64))).all()
+
+
+def test_compute_factors_layout():
+    """Columns follow factor_names(): per metric, universe then sector, pct then z."""
+    values = np.array([[1.0, 10.0], [2.0, NAN], [3.0, 30.0], [4.0, 40.0]])
+    sectors = ["tech", "tech", None, "energy"]
+    factors = compute_factors(values, sectors)
+    names = factor_names(["pe", "growth"])
+    assert factors.shape == (4, len(names)) == (4, 8)
+    column = dict(zip(names, factors.T))
+    
+    np.testing.assert_allclose(column["pe_universe_pct"], [0.125, 0.375, 0.625, 0.875])
+    np.testing.assert_allclose(column["pe_sector_pct"], [0.25, 0.75, NAN, 0.5], equal_nan=True)
+    np.testing.assert_allclose(column["pe_sector_z"], [-1.0, 1.0, NAN, 0.0], equal_nan=True)
+    np.testing.assert_allclose(column["growth_universe_pct"], [1 / 6, NAN, 0.5, 5 / 6], equal_nan=True)
@@ -0,0 +1,75 @@
+"""
+SMA / RSI engine tests against straightforward loop references.
+"""
+
+import numpy as np
+
+from libs.analytics.indicators import compute_indicators, rolling_mean, rsi, wilder_smooth
+
+
+def loop_sma(values, window):
+    return [
+        sum(values[i - window + 1:i + 1]) / window if i >= window - 1 else float("nan")
+        for i in range(len(values))
+    ]
+
+
+def loop_rsi(closes, period):
+    """Textbook Wilder RSI: simple average seed, then recursive smoothing."""
+    out = [float("nan")] * len(closes)
+    if len(closes) <= period:
+        return out
+    deltas = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+    gain = sum(max(d, 0) for d in deltas[:period]) / period
+    loss = sum(max(-d, 0) for d in deltas[:period]) / period
+    
+    def value(gain, loss):
+        if loss == 0:
+            return 50.0 if gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+    
+    out[period] = value(gain, loss)
+    for i in range(period, len(deltas)):
+        gain = (gain * (period - 1) + max(deltas[i], 0)) / period
+        loss = (loss * (period - 1) + max(-deltas[i], 0)) / period
+        out[i + 1] = value(gain, loss)
+    return out
+
+
+def random_walk(n, seed=0):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+def test_rolling_mean_matches_loop():
+    closes = random_walk(300)
+    for window in (1, 5, 20, 200):
+        np.testing.assert_allclose(rolling_mean(closes, window), loop_sma(list(closes), window), equal_nan=True)
+    assert np.isnan(rolling_mean(closes[:10], 20)).all()
+
+
+def test_rsi_matches_loop_across_smoothing_blocks():
+    """Long enough to cross several _EMA_BLOCK boundaries."""
+    closes = random_walk(1000, seed=3)
+    np.testing.assert_allclose(rsi(closes, 14), loop_rsi(list(closes), 14), equal_nan=True, rtol=1e-9)
+
+
+def test_rsi_flat_and_monotonic_series():
+    assert np.isnan(rsi(np.arange(10.0), 14)).all()
+    np.testing.assert_array_equal(rsi(np.full(30, 5.0), 14)[14:], 50.0)
+    np.testing.assert_array_equal(rsi(np.arange(30.0), 14)[14:], 100.0)
+    np.testing.assert_allclose(rsi(np.arange(30.0)[::-1], 14)[14:], 0.0)
+
+
+def test_wilder_smooth_matches_recurrence():
+    values = np.random.default_rng(4).random(600)
+    expected, carry = [], 2.0
+    for x in values:
+        carry = 0.9 * carry + 0.1 * x
+        expected.append(carry)
+    np.testing.assert_allclose(wilder_smooth(values, 0.1, 2.0), expected, rtol=1e-9)
+
+
+def test_compute_indicators_columns():
+    result = compute_indicators(random_walk(250))
+    assert set(result) == {"sma_20", "sma_50", "sma_200", "rsi_14"}
+    assert all(len(column) == 250 for column in result.values())
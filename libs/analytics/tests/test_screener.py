@@ -0,0 +1,72 @@
+"""
+PEG screener engine tests (hand-computed reference values).
+"""
+
+import math
+
+import numpy as np
+
+from libs.analytics.screener import EarningsMatrix, align_quarters, quarter_number, screen, ttm
+
+NAN = float("nan")
+
+
+def matrix(eps_rows, pe):
+    return EarningsMatrix(
+        tickers=[f"T{i}" for i in range(len(eps_rows))],
+        periods=["2024Q4"] * len(eps_rows),
+        eps=np.array(eps_rows, dtype=float),
+        pe=np.array(pe, dtype=float),
+        names=[None] * len(eps_rows),
+        sectors=[None] * len(eps_rows),
+    )
+
+
+def test_ttm_requires_four_quarters():
+    eps = np.array([[1, 1, 1, 1, 2, 2, 2, 2], [1, NAN, 1, 1, 1, 1, 1, 1]], dtype=float)
+    np.testing.assert_array_equal(ttm(eps, 0), [4, NAN])
+    np.testing.assert_array_equal(ttm(eps, 4), [8, 4])
+    assert np.isnan(ttm(eps[:, :6], 4)).all()
+
+
+def test_screen_growth_peg_and_rank():
+    result = screen(matrix(
+        [
+            [3, 3, 3, 3, 2, 2, 2, 2],          # TTM 12 vs 8: growth 50%, PEG 20 / 50 = 0.4
+            [1.5, 1.5, 1.5, 1.5, 1, 1, 1, 1],  # TTM 6 vs 4: growth 50%, PEG 10 / 50 = 0.2
+            [1, 1, 1, 1, 2, 2, 2, 2],          # shrinking: no PEG
+            [1, 1, 1, 1, -1, -1, -1, -1],      # loss a year ago: no growth
+            [2, 2, 2, 2, 1, 1, 1, 1],          # negative PE: no PEG
+        ],
+        pe=[20, 10, 15, 30, -5],
+    ))
+    np.testing.assert_allclose(result["ttm_eps"], [12, 6, 4, 4, 8])
+    np.testing.assert_allclose(result["eps_growth"], [0.5, 0.5, -0.5, NAN, 1.0], equal_nan=True)
+    np.testing.assert_allclose(result["peg_ratio"], [0.4, 0.2, NAN, NAN, NAN], equal_nan=True)
+    assert list(result["rank"]) == [2, 1, -1, -1, -1]
+
+
+def test_screen_ties_keep_ticker_order():
+    result = screen(matrix([[1, 1, 1, 1, 0.5, 0.5, 0.5, 0.5]] * 3, pe=[10, 10, 10]))
+    assert math.isclose(result["peg_ratio"][0], 0.1)
+    assert list(result["rank"]) == [1, 2, 3]
+
+
+def test_missing_quarter_voids_ttm_instead_of_widening_it():
+    """2023Q3 is missing: the latest 8 reports span 9 quarters, so neither TTM is complete."""
+    periods = ["2024Q4", "2024Q3", "2024Q2", "2024Q1", "2023Q4", "2023Q2", "2023Q1", "2022Q4"]
+    row = align_quarters(periods, [3, 3, 3, 3, 2, 2, 2, 2], quarters=8)
+    np.testing.assert_array_equal(row, [3, 3, 3, 3, 2, NAN, 2, 2])
+    
+    result = screen(matrix([row], pe=[20]))
+    assert result["ttm_eps"][0] == 12
+    assert np.isnan(result["eps_growth"][0])
+    assert list(result["rank"]) == [-1]
+
+
+def test_align_quarters_orders_by_period_and_drops_bad_rows():
+    assert quarter_number("2024Q1") - quarter_number("2023Q4") == 1
+    assert quarter_number("2024-Q1") is None
+    row = align_quarters(["2024Q2", "bogus", "2023Q2", "2021Q1"], [1.0, 9.0, None, 5.0], quarters=4)
+    np.testing.assert_array_equal(row, [1.0, NAN, NAN, NAN])
+    assert np.isnan(align_quarters([], [], quarters=2)).all()
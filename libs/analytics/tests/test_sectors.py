@@ -0,0 +1,35 @@
+"""
+Sector aggregate tests (hand-computed quartiles).
+"""
+
+import numpy as np
+
+from libs.analytics.sectors import sector_stats
+
+NAN = float("nan")
+
+
+def test_sector_stats_quartiles_and_breadth():
+    pe = np.array([10.0, 20.0, 30.0, -5.0, NAN])
+    growth = np.array([0.5, 0.2, -0.1, 0.4, NAN])
+    stats = sector_stats(pe, growth)
+    
+    assert stats["company_count"] == 5
+    assert stats["reporting_count"] == 4
+    assert stats["positive_growth_ratio"] == 0.75
+    # Negative PE is not a valid multiple
+    assert (stats["pe_p25"], stats["pe_median"], stats["pe_p75"]) == (15.0, 20.0, 25.0)
+    # PEG = pe / (growth * 100) only where both are positive: 0.2, 1.0
+    np.testing.assert_allclose([stats["peg_p25"], stats["peg_median"], stats["peg_p75"]], [0.4, 0.6, 0.8])
+    np.testing.assert_allclose(
+        [stats["growth_p25"], stats["growth_median"], stats["growth_p75"]],
+        np.percentile([0.5, 0.2, -0.1, 0.4], [25, 50, 75]),
+    )
+
+
+def test_sector_without_metrics_has_empty_stats():
+    stats = sector_stats(np.array([NAN, 0.0]), np.array([NAN, NAN]))
+    assert stats["company_count"] == 2
+    assert stats["reporting_count"] == 0  # a zero PE is not reported either
+    assert stats["positive_growth_ratio"] is None
+    assert stats["pe_median"] is None and stats["peg_median"] is None and stats["growth_median"] is None
@@ -0,0 +1,113 @@
+"""
+IVF vector index tests.
+
+Pure numpy / filesystem; embeddings are supplied directly (no Neo4j required).
+"""
+
+import os
+
+import numpy as np
+
+from libs.analytics import vectors
+from libs.analytics.vectors import IvfIndex, VectorIndexStore, build_vector_index
+
+
+def exact_top_k(matrix, query, k):
+    normed = vectors.normalize(matrix)
+    scores = normed @ vectors.normalize(query)
+    return [int(i) for i in np.argsort(-scores, kind="stable")[:k]]
+
+
+def test_search_matches_exact_scan_when_probing_every_list():
+    rng = np.random.default_rng(1)
+    matrix = rng.normal(size=(300, 16)).astype(np.float32)
+    keys = [f"K{i}" for i in range(len(matrix))]
+    index = IvfIndex.build(keys, matrix, n_lists=8)
+    
+    hits = index.search(matrix[0], k=5, nprobe=8, exclude=("K0",))
+    expected = [f"K{i}" for i in exact_top_k(matrix, matrix[0], 6) if i != 0][:5]
+    assert [key for key, _ in hits] == expected
+    assert all(-1.0 <= score <= 1.0 + 1e-6 for _, score in hits)
+
+
+def test_rebuilds_keep_current_and_prune_by_mtime(tmp_path, monkeypatch):
+    rng = np.random.default_rng(2)
+    matrix = rng.normal(size=(40, 8)).astype(np.float32)
+    monkeypatch.setattr(vectors, "load_embeddings", lambda kind: ([f"K{i}" for i in range(40)], matrix))
+    
+    for _ in range(4):
+        assert build_vector_index("company", root=tmp_path) == 40
+    base = tmp_path / "company"
+    builds = [p for p in base.iterdir() if p.is_dir()]
+    current = (base / "CURRENT").read_text()
+    assert len(builds) == vectors.KEEP_BUILDS
+    assert current in {p.name for p in builds}
+    assert not [p for p in base.iterdir() if p.name.endswith(".tmp")]
+    
+    # A newer build that is not (yet) current must not cause the current one to be pruned
+    newest = base / "unswapped"
+    newest.mkdir()
+    later = os.stat(base / current).st_mtime + 60
+    os.utime(newest, (later, later))
+    vectors._prune_builds(base)
+    assert (base / current).is_dir() and newest.is_dir()
+    
+    hits = VectorIndexStore(tmp_path).similar_to("company", "K1", k=3)
+    assert len(hits) == 3 and "K1" not in [key for key, _ in hits]
+
+
+class FakeGraph:
+    """Answers load_embeddings' count and keyset-page queries from a dict."""
+    
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.pages = []
+    
+    def cypher_query(self, query, params=None):
+        rows = [(key, vec) for key, vec in self.embeddings.items() if key]
+        if "count(*)" in query:
+            dims = {}
+            for _, vec in rows:
+                dims[len(vec)] = dims.get(len(vec), 0) + 1
+            ranked = sorted(dims.items(), key=lambda item: (-item[1], item[0]))
+            return [list(ranked[0])] if ranked else [], None
+        self.pages.append(dict(params))
+        rows = sorted(
+            (key, vec) for key, vec in rows
+            if len(vec) == params["dim"] and (params["after"] is None or key > params["after"])
+        )
+        return [list(row) for row in rows[:params["limit"]]], None
+
+
+def test_load_embeddings_pages_by_key_into_one_matrix(monkeypatch):
+    rng = np.random.default_rng(3)
+    embeddings = {f"K{i:02d}": rng.normal(size=4).tolist() for i in range(25)}
+    embeddings["ODD"] = [1.0, 2.0]   # minority dimension is dropped
+    embeddings[""] = [0.0] * 4       # rows without a key are skipped
+    graph = FakeGraph(embeddings)
+    monkeypatch.setattr(vectors, "db", graph)
+    
+    keys, matrix = vectors.load_embeddings("company", page_size=10)
+    assert keys == sorted(k for k in embeddings if k.startswith("K"))
+    assert matrix.dtype == np.float32 and matrix.shape == (25, 4)
+    np.testing.assert_allclose(matrix, np.array([embeddings[k] for k in keys], dtype=np.float32))
+    assert [page["after"] for page in graph.pages] == [None, "K09", "K19"]
+    assert [page["limit"] for page in graph.pages] == [10, 10, 5]
+
+
+def test_load_embeddings_handles_empty_graph_and_deleted_rows(monkeypatch):
+    monkeypatch.setattr(vectors, "db", FakeGraph({}))
+    keys, matrix = vectors.load_embeddings("company")
+    assert keys == [] and matrix.shape == (0, 0)
+    
+    class Shrinking(FakeGraph):
+        def cypher_query(self, query, params=None):
+            result = super().cypher_query(query, params)
+            if "count(*)" in query:
+                self.embeddings.pop("K1")   # deleted between the count and the pages
+            return result
+    
+    monkeypatch.setattr(vectors, "db", Shrinking({f"K{i}": [float(i), 1.0] for i in range(3)}))
+    keys, matrix = vectors.load_embeddings("company", page_size=2)
+    assert keys == ["K0", "K2"]
+    assert matrix.shape == (2, 2)
@@ -0,0 +1,305 @@
+"""
+Approximate nearest-neighbour index over stored embeddings.
+
+IVF (inverted file) index: vectors are L2-normalized, clustered with
+spherical k-means, and written as one float32 matrix with rows grouped by
+cluster. The matrix is memory-mapped, so a search only reads the rows of the
+`nprobe` closest clusters instead of scanning every vector.
+
+On disk each kind lives under `<root>/<kind>/`:
+    CURRENT                 name of the active build (swapped atomically)
+    <build>/vectors.f32     row-major float32 matrix (rows grouped by list)
+    <build>/centroids.npy   list centroids
+    <build>/offsets.npy     row offsets per list (len = n_lists + 1)
+    <build>/keys.json       natural key per row
+
+Usage:
+    from libs.analytics.vectors import build_vector_index, VectorIndexStore
+    
+    build_vector_index('company')                      # after a commit / nightly
+    store = VectorIndexStore()
+    store.similar_to('company', 'AAPL', k=10)          # [(ticker, score), ...]
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+from neomodel import StructuredNode, db
+
+from libs.config.settings import get_settings
+from libs.neo4j_models import Company, DailyQuote, EarningsReport, NewsArticle
+
+# Below this many vectors a single list (exact scan) is already fast
+EXACT_SEARCH_LIMIT = 4096
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 64
+DEFAULT_NPROBE = 8
+KEEP_BUILDS = 2
+EMBEDDING_PAGE_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class VectorSource:
+    """Where a kind's embeddings are stored in the graph."""
+    model: Type[StructuredNode]
+    key_field: str
+
+
+VECTOR_SOURCES: Dict[str, VectorSource] = {
+    'company': VectorSource(Company, 'ticker'),
+    'news': VectorSource(NewsArticle, 'article_id'),
+    'earnings': VectorSource(EarningsReport, 'uid'),
+    'quote': VectorSource(DailyQuote, 'uid'),
+}
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _nearest(matrix: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+    """Index of the most similar centroid per row, in row blocks."""
+    out = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), block):
+        out[start:start + block] = np.argmax(matrix[start:start + block] @ centroids.T, axis=1)
+    return out
+
+
+def spherical_kmeans(matrix: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """Cluster normalized rows by cosine similarity; returns centroids."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(matrix), n_lists * KMEANS_SAMPLE_PER_LIST)
+    sample = matrix[rng.choice(len(matrix), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]  # keep empty lists where they were
+        centroids = normalize(sums)
+    return centroids
+
+
+class IvfIndex:
+    """Read-only IVF index (see module docstring for the layout)."""
+    
+    def __init__(self, keys: List[str], vectors: np.ndarray, centroids: np.ndarray, offsets: np.ndarray) -> None:
+        self.keys = keys
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = {key: row for row, key in enumerate(keys)}
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    @classmethod
+    def build(cls, keys: Sequence[str], matrix: np.ndarray, n_lists: Optional[int] = None, seed: int = 0) -> 'IvfIndex':
+        matrix = normalize(matrix)
+        if n_lists is None:
+            n_lists = 1 if len(matrix) <= EXACT_SEARCH_LIMIT else int(np.sqrt(len(matrix)))
+        n_lists = max(1, min(n_lists, len(matrix)))
+        if n_lists == 1:
+            centroids = normalize(matrix.mean(axis=0, keepdims=True))
+            assign = np.zeros(len(matrix), dtype=np.int64)
+        else:
+            centroids = spherical_kmeans(matrix, n_lists, seed)
+            assign = _nearest(matrix, centroids)
+        order = np.argsort(assign, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        return cls([keys[i] for i in order], matrix[order], centroids, offsets)
+    
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        np.ascontiguousarray(self.vectors, dtype=np.float32).tofile(directory / 'vectors.f32')
+        np.save(directory / 'centroids.npy', self.centroids)
+        np.save(directory / 'offsets.npy', self.offsets)
+        (directory / 'keys.json').write_text(json.dumps(self.keys))
+    
+    @classmethod
+    def load(cls, directory: Path) -> 'IvfIndex':
+        keys = json.loads((directory / 'keys.json').read_text())
+        centroids = np.load(directory / 'centroids.npy')
+        offsets = np.load(directory / 'offsets.npy')
+        if keys:
+            vectors = np.memmap(directory / 'vectors.f32', dtype=np.float32, mode='r',
+                                shape=(len(keys), centroids.shape[1]))
+        else:
+            vectors = np.zeros((0, centroids.shape[1]), dtype=np.float32)
+        return cls(keys, vectors, centroids, offsets)
+    
+    def vector(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        return None if row is None else np.asarray(self.vectors[row])
+    
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        nprobe: int = DEFAULT_NPROBE,
+        exclude: Sequence[str] = (),
+    ) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine similarity) from the `nprobe` closest lists."""
+        if not self.keys or k <= 0:
+            return []
+        query = normalize(query)
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        
+        rows, scores = [], []
+        for probe in probes:
+            start, end = int(self.offsets[probe]), int(self.offsets[probe + 1])
+            if start == end:
+                continue
+            rows.append(np.arange(start, end))
+            scores.append(self.vectors[start:end] @ query)
+        if not rows:
+            return []
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        
+        excluded = {self.rows[key] for key in exclude if key in self.rows}
+        want = min(k + len(excluded), len(scores))
+        top = np.argpartition(-scores, want - 1)[:want]
+        top = top[np.argsort(-scores[top])]
+        hits = [(self.keys[rows[i]], float(scores[i])) for i in top if rows[i] not in excluded]
+        return hits[:k]
+
+
+def index_root() -> Path:
+    return Path(get_settings().vector_index_dir)
+
+
+def load_embeddings(kind: str, page_size: int = EMBEDDING_PAGE_SIZE) -> Tuple[List[str], np.ndarray]:
+    """
+    All (key, embedding) pairs of one kind, ordered by key.
+    
+    Rows whose dimension differs from the most common one are dropped. The
+    matrix is preallocated from a per-dimension count and filled in keyset
+    pages (`key > last ORDER BY key LIMIT page_size`), so at most one page of
+    Python lists is alive at a time. Rows added after the count are left for
+    the next build; rows deleted meanwhile shrink the result.
+    """
+    source = VECTOR_SOURCES[kind]
+    match = (
+        f"MATCH (n:`{source.model.__label__}`) "
+        f"WHERE n.embedding IS NOT NULL AND n.{source.key_field} IS NOT NULL AND n.{source.key_field} <> '' "
+    )
+    dims, _ = db.cypher_query(match + "RETURN size(n.embedding) AS dim, count(*) AS rows ORDER BY rows DESC, dim LIMIT 1")
+    if not dims:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    dim, total = int(dims[0][0]), int(dims[0][1])
+    
+    keys: List[str] = []
+    matrix = np.empty((total, dim), dtype=np.float32)
+    query = (
+        match + f"AND size(n.embedding) = $dim AND ($after IS NULL OR n.{source.key_field} > $after) "
+        f"RETURN n.{source.key_field}, n.embedding ORDER BY n.{source.key_field} LIMIT $limit"
+    )
+    after = None
+    while len(keys) < total:
+        rows, _ = db.cypher_query(query, {'dim': dim, 'after': after, 'limit': min(page_size, total - len(keys))})
+        if not rows:
+            break
+        matrix[len(keys):len(keys) + len(rows)] = [vec for _, vec in rows]
+        keys.extend(key for key, _ in rows)
+        after = rows[-1][0]
+    return keys, matrix[:len(keys)]
+
+
+def build_vector_index(kind: str, root: Optional[Path] = None, n_lists: Optional[int] = None) -> int:
+    """
+    Rebuild one kind's index from the graph and swap it in atomically.
+    
+    Readers keep using the previous build until CURRENT changes; the
+    KEEP_BUILDS most recent builds (by mtime) are retained so open memmaps
+    stay valid, and the build CURRENT points to is never deleted. Build
+    names and the temporary pointer are unique per build, so concurrent
+    builders do not overwrite each other's files.
+    Returns the number of vectors indexed.
+    """
+    keys, matrix = load_embeddings(kind)
+    base = (root or index_root()) / kind
+    build = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex}"
+    if keys:
+        IvfIndex.build(keys, matrix, n_lists).save(base / build)
+    else:
+        IvfIndex([], np.zeros((0, 0), dtype=np.float32), np.zeros((1, 0), dtype=np.float32),
+                 np.zeros(2, dtype=np.int64)).save(base / build)
+    
+    pointer = base / f'CURRENT.{build}.tmp'
+    pointer.write_text(build)
+    os.replace(pointer, base / 'CURRENT')
+    _prune_builds(base)
+    return len(keys)
+
+
+def _prune_builds(base: Path) -> None:
+    """Delete all but the KEEP_BUILDS newest builds, keeping the current one."""
+    try:
+        current = (base / 'CURRENT').read_text().strip()
+    except FileNotFoundError:
+        return
+    builds = []
+    for path in base.iterdir():
+        try:
+            if path.is_dir() and path.name != current:
+                builds.append((path.stat().st_mtime, path))
+        except FileNotFoundError:  # removed by a concurrent builder
+            continue
+    builds.sort(reverse=True)
+    for _, stale in builds[KEEP_BUILDS - 1:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+class VectorIndexStore:
+    """
+    Process-wide reader for the on-disk indexes.
+    
+    Each kind is loaded lazily and reloaded when its CURRENT pointer
+    changes (checked at most every `recheck_seconds`).
+    """
+    
+    def __init__(self, root: Optional[Path] = None, recheck_seconds: float = 30.0) -> None:
+        self.root = root or index_root()
+        self.recheck_seconds = recheck_seconds
+        self._indexes: Dict[str, Tuple[str, IvfIndex]] = {}
+        self._checked: Dict[str, float] = {}
+    
+    def get(self, kind: str) -> Optional[IvfIndex]:
+        now = time.monotonic()
+        cached = self._indexes.get(kind)
+        if cached and now - self._checked.get(kind, 0) < self.recheck_seconds:
+            return cached[1]
+        self._checked[kind] = now
+        try:
+            build = (self.root / kind / 'CURRENT').read_text().strip()
+        except FileNotFoundError:
+            return None
+        if not cached or cached[0] != build:
+            cached = (build, IvfIndex.load(self.root / kind / build))
+            self._indexes[kind] = cached
+        return cached[1]
+    
+    def similar_to(self, kind: str, key: str, k: int = 10, target: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Nearest `target` items (default: same kind) to the stored vector of `key`.
+        """
+        index, target_index = self.get(kind), self.get(target or kind)
+        if index is None or target_index is None:
+            return []
+        vector = index.vector(key)
+        if vector is None or len(vector) != target_index.centroids.shape[1]:
+            return []
+        exclude = (key,) if target_index is index else ()
+        return target_index.search(vector, k, exclude=exclude)
@@ -12,6 +12,18 @@ Usage (FastAPI):
         user_id = payload.get('user_id')
 """
 
-from .token_utils import verify_token, decode_token, get_user_id_from_token
+from .token_utils import (
+    clear_token_cache,
+    decode_token,
+    get_user_id_from_token,
+    user_id_from_payload,
+    verify_token,
+)
 
-__all__ = ['verify_token', 'decode_token', 'get_user_id_from_token']
+__all__ = [
+    'verify_token',
+    'decode_token',
+    'get_user_id_from_token',
+    'user_id_from_payload',
+    'clear_token_cache',
+]
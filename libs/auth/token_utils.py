@@ -3,14 +3,55 @@ Token Utilities for FastAPI
 
 Verifies JWT tokens issued by djangorestframework-simplejwt.
 Compatible with SIMPLE_JWT settings in Django.
-"""
 
-from typing import Any, Dict, Optional
+Verified claims are cached per token (keyed by its SHA-256 digest) until the
+token's `exp`, so a bearer token is only verified once per process while it
+is valid. The cache is a bounded LRU (JWT_CACHE_SIZE entries); tokens
+without `exp` and invalid tokens are never cached.
+"""
 
-import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from libs.config import settings
 
+_cache: "OrderedDict[bytes, Tuple[str, float, Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached_claims(digest: bytes, secret: str) -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        entry = _cache.get(digest)
+        if entry is None:
+            return None
+        cached_secret, exp, claims = entry
+        if cached_secret != secret or exp <= time.time():
+            del _cache[digest]
+            return None
+        _cache.move_to_end(digest)
+        return claims
+
+
+def _store_claims(digest: bytes, secret: str, claims: Dict[str, Any]) -> None:
+    exp = claims.get("exp")
+    max_size = settings.jwt_cache_size
+    if not isinstance(exp, (int, float)) or max_size <= 0:
+        return
+    with _cache_lock:
+        _cache[digest] = (secret, float(exp), claims)
+        _cache.move_to_end(digest)
+        while len(_cache) > max_size:
+            _cache.popitem(last=False)
+
+
+def clear_token_cache() -> None:
+    """Drop all cached claims (e.g. after rotating JWT_SECRET_KEY)."""
+    with _cache_lock:
+        _cache.clear()
+
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
@@ -24,18 +65,27 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         Decoded payload dict, or None if invalid/expired
     """
+    secret = settings.jwt_secret_key
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _cached_claims(digest, secret)
+    if claims is not None:
+        return dict(claims)
+    
+    import jwt  # PyJWT (+ cryptography) only once a token is seen
+    
     try:
         payload = jwt.decode(
             token,
-            settings.jwt_secret_key,
+            secret,
             algorithms=["HS256"],
             options={"verify_exp": True}
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    _store_claims(digest, secret, payload)
+    return dict(payload)
 
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
@@ -57,7 +107,11 @@ def get_user_id_from_token(token: str) -> Optional[int]:
     Returns:
         User ID or None
     """
-    payload = decode_token(token)
+    return user_id_from_payload(decode_token(token))
+
+
+def user_id_from_payload(payload: Optional[Dict[str, Any]]) -> Optional[int]:
+    """User ID claim of already decoded claims."""
     if not payload:
         return None
     
@@ -3,6 +3,9 @@ Unified Settings Management (SSOT)
 
 Loads configuration from environment variables.
 Provides type-safe access to all settings.
+
+Importing this module is cheap: the project .env (python-dotenv) is read and
+the environment parsed on the first get_settings() / `settings.<attr>`.
 """
 
 import os
@@ -12,14 +15,21 @@ from pathlib import Path
 from typing import List, Optional
 from urllib.parse import urlparse, urlunparse
 
-# Load .env file if exists
 # Contract: tools/envs/env.ci is the SSOT for all environment variables
-from dotenv import load_dotenv
-
 _project_root = Path(__file__).resolve().parent.parent.parent
 _env_file = _project_root / '.env'
-if _env_file.exists():
-    load_dotenv(_env_file)
+_env_loaded = False
+
+
+def _load_env_file() -> None:
+    """Load .env once, if it exists (python-dotenv is only imported then)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    if _env_file.exists():
+        from dotenv import load_dotenv
+        load_dotenv(_env_file)
 
 
 def _parse_bool(value: Optional[str], default: bool = False) -> bool:
@@ -37,6 +47,15 @@ def _parse_int(value: Optional[str], default: int) -> int:
         return default
 
 
+def _parse_float(value: Optional[str], default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def _split_csv(value: Optional[str]) -> List[str]:
     if not value:
         return []
@@ -65,6 +84,7 @@ class Settings:
     neo4j_password: str
     neo4j_database: str
     db_table_prefix: str
+    graph_backend: str
     
     # PostgreSQL
     database_url: str
@@ -73,6 +93,7 @@ class Settings:
     jwt_secret_key: str
     jwt_access_token_lifetime_minutes: int
     jwt_refresh_token_lifetime_days: int
+    jwt_cache_size: int
     
     # Django
     django_secret_key: str
@@ -81,6 +102,37 @@ class Settings:
     # CORS
     cors_allowed_origins: List[str]
     
+    # Pipeline
+    pipeline_worker_concurrency: int
+    crawler_max_workers: int
+    crawler_source_concurrency: int
+    
+    # Analytics
+    vector_index_dir: str
+    factor_metrics: List[str]
+    
+    # Response compression
+    compression_min_size: int
+    compression_encodings: List[str]
+    compression_cache_mb: int
+    
+    # singleStock snapshots
+    snapshot_max_entries: int
+    snapshot_cache_mb: int
+    snapshot_ttl_seconds: float
+    snapshot_max_age_seconds: float
+    
+    # Profiling
+    profile_secret: str
+    profile_sample_rate: float
+    profile_mode: str
+    profile_dir: str
+    profile_keep: int
+    
+    # Live events (GraphQL subscriptions)
+    events_secret: str
+    events_relay_url: str
+    
     @property
     def neo4j_bolt_url(self) -> str:
         """Build complete Neo4j bolt URL with credentials."""
@@ -109,6 +161,7 @@ def get_settings() -> Settings:
     
     PEG_ENV values: dev, test_xxx, prod
     """
+    _load_env_file()
     env = os.getenv("PEG_ENV", "dev").lower()
     debug = _parse_bool(os.getenv("DEBUG"), default=env != "prod")
     agent_name = os.getenv("PEG_AGENT_NAME", "pegscanner-backend")
@@ -128,6 +181,7 @@ def get_settings() -> Settings:
     if not prefix:
         prefix = "prod_" if env == "prod" else "dev_"
     prefix = _sanitize_prefix(prefix)
+    graph_backend = os.getenv("GRAPH_BACKEND", "neo4j").strip().lower() or "neo4j"
     
     # PostgreSQL
     database_url = os.getenv(
@@ -139,6 +193,7 @@ def get_settings() -> Settings:
     jwt_secret_key = os.getenv("JWT_SECRET_KEY", "dev-secret-change-in-production")
     jwt_access_lifetime = _parse_int(os.getenv("JWT_ACCESS_TOKEN_LIFETIME_MINUTES"), 60)
     jwt_refresh_lifetime = _parse_int(os.getenv("JWT_REFRESH_TOKEN_LIFETIME_DAYS"), 7)
+    jwt_cache_size = _parse_int(os.getenv("JWT_CACHE_SIZE"), 1024)
     
     # Django
     django_secret_key = os.getenv("DJANGO_SECRET_KEY", "dev-secret-change-in-production")
@@ -150,6 +205,39 @@ def get_settings() -> Settings:
         "http://localhost:5174",
     ]
     
+    # Pipeline
+    pipeline_worker_concurrency = _parse_int(os.getenv("PIPELINE_WORKER_CONCURRENCY"), 2)
+    crawler_max_workers = _parse_int(os.getenv("CRAWLER_MAX_WORKERS"), 4)
+    crawler_source_concurrency = _parse_int(os.getenv("CRAWLER_SOURCE_CONCURRENCY"), 1)
+    
+    # Analytics
+    vector_index_dir = os.getenv("VECTOR_INDEX_DIR") or str(_project_root / "x-data" / "vector-index")
+    factor_metrics = _split_csv(os.getenv("FACTOR_METRICS")) or ["pe_ratio", "peg_ratio", "eps_growth", "ttm_eps"]
+    
+    # Response compression (empty COMPRESSION_ENCODINGS disables it)
+    compression_min_size = _parse_int(os.getenv("COMPRESSION_MIN_SIZE"), 1024)
+    compression_encodings = [
+        e.lower() for e in _split_csv(os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip"))
+    ]
+    compression_cache_mb = _parse_int(os.getenv("COMPRESSION_CACHE_MB"), 64)
+    
+    # singleStock snapshots (SNAPSHOT_MAX_ENTRIES=0 disables them)
+    snapshot_max_entries = _parse_int(os.getenv("SNAPSHOT_MAX_ENTRIES"), 500)
+    snapshot_cache_mb = _parse_int(os.getenv("SNAPSHOT_CACHE_MB"), 128)
+    snapshot_ttl_seconds = _parse_float(os.getenv("SNAPSHOT_TTL_SECONDS"), 300.0)
+    snapshot_max_age_seconds = max(_parse_float(os.getenv("SNAPSHOT_MAX_AGE_SECONDS"), 3600.0), snapshot_ttl_seconds)
+    
+    # Profiling (off unless a secret or a sample rate is set)
+    profile_secret = os.getenv("PROFILE_SECRET", "")
+    profile_sample_rate = min(max(_parse_float(os.getenv("PROFILE_SAMPLE_RATE"), 0.0), 0.0), 1.0)
+    profile_mode = os.getenv("PROFILE_MODE", "sample").strip().lower() or "sample"
+    profile_dir = os.getenv("PROFILE_DIR") or str(_project_root / "x-log" / "profiles")
+    profile_keep = _parse_int(os.getenv("PROFILE_KEEP"), 50)
+    
+    # Live events (relay off unless both are set)
+    events_secret = os.getenv("EVENTS_SECRET", "")
+    events_relay_url = os.getenv("EVENTS_RELAY_URL", "").strip()
+    
     return Settings(
         env=env,
         debug=debug,
@@ -159,13 +247,34 @@ def get_settings() -> Settings:
         neo4j_password=neo4j_password,
         neo4j_database=neo4j_database,
         db_table_prefix=prefix,
+        graph_backend=graph_backend,
         database_url=database_url,
         jwt_secret_key=jwt_secret_key,
         jwt_access_token_lifetime_minutes=jwt_access_lifetime,
         jwt_refresh_token_lifetime_days=jwt_refresh_lifetime,
+        jwt_cache_size=jwt_cache_size,
         django_secret_key=django_secret_key,
         django_allowed_hosts=django_allowed_hosts,
         cors_allowed_origins=cors,
+        pipeline_worker_concurrency=pipeline_worker_concurrency,
+        crawler_max_workers=crawler_max_workers,
+        crawler_source_concurrency=crawler_source_concurrency,
+        vector_index_dir=vector_index_dir,
+        factor_metrics=factor_metrics,
+        compression_min_size=compression_min_size,
+        compression_encodings=compression_encodings,
+        compression_cache_mb=compression_cache_mb,
+        snapshot_max_entries=snapshot_max_entries,
+        snapshot_cache_mb=snapshot_cache_mb,
+        snapshot_ttl_seconds=snapshot_ttl_seconds,
+        snapshot_max_age_seconds=snapshot_max_age_seconds,
+        profile_secret=profile_secret,
+        profile_sample_rate=profile_sample_rate,
+        profile_mode=profile_mode,
+        profile_dir=profile_dir,
+        profile_keep=profile_keep,
+        events_secret=events_secret,
+        events_relay_url=events_relay_url,
     )
 
 
@@ -174,6 +283,16 @@ def reset_settings_cache() -> None:
     get_settings.cache_clear()
 
 
+class _LazySettings:
+    """`settings` singleton; resolves get_settings() on attribute access."""
+    
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+    
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
 # Singleton instance
-settings = get_settings()
+settings: Settings = _LazySettings()  # type: ignore[assignment]
 
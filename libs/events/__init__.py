@@ -0,0 +1,27 @@
+"""
+Live stock events (in-process pub/sub + cross-process relay)
+
+Topics: "quote" (latest OHLCV bar) and "news" (a new article), keyed by
+symbol. The backend's GraphQL subscriptions read from `bus`; writers call
+publish_events(), which also relays to the backend when the writer runs in
+another process (EVENTS_RELAY_URL).
+
+Usage:
+    from libs.events import bus, publish_events
+    
+    publish_events([("news", "AAPL", {"title": "...", "url": "...", "published_at": 1700000000000})])
+"""
+
+from .bus import TOPICS, EventBus, bus
+from .relay import SIGNATURE_HEADER, parse_relay_body, publish_events, relay_configured, relay_events
+
+__all__ = [
+    'TOPICS',
+    'EventBus',
+    'bus',
+    'publish_events',
+    'relay_events',
+    'relay_configured',
+    'parse_relay_body',
+    'SIGNATURE_HEADER',
+]
@@ -0,0 +1,126 @@
+"""
+In-process publish/subscribe for live stock events.
+
+Subscribers register for a topic ("quote", "news") and a set of symbols and
+receive events on an asyncio queue bound to their own event loop. Publishing
+is synchronous and thread-safe, so it can be called from resolvers, thread
+pools or pipeline code alike.
+
+Subscribers of the same (topic, symbol) form a group. Each published event
+is passed through a group's transform (e.g. dict -> GraphQL type) once and
+the resulting object is shared by every subscriber of the group, instead of
+being rebuilt per subscriber. Queues are bounded: a subscriber that falls
+behind loses its oldest events rather than slowing the publisher down.
+
+Usage:
+    async with bus.subscribe("quote", ["AAPL", "MSFT"], transform=to_quote) as queue:
+        event = await queue.get()
+    
+    bus.publish("quote", "AAPL", {"timestamp": 1700000000000, "close": 189.7})
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple
+
+TOPICS = ("quote", "news")
+QUEUE_SIZE = 256
+
+
+class Subscriber:
+    """One subscription: a bounded queue owned by the subscribing event loop."""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, transform: Optional[Callable[[str, dict], Any]], maxsize: int) -> None:
+        self.loop = loop
+        self.transform = transform
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+    
+    def deliver(self, item: Any) -> None:
+        """Enqueue from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:  # loop already closed; the subscription is going away
+            pass
+    
+    def _put(self, item: Any) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+
+class EventBus:
+    """See module docstring."""
+    
+    def __init__(self, queue_size: int = QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, str], Set[Subscriber]] = defaultdict(set)
+    
+    def has_subscribers(self, topic: str, symbol: Optional[str] = None) -> bool:
+        with self._lock:
+            if symbol is not None:
+                return bool(self._groups.get((topic, symbol.upper())))
+            return any(key[0] == topic for key in self._groups)
+    
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({sub for group in self._groups.values() for sub in group})
+    
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        topic: str,
+        symbols: Iterable[str],
+        transform: Optional[Callable[[str, dict], Any]] = None,
+    ) -> AsyncIterator[asyncio.Queue]:
+        """
+        Register for `topic` events of `symbols` until the block exits.
+        
+        `transform(symbol, data)` converts an event once per group; pass the
+        same function object from every subscriber so they share a group.
+        """
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown topic {topic!r}; expected one of: {', '.join(TOPICS)}")
+        subscriber = Subscriber(asyncio.get_running_loop(), transform, self.queue_size)
+        keys = {(topic, symbol.upper()) for symbol in symbols if symbol}
+        with self._lock:
+            for key in keys:
+                self._groups[key].add(subscriber)
+        try:
+            yield subscriber.queue
+        finally:
+            with self._lock:
+                for key in keys:
+                    group = self._groups.get(key)
+                    if group is not None:
+                        group.discard(subscriber)
+                        if not group:
+                            del self._groups[key]
+    
+    def publish(self, topic: str, symbol: str, data: dict) -> int:
+        """Fan `data` out to the (topic, symbol) group; returns subscribers reached."""
+        with self._lock:
+            subscribers = list(self._groups.get((topic, symbol.upper()), ()))
+        if not subscribers:
+            return 0
+        symbol = symbol.upper()
+        converted: Dict[int, Any] = {}
+        for subscriber in subscribers:
+            transform = subscriber.transform
+            key = id(transform)
+            if key not in converted:
+                converted[key] = transform(symbol, data) if transform else data
+            subscriber.deliver(converted[key])
+        return len(subscribers)
+    
+    def publish_many(self, events: Iterable[Tuple[str, str, dict]]) -> int:
+        return sum(self.publish(topic, symbol, data) for topic, symbol, data in events)
+
+
+bus = EventBus()
@@ -0,0 +1,101 @@
+"""
+Cross-process relay for the event bus.
+
+Pipeline commits run in the CMS worker, not in the backend that holds the
+subscriptions. publish_events() therefore publishes on the local bus and,
+when EVENTS_RELAY_URL is set, POSTs the events to the backend's `/events`
+endpoint, which republishes them on its own bus. Bodies are signed with
+HMAC-SHA256 over EVENTS_SECRET and carry their send time; the backend
+rejects bad signatures and bodies older than RELAY_MAX_AGE_SECONDS.
+
+Relaying is best-effort: failures are logged and never raised, since the
+data itself is already committed.
+
+Usage:
+    publish_events([("quote", "AAPL", {"timestamp": 1700000000000, "close": 189.7})])
+    
+    events = parse_relay_body(body, request.headers.get(SIGNATURE_HEADER), secret)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import time
+import urllib.request
+from typing import Iterable, List, Optional, Tuple
+
+from libs.config import settings
+
+from .bus import TOPICS, bus
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Events-Signature"
+RELAY_CHUNK_SIZE = 500
+RELAY_TIMEOUT_SECONDS = 2.0
+RELAY_MAX_AGE_SECONDS = 300
+
+Event = Tuple[str, str, dict]
+
+
+def sign_body(secret: str, body: bytes) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def parse_relay_body(body: bytes, signature: Optional[str], secret: str, now: Optional[float] = None) -> Optional[List[Event]]:
+    """Events of a signed relay body, or None if unsigned, forged, stale or malformed."""
+    if not secret or not signature or not hmac.compare_digest(sign_body(secret, body), signature):
+        return None
+    try:
+        message = json.loads(body)
+        if abs((time.time() if now is None else now) - float(message["sent_at"])) > RELAY_MAX_AGE_SECONDS:
+            return None
+        return [
+            (event["topic"], event["symbol"], event["data"])
+            for event in message["events"]
+            if event["topic"] in TOPICS and isinstance(event["data"], dict)
+        ]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def relay_events(events: List[Event], url: str, secret: str, chunk_size: int = RELAY_CHUNK_SIZE) -> int:
+    """POST events to another process's `/events`; returns events delivered."""
+    delivered = 0
+    for start in range(0, len(events), chunk_size):
+        chunk = events[start:start + chunk_size]
+        body = json.dumps({
+            "sent_at": time.time(),
+            "events": [{"topic": topic, "symbol": symbol, "data": data} for topic, symbol, data in chunk],
+        }, default=str).encode()
+        request = urllib.request.Request(
+            url,
+            data=body,
+            method="POST",
+            headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign_body(secret, body)},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=RELAY_TIMEOUT_SECONDS):
+                delivered += len(chunk)
+        except OSError as exc:
+            logger.warning("Event relay to %s failed (%d events dropped): %s", url, len(events) - delivered, exc)
+            break
+    return delivered
+
+
+def relay_configured() -> bool:
+    return bool(settings.events_relay_url and settings.events_secret)
+
+
+def publish_events(events: Iterable[Event]) -> int:
+    """Publish on the local bus and relay to EVENTS_RELAY_URL when configured."""
+    events = list(events)
+    if not events:
+        return 0
+    reached = bus.publish_many(events)
+    if relay_configured():
+        relay_events(events, settings.events_relay_url, settings.events_secret)
+    return reached
@@ -2,8 +2,11 @@ from .client import (
     fetch_stock_document,
     upsert_stock_document,
 )
+from .memory import MemoryGraphStore, memory_store
 
 __all__ = [
+    'MemoryGraphStore',
+    'memory_store',
     'fetch_stock_document',
     'upsert_stock_document',
 ]
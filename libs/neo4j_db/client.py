@@ -1,42 +1,36 @@
 import json
 import logging
 import os
+import sys
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-try:  # pragma: no cover - optional dependency
-    from django.conf import settings
-except ImportError:  # pragma: no cover - non-Django contexts
-    settings = None  # type: ignore
-
-try:  # pragma: no cover - optional dependency
-    from flask import current_app
-except ImportError:  # pragma: no cover - Flask not installed
-    current_app = None  # type: ignore
-
-try:
-    from neo4j import GraphDatabase, basic_auth
-    from neo4j.exceptions import Neo4jError, ServiceUnavailable
-except ImportError:  # pragma: no cover
-    GraphDatabase = None  # type: ignore
-    basic_auth = None  # type: ignore
-    Neo4jError = Exception  # type: ignore
-    ServiceUnavailable = Exception  # type: ignore
+from .memory import memory_store
 
 logger = logging.getLogger(__name__)
 
 
 def _get_setting(name: str, default: Optional[str] = None) -> Optional[str]:
-    if settings and hasattr(settings, name):
-        return getattr(settings, name)
-    if current_app and name in current_app.config:  # pragma: no branch - Flask optional
-        return current_app.config[name]
+    # Django / Flask settings only apply when the host app already imported them
+    django_conf = sys.modules.get('django.conf')
+    if django_conf and django_conf.settings.configured and hasattr(django_conf.settings, name):
+        return getattr(django_conf.settings, name)
+    flask = sys.modules.get('flask')
+    if flask and flask.has_app_context() and name in flask.current_app.config:  # pragma: no branch
+        return flask.current_app.config[name]
     return os.getenv(name, default)
 
 
+def _driver_errors() -> tuple:
+    from neo4j.exceptions import Neo4jError, ServiceUnavailable
+    return Neo4jError, ServiceUnavailable
+
+
 @lru_cache(maxsize=1)
 def _get_driver():
-    if not GraphDatabase:
+    try:
+        from neo4j import GraphDatabase, basic_auth
+    except ImportError:  # pragma: no cover
         logger.warning('neo4j driver not installed; skipping graph operations')
         return None
 
@@ -56,6 +50,10 @@ def _get_driver():
         return None
 
 
+def _use_memory() -> bool:
+    return (_get_setting('GRAPH_BACKEND', 'neo4j') or '').strip().lower() == 'memory'
+
+
 def _database_scope():
     database = _get_setting('NEO4J_DATABASE', '')
     return database or None
@@ -63,10 +61,12 @@ def _database_scope():
 
 def upsert_stock_document(payload: Dict[str, Any]) -> bool:
     """
-    Persists a stock document (metadata, kline, news) into Neo4j.
+    Persists a stock document (metadata, kline, news) into Neo4j
+    (or the in-process store when GRAPH_BACKEND=memory).
     """
-    driver = _get_driver()
-    if not driver:
+    memory = _use_memory()
+    driver = None if memory else _get_driver()
+    if not memory and not driver:
         return False
 
     kline_json = json.dumps(payload.get('daily_kline', []))
@@ -89,6 +89,9 @@ def upsert_stock_document(payload: Dict[str, Any]) -> bool:
             for idx, item in enumerate(news_items)
         ],
     }
+    if memory:
+        memory_store.upsert(params)
+        return True
 
     query = """
     MERGE (s:Stock {symbol: $symbol})
@@ -111,7 +114,7 @@ def upsert_stock_document(payload: Dict[str, Any]) -> bool:
         with driver.session(database=_database_scope()) as session:
             session.run(query, **params)
         return True
-    except (Neo4jError, ServiceUnavailable) as exc:  # pragma: no cover
+    except _driver_errors() as exc:  # pragma: no cover
         logger.error('Failed to persist stock payload to neo4j: %s', exc)
         return False
 
@@ -121,6 +124,8 @@ def fetch_stock_document(symbol: str) -> Optional[Dict[str, Any]]:
     Reads stock data and news from Neo4j. Returns None when no record is found
     or when Neo4j is not configured.
     """
+    if _use_memory():
+        return memory_store.fetch(symbol)
     driver = _get_driver()
     if not driver:
         return None
@@ -143,7 +148,7 @@ def fetch_stock_document(symbol: str) -> Optional[Dict[str, Any]]:
                 'daily_kline': json.loads(stock_node.get('kline_json') or '[]') if stock_node else [],
                 'news': [_node_to_dict(node) for node in news_nodes],
             }
-    except (Neo4jError, ServiceUnavailable) as exc:  # pragma: no cover
+    except _driver_errors() as exc:  # pragma: no cover
         logger.error('Failed to fetch stock payload from neo4j: %s', exc)
         return None
 
@@ -0,0 +1,52 @@
+"""
+In-process stand-in for the graph behind neo4j_db.client.
+
+Mirrors the Cypher in client.py: Stock nodes keyed by symbol, News nodes
+keyed by id, and HAS_NEWS edges that accumulate across upserts (MERGE never
+removes an edge). Used when GRAPH_BACKEND=memory.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class MemoryGraphStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stocks: Dict[str, Dict[str, Any]] = {}   # symbol -> Stock properties
+        self.news: Dict[str, Dict[str, Any]] = {}     # id -> News properties
+        self.has_news: Dict[str, Dict[str, None]] = {}  # symbol -> ordered set of news ids
+
+    def upsert(self, params: Dict[str, Any]) -> None:
+        symbol = params['symbol']
+        with self._lock:
+            stock = self.stocks.setdefault(symbol, {'symbol': symbol})
+            for key in ('name', 'sector', 'industry', 'description', 'kline_json'):
+                stock[key] = params[key]
+            edges = self.has_news.setdefault(symbol, {})
+            for item in params['news']:
+                self.news.setdefault(item['id'], {}).update(item)
+                edges[item['id']] = None
+
+    def fetch(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            stock = self.stocks.get(symbol)
+            if stock is None:
+                return None
+            news: List[Dict[str, Any]] = [dict(self.news[news_id]) for news_id in self.has_news.get(symbol, ())]
+            stock = dict(stock)
+        return {
+            'stock': stock,
+            'daily_kline': json.loads(stock.get('kline_json') or '[]'),
+            'news': news,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stocks.clear()
+            self.news.clear()
+            self.has_news.clear()
+
+
+memory_store = MemoryGraphStore()
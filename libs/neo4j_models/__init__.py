@@ -8,21 +8,38 @@ Usage:
     from libs.neo4j_models import Company, DailyQuote, DataBatch
 """
 
-from .base import TimestampedNode
-from .company import Company, Sector
-from .quote import DailyQuote
-from .earnings import EarningsReport, EpsFact
-from .news import NewsArticle
-from .source import DataSource
-from .pipeline import CrawlerTask, DataBatch
-
-__all__ = [
-    'TimestampedNode',
-    'Company', 'Sector',
-    'DailyQuote',
-    'EarningsReport', 'EpsFact',
-    'NewsArticle',
-    'DataSource',
-    'CrawlerTask', 'DataBatch',
-]
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+# Model -> submodule; each submodule (and neomodel) is imported on first access
+_EXPORTS = {
+    'TimestampedNode': 'base',
+    'Company': 'company', 'Sector': 'company',
+    'DailyQuote': 'quote',
+    'EarningsReport': 'earnings', 'EpsFact': 'earnings',
+    'NewsArticle': 'news',
+    'DataSource': 'source',
+    'CrawlerTask': 'pipeline', 'DataBatch': 'pipeline', 'DataBatchChunk': 'pipeline',
+    'PegCandidate': 'screener',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+if TYPE_CHECKING:
+    from .base import TimestampedNode
+    from .company import Company, Sector
+    from .quote import DailyQuote
+    from .earnings import EarningsReport, EpsFact
+    from .news import NewsArticle
+    from .source import DataSource
+    from .pipeline import CrawlerTask, DataBatch, DataBatchChunk
+    from .screener import PegCandidate
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Dict
 
 from neomodel import (
+    BooleanProperty,
     DateTimeProperty,
     FloatProperty,
     IntegerProperty,
@@ -50,6 +51,8 @@ class HasSectorRel(TimestampedRel):
 class CompetesWithRel(TimestampedRel):
     """Company -[COMPETES_WITH]-> Company"""
     similarity_score = FloatProperty()
+    same_sector = BooleanProperty()
+    computed_at = FloatProperty()  # set by libs/analytics/competitors.py; None = curated
 
 
 class MentionsRel(TimestampedRel):
@@ -82,6 +85,9 @@ class TimestampedNode(StructuredNode):
     created_at = DateTimeProperty(default_now=True)
     updated_at = DateTimeProperty(default_now=True)
     
+    # Digest of the source record last written (pipeline change detection)
+    content_hash = StringProperty()
+    
     def save(self, *args, **kwargs):
         self.updated_at = datetime.utcnow()
         return super().save(*args, **kwargs)
@@ -6,7 +6,9 @@ from neomodel import (
     ArrayProperty,
     BooleanProperty,
     DateProperty,
+    DateTimeProperty,
     FloatProperty,
+    IntegerProperty,
     JSONProperty,
     RelationshipFrom,
     RelationshipTo,
@@ -34,6 +36,21 @@ class Sector(TimestampedNode):
     code = StringProperty(index=True)
     description = StringProperty()
     
+    # Aggregates over member companies' latest earnings (libs.analytics.sectors)
+    company_count = IntegerProperty()
+    reporting_count = IntegerProperty()
+    pe_median = FloatProperty()
+    pe_p25 = FloatProperty()
+    pe_p75 = FloatProperty()
+    peg_median = FloatProperty()
+    peg_p25 = FloatProperty()
+    peg_p75 = FloatProperty()
+    growth_median = FloatProperty()
+    growth_p25 = FloatProperty()
+    growth_p75 = FloatProperty()
+    positive_growth_ratio = FloatProperty()
+    stats_computed_at = DateTimeProperty()
+    
     # Relationships
     companies = RelationshipFrom('Company', 'HAS_SECTOR', model=HasSectorRel)
     
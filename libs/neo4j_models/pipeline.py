@@ -78,6 +78,9 @@ class DataBatch(TimestampedNode):
     record_count = IntegerProperty(default=0)
     error_count = IntegerProperty(default=0)
     
+    # Large batches keep records in DataBatchChunk nodes instead of raw_data
+    chunk_count = IntegerProperty(default=0)
+    
     # Review
     reviewer = StringProperty()
     reviewed_at = DateTimeProperty()
@@ -85,6 +88,7 @@ class DataBatch(TimestampedNode):
     
     # Relationships
     crawler_task = RelationshipFrom('CrawlerTask', 'PRODUCED')
+    chunks = RelationshipTo('DataBatchChunk', 'HAS_CHUNK')
     
     def __str__(self):
         return f"DataBatch({self.batch_id}:{self.status})"
@@ -102,3 +106,22 @@ class DataBatch(TimestampedNode):
         })
         return data
 
+
+class DataBatchChunk(TimestampedNode):
+    """Fixed-size slice of a large batch's records."""
+    
+    __label__ = prefixed_label("DataBatchChunk")
+    
+    batch_id = StringProperty(required=True, index=True)
+    chunk_index = IntegerProperty(required=True, index=True)
+    record_count = IntegerProperty(default=0)
+    
+    raw_data = JSONProperty()
+    cleaned_data = JSONProperty()
+    
+    # Relationships
+    batch = RelationshipFrom('DataBatch', 'HAS_CHUNK')
+    
+    def __str__(self):
+        return f"DataBatchChunk({self.batch_id}#{self.chunk_index})"
+
@@ -0,0 +1,133 @@
+"""
+Graph schema (indexes + constraints) derived from the node models.
+
+Single-property indexes and uniqueness constraints come from the
+`index=True` / `unique_index=True` flags on each model. Composite indexes
+for multi-key lookups are declared in COMPOSITE_INDEXES.
+
+Usage:
+    from libs.neo4j_models.schema import install_schema, missing_schema
+    
+    install_schema()            # idempotent (IF NOT EXISTS)
+    missing = missing_schema()  # [] when everything is in place
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from neomodel import StructuredNode, db
+
+from .company import Company, Sector
+from .earnings import EarningsReport, EpsFact
+from .news import NewsArticle
+from .pipeline import CrawlerTask, DataBatch, DataBatchChunk
+from .quote import DailyQuote
+from .screener import PegCandidate
+from .source import DataSource
+
+GRAPH_MODELS: List[Type[StructuredNode]] = [
+    Company, Sector,
+    DailyQuote,
+    EarningsReport, EpsFact,
+    NewsArticle,
+    DataSource,
+    CrawlerTask, DataBatch, DataBatchChunk,
+    PegCandidate,
+]
+
+# Multi-property lookups on hot paths (pipeline upserts, per-ticker reads)
+COMPOSITE_INDEXES: List[Tuple[Type[StructuredNode], Tuple[str, ...]]] = [
+    (DailyQuote, ('ticker', 'date')),
+    (EarningsReport, ('ticker', 'fiscal_period')),
+    (EpsFact, ('ticker', 'quarter')),
+    (DataBatchChunk, ('batch_id', 'chunk_index')),
+]
+
+UNIQUE = 'unique'
+RANGE = 'range'
+
+
+@dataclass(frozen=True)
+class SchemaItem:
+    """One index or uniqueness constraint."""
+    kind: str  # UNIQUE or RANGE
+    label: str
+    properties: Tuple[str, ...]
+    
+    @property
+    def name(self) -> str:
+        return f"{self.label}_{'_'.join(self.properties)}_{self.kind}".lower()
+    
+    def create_statement(self) -> str:
+        props = ', '.join(f"n.{p}" for p in self.properties)
+        if self.kind == UNIQUE:
+            return (
+                f"CREATE CONSTRAINT {self.name} IF NOT EXISTS "
+                f"FOR (n:`{self.label}`) REQUIRE ({props}) IS UNIQUE"
+            )
+        return f"CREATE INDEX {self.name} IF NOT EXISTS FOR (n:`{self.label}`) ON ({props})"
+    
+    def __str__(self) -> str:
+        return f"{self.kind} :{self.label}({', '.join(self.properties)})"
+
+
+def declared_schema(models: Optional[Sequence[Type[StructuredNode]]] = None) -> List[SchemaItem]:
+    """All indexes/constraints the models require."""
+    models = GRAPH_MODELS if models is None else models
+    items = []
+    for model in models:
+        label = model.__label__
+        for name, prop in model.defined_properties(aliases=False, rels=False).items():
+            db_name = getattr(prop, 'db_property', None) or name
+            if getattr(prop, 'unique_index', False):
+                items.append(SchemaItem(UNIQUE, label, (db_name,)))
+            elif getattr(prop, 'index', False):
+                items.append(SchemaItem(RANGE, label, (db_name,)))
+    for model, props in COMPOSITE_INDEXES:
+        if model in models:
+            items.append(SchemaItem(RANGE, model.__label__, props))
+    return items
+
+
+def existing_schema() -> Set[Tuple[str, str, Tuple[str, ...]]]:
+    """(kind, label, properties) for every index/constraint in the database."""
+    found = set()
+    rows, _ = db.cypher_query(
+        "SHOW CONSTRAINTS YIELD type, labelsOrTypes, properties "
+        "RETURN type, labelsOrTypes, properties"
+    )
+    for ctype, labels, props in rows:
+        if 'UNIQUE' in (ctype or '') and labels:
+            found.add((UNIQUE, labels[0], tuple(props or ())))
+    rows, _ = db.cypher_query(
+        "SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties "
+        "WHERE entityType = 'NODE' RETURN type, labelsOrTypes, properties"
+    )
+    for itype, labels, props in rows:
+        if itype == 'RANGE' and labels:
+            found.add((RANGE, labels[0], tuple(props or ())))
+    return found
+
+
+def missing_schema(models: Optional[Sequence[Type[StructuredNode]]] = None) -> List[SchemaItem]:
+    """Declared items that are not present in the database."""
+    found = existing_schema()
+    missing = []
+    for item in declared_schema(models):
+        key = (item.kind, item.label, item.properties)
+        # A uniqueness constraint is backed by a range index, which covers lookups
+        if key in found or (item.kind == RANGE and (UNIQUE, item.label, item.properties) in found):
+            continue
+        missing.append(item)
+    return missing
+
+
+def install_schema(
+    models: Optional[Sequence[Type[StructuredNode]]] = None,
+    items: Optional[Iterable[SchemaItem]] = None,
+) -> List[SchemaItem]:
+    """Create every declared index/constraint (idempotent). Returns what was run."""
+    items = list(items) if items is not None else declared_schema(models)
+    for item in items:
+        db.cypher_query(item.create_statement())
+    return items
@@ -0,0 +1,44 @@
+"""Materialized screener output nodes."""
+
+from typing import Any, Dict
+
+from neomodel import ArrayProperty, DateTimeProperty, FloatProperty, IntegerProperty, StringProperty
+
+from .base import TimestampedNode, prefixed_label
+
+
+class PegCandidate(TimestampedNode):
+    """One row of the PEG screener table, rebuilt by libs.analytics.screener."""
+    
+    __label__ = prefixed_label("PegCandidate")
+    
+    ticker = StringProperty(unique_index=True, required=True)
+    name = StringProperty()
+    sector = StringProperty(index=True)
+    
+    latest_period = StringProperty()
+    ttm_eps = FloatProperty()
+    eps_growth = FloatProperty()
+    pe_ratio = FloatProperty()
+    peg_ratio = FloatProperty()
+    rank = IntegerProperty(index=True)
+    computed_at = DateTimeProperty()
+    
+    # Percentile / z-score factors, laid out by libs.analytics.factors.factor_names()
+    factors = ArrayProperty(FloatProperty())
+    
+    def __str__(self):
+        return f"PegCandidate({self.ticker}#{self.rank})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            'ticker': self.ticker,
+            'name': self.name,
+            'sector': self.sector,
+            'pe_ratio': self.pe_ratio,
+            'eps_growth': self.eps_growth,
+            'peg_ratio': self.peg_ratio,
+            'rank': self.rank,
+        })
+        return data
@@ -0,0 +1,122 @@
+"""
+Graph schema tests (statement generation and the declared-vs-installed diff).
+
+SHOW INDEXES / SHOW CONSTRAINTS results are stubbed (no Neo4j required).
+"""
+
+from neomodel import IntegerProperty, StringProperty, StructuredNode
+
+from libs.neo4j_models import schema
+from libs.neo4j_models.schema import (
+    RANGE,
+    UNIQUE,
+    SchemaItem,
+    declared_schema,
+    install_schema,
+    missing_schema,
+)
+
+
+class SchemaProbe(StructuredNode):
+    __label__ = "SchemaProbe"
+    
+    code = StringProperty(unique_index=True)
+    region = StringProperty(index=True)
+    rank = IntegerProperty(index=True, db_property="rank_value")
+    note = StringProperty()
+
+
+class FakeSchemaGraph:
+    """Answers SHOW CONSTRAINTS / SHOW INDEXES and records everything else."""
+    
+    def __init__(self, constraints=(), indexes=()):
+        self.constraints = list(constraints)
+        self.indexes = list(indexes)
+        self.executed = []
+    
+    def cypher_query(self, query, params=None):
+        if query.startswith("SHOW CONSTRAINTS"):
+            return self.constraints, None
+        if query.startswith("SHOW INDEXES"):
+            return self.indexes, None
+        self.executed.append(query)
+        return [], None
+
+
+def test_declared_schema_follows_property_flags():
+    items = declared_schema([SchemaProbe])
+    assert set(items) == {
+        SchemaItem(UNIQUE, "SchemaProbe", ("code",)),
+        SchemaItem(RANGE, "SchemaProbe", ("region",)),
+        SchemaItem(RANGE, "SchemaProbe", ("rank_value",)),  # stored name, not the attribute
+    }
+
+
+def test_composite_indexes_only_for_requested_models():
+    quote = schema.DailyQuote
+    assert SchemaItem(RANGE, quote.__label__, ("ticker", "date")) in declared_schema([quote])
+    assert not [item for item in declared_schema([SchemaProbe]) if len(item.properties) > 1]
+    
+    every = declared_schema()
+    assert len(set(every)) == len(every)
+    assert {item.label for item in every} == {model.__label__ for model in schema.GRAPH_MODELS}
+
+
+def test_create_statements():
+    unique = SchemaItem(UNIQUE, "SchemaProbe", ("code",))
+    assert unique.create_statement() == (
+        "CREATE CONSTRAINT schemaprobe_code_unique IF NOT EXISTS "
+        "FOR (n:`SchemaProbe`) REQUIRE (n.code) IS UNIQUE"
+    )
+    composite = SchemaItem(RANGE, "DailyQuote", ("ticker", "date"))
+    assert composite.create_statement() == (
+        "CREATE INDEX dailyquote_ticker_date_range IF NOT EXISTS "
+        "FOR (n:`DailyQuote`) ON (n.ticker, n.date)"
+    )
+
+
+def test_missing_schema_diffs_against_show_results(monkeypatch):
+    graph = FakeSchemaGraph(
+        constraints=[
+            ["UNIQUENESS", ["SchemaProbe"], ["code"]],
+            ["NODE_KEY", ["SchemaProbe"], ["note"]],       # not a uniqueness constraint we manage
+        ],
+        indexes=[
+            ["RANGE", ["SchemaProbe"], ["region"]],
+            ["RANGE", ["SchemaProbe"], ["code"]],           # backing index of the constraint
+            ["TEXT", ["SchemaProbe"], ["rank_value"]],      # wrong index type
+            ["LOOKUP", None, None],                         # token lookup index
+        ],
+    )
+    monkeypatch.setattr(schema, "db", graph)
+    assert missing_schema([SchemaProbe]) == [SchemaItem(RANGE, "SchemaProbe", ("rank_value",))]
+    
+    graph.constraints = []
+    graph.indexes = [["RANGE", ["SchemaProbe"], ["code"]]]   # a plain index does not enforce uniqueness
+    assert {str(item) for item in missing_schema([SchemaProbe])} == {
+        "unique :SchemaProbe(code)",
+        "range :SchemaProbe(region)",
+        "range :SchemaProbe(rank_value)",
+    }
+
+
+def test_unique_constraint_covers_a_declared_range_index(monkeypatch):
+    monkeypatch.setattr(schema, "db", FakeSchemaGraph(
+        constraints=[["UNIQUENESS", ["SchemaProbe"], ["code"]], ["UNIQUENESS", ["SchemaProbe"], ["region"]]],
+        indexes=[["RANGE", ["Other"], ["rank_value"]]],     # same property, other label
+    ))
+    assert missing_schema([SchemaProbe]) == [SchemaItem(RANGE, "SchemaProbe", ("rank_value",))]
+
+
+def test_install_runs_only_the_given_items(monkeypatch):
+    graph = FakeSchemaGraph(indexes=[["RANGE", ["SchemaProbe"], ["region"]]])
+    monkeypatch.setattr(schema, "db", graph)
+    
+    installed = install_schema(items=missing_schema([SchemaProbe]))
+    assert graph.executed == [item.create_statement() for item in installed]
+    assert len(graph.executed) == 2
+    assert all("IF NOT EXISTS" in statement for statement in graph.executed)
+    
+    graph.executed.clear()
+    assert install_schema([SchemaProbe]) == declared_schema([SchemaProbe])
+    assert len(graph.executed) == 3
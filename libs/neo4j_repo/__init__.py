@@ -11,10 +11,34 @@ Usage:
     
     repo = StockRepository()
     payload = repo.fetch_stock_payload("AAPL")
+    
+    repo = create_stock_repository()  # GRAPH_BACKEND=memory -> InMemoryStockRepository
 """
 
-from .connection import get_driver, get_settings, lifespan
-from .repositories.stock_repository import StockRepository
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Name -> submodule; neomodel is only imported once a repository is used
+_EXPORTS = {
+    "get_driver": "connection",
+    "get_settings": "connection",
+    "lifespan": "connection",
+    "InMemoryStockRepository": "repositories",
+    "StockRepository": "repositories",
+    "create_stock_repository": "repositories",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["get_driver", "get_settings", "lifespan", "StockRepository"]
 
+if TYPE_CHECKING:
+    from .connection import get_driver, get_settings, lifespan
+    from .repositories import InMemoryStockRepository, StockRepository, create_stock_repository
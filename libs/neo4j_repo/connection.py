@@ -10,8 +10,6 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
-from neomodel import config as neo_config
-
 # SSOT: Import settings from libs.config
 from libs.config.settings import Settings, get_settings, reset_settings_cache
 
@@ -23,6 +21,7 @@ __all__ = ['Settings', 'get_settings', 'reset_settings_cache', 'get_driver', 'li
 
 def get_driver() -> None:
     """Initialize neomodel connection."""
+    from neomodel import config as neo_config
     settings = get_settings()
     neo_config.DATABASE_URL = settings.neo4j_bolt_url
 
@@ -30,6 +29,7 @@ def get_driver() -> None:
 @asynccontextmanager
 async def lifespan(app: "FastAPI"):
     """FastAPI lifespan hook for Neo4j connection management."""
+    from neomodel import config as neo_config
     settings = get_settings()
     neo_config.DATABASE_URL = settings.neo4j_bolt_url
     yield
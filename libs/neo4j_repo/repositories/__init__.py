@@ -1,6 +1,38 @@
 """Repository classes for Neo4j data access."""
 
-from .stock_repository import StockRepository
+from importlib import import_module
+from typing import TYPE_CHECKING, Optional
 
-__all__ = ["StockRepository"]
+from ..connection import get_settings
 
+_EXPORTS = {
+    "InMemoryStockRepository": "memory_repository",
+    "StockRepository": "stock_repository",
+}
+
+__all__ = ["InMemoryStockRepository", "StockRepository", "create_stock_repository"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:
+    from .memory_repository import InMemoryStockRepository
+    from .stock_repository import StockRepository
+
+
+def create_stock_repository(backend: Optional[str] = None) -> "StockRepository":
+    """StockRepository for `backend` (default: Settings.graph_backend)."""
+    backend = backend or get_settings().graph_backend
+    if backend == "memory":
+        from .memory_repository import InMemoryStockRepository
+        return InMemoryStockRepository()
+    if backend == "neo4j":
+        from .stock_repository import StockRepository
+        return StockRepository()
+    raise ValueError(f"Unknown graph backend {backend!r}; expected 'neo4j' or 'memory'")
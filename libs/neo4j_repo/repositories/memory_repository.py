@@ -0,0 +1,212 @@
+"""
+In-memory Stock Repository - StockRepository without a database.
+
+Same interface and return shapes as StockRepository, backed by dicts keyed
+the way the graph is indexed (symbol, ticker, sector name, article id).
+Nodes are kept as unsaved neomodel instances, so payload merging
+(StockDocumentNode.apply_payload) and row mapping are shared with the
+Neo4j implementation rather than re-implemented.
+
+Selected with GRAPH_BACKEND=memory (see create_stock_repository); meant for
+profiling and benchmarking resolvers, caching and serialization in
+isolation. Screener rows, sector aggregates and articles are normally
+materialized by apps/cms; load them with put_peg_candidates / put_sectors /
+put_articles.
+
+Usage:
+    repo = InMemoryStockRepository()
+    repo.upsert_stock_payload({"symbol": "AAPL", ...})
+    repo.put_peg_candidates([{"ticker": "AAPL", "rank": 1, "peg_ratio": 1.2}])
+    payload = repo.fetch_stock_payload("AAPL")
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from libs.neo4j_models import NewsArticle, PegCandidate, Sector
+
+from ..models.stock import StockDocumentNode
+from .stock_repository import StockRepository
+
+
+class InMemoryStockRepository(StockRepository):
+    """
+    StockRepository over process-local dicts.
+
+    Reads return fresh top-level dicts; nested kline/news lists are shared
+    with the store, so callers must not mutate them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._docs: Dict[str, StockDocumentNode] = {}     # symbol -> node, oldest update first
+        self._candidates: Dict[str, PegCandidate] = {}    # ticker -> row
+        self._ranked: Optional[List[PegCandidate]] = None  # rows with a rank, by rank
+        self._sectors: Dict[str, Sector] = {}             # name -> node
+        self._articles: Dict[str, NewsArticle] = {}       # article_id -> node
+        self.tracking_records = 0
+        self._vectors = None
+
+    def record_tracking(self) -> None:
+        with self._lock:
+            self.tracking_records += 1
+
+    def upsert_stock_payload(self, payload: Dict[str, Any]) -> None:
+        symbol = payload.get("symbol")
+        if not symbol:
+            raise ValueError("payload must include symbol")
+        symbol = symbol.upper()
+        with self._lock:
+            doc = self._docs.pop(symbol, None) or StockDocumentNode(symbol=symbol)
+            doc.apply_payload(payload)
+            doc.symbol = symbol
+            doc.updated_at = datetime.utcnow()
+            self._docs[symbol] = doc
+
+    def fetch_stock_payload(self, symbol: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(symbol.upper())
+        return self._doc_to_payload(doc) if doc else None
+
+    def fetch_stock_meta(self, symbol: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(symbol.upper())
+        return self._doc_to_meta(doc) if doc else None
+
+    def fetch_stock_kline(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        doc = self._docs.get(symbol.upper())
+        return (doc.daily_kline or []) if doc else None
+
+    def fetch_stock_news(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        doc = self._docs.get(symbol.upper())
+        return (doc.news or []) if doc else None
+
+    def list_peg_candidates(
+        self,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        candidates = self._query_peg_candidates(sort_by, descending, filters or [], limit)
+        if candidates or filters or (sort_by and sort_by != "rank"):
+            return candidates
+        with self._lock:
+            docs = list(self._docs.values())
+        if not descending:
+            docs.reverse()
+        if limit is not None:
+            docs = docs[:int(limit)]
+        return [self._doc_to_candidate(doc) for doc in docs]
+
+    def _query_peg_candidates(
+        self,
+        sort_by: Optional[str],
+        descending: bool,
+        filters: List[Dict[str, Any]],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        from libs.analytics.factors import factor_names
+
+        positions = {name: i for i, name in enumerate(factor_names())}
+        bounds = [
+            (self._factor_position(positions, entry["factor"]), entry.get("min"), entry.get("max"))
+            for entry in filters
+        ]
+        sort = None
+        if sort_by and sort_by != "rank":
+            sort = self._factor_position(positions, sort_by)
+
+        # NaN fails every comparison, as in Cypher
+        by_factor = bool(bounds) or sort is not None
+        rows = [
+            row for row in self._ranked_rows()
+            if (not by_factor or (row.factors and len(row.factors) == len(positions)))
+            and all(
+                (low is None or row.factors[i] >= low) and (high is None or row.factors[i] <= high)
+                for i, low, high in bounds
+            )
+            and (sort is None or not math.isnan(row.factors[sort]))
+        ]
+        if sort is not None:
+            rows.sort(key=lambda row: row.rank)
+            rows.sort(key=lambda row: row.factors[sort], reverse=descending)
+        elif descending:
+            rows.reverse()
+        if limit is not None:
+            rows = rows[:int(limit)]
+        return [self._ranked_to_candidate(row) for row in rows]
+
+    def _ranked_rows(self) -> List[PegCandidate]:
+        with self._lock:
+            if self._ranked is None:
+                self._ranked = sorted(
+                    (row for row in self._candidates.values() if row.rank is not None),
+                    key=lambda row: row.rank,
+                )
+            return self._ranked
+
+    def list_sectors(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            sectors = [self._sectors[name] for name in sorted(self._sectors)]
+        return [self._sector_to_summary(sector) for sector in sectors]
+
+    def similar_companies(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
+        hits = self._vector_store().similar_to("company", symbol.upper(), k)
+        names = {}
+        for ticker, _ in hits:
+            doc = self._docs.get(ticker)
+            names[ticker] = doc.name if doc else None
+        return [
+            {"symbol": ticker, "name": names.get(ticker) or ticker, "score": score}
+            for ticker, score in hits
+        ]
+
+    def related_news(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
+        hits = self._vector_store().similar_to("company", symbol.upper(), k, target="news")
+        return [self._article_to_news(self._articles[key]) for key, _ in hits if key in self._articles]
+
+    def has_stocks(self) -> bool:
+        return bool(self._docs)
+
+    # -------------------------------------------------------------------------
+    # Loaders for data the CMS normally materializes
+    # -------------------------------------------------------------------------
+
+    def put_peg_candidates(self, rows: Iterable[Dict[str, Any]], replace: bool = True) -> int:
+        """Screener rows with PegCandidate fields (ticker, rank, peg_ratio, factors, ...)."""
+        nodes = [PegCandidate(**{**row, "ticker": row["ticker"].upper()}) for row in rows]
+        with self._lock:
+            if replace:
+                self._candidates.clear()
+            for node in nodes:
+                self._candidates[node.ticker] = node
+            self._ranked = None
+        return len(nodes)
+
+    def put_sectors(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Sector aggregates with Sector fields (name, company_count, pe_median, ...)."""
+        nodes = [Sector(**row) for row in rows]
+        with self._lock:
+            for node in nodes:
+                self._sectors[node.name] = node
+        return len(nodes)
+
+    def put_articles(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """News articles with NewsArticle fields (article_id, title, url, source_name, published_at)."""
+        nodes = [NewsArticle(**row) for row in rows]
+        with self._lock:
+            for node in nodes:
+                self._articles[node.article_id] = node
+        return len(nodes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._candidates.clear()
+            self._ranked = None
+            self._sectors.clear()
+            self._articles.clear()
+            self.tracking_records = 0
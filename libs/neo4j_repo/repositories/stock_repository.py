@@ -6,14 +6,26 @@ Abstracts Neo4j/neomodel operations behind a clean interface.
 
 from __future__ import annotations
 
+import json
+import math
 import time
 from typing import Any, Dict, Iterable, List, Optional
 
 from neo4j.exceptions import Neo4jError, ServiceUnavailable
+from neomodel import db
+
+from libs.neo4j_models import Company, NewsArticle, PegCandidate, Sector
 
 from ..connection import get_driver, get_settings
 from ..models.stock import CrawlerJobNode, StockDocumentNode, TrackingRecordNode
 
+# StockDocument properties of the page header (everything but daily_kline / news)
+META_FIELDS = (
+    "symbol", "name", "exchange", "currency", "sector", "industry", "description",
+    "valuation", "indicators", "metrics",
+)
+JSON_META_FIELDS = ("valuation", "indicators", "metrics")
+
 
 class StockRepository:
     """
@@ -29,6 +41,7 @@ class StockRepository:
         get_driver()  # Initialize neomodel connection
         settings = get_settings()
         self._wait_for_database(settings)
+        self._vectors = None
 
     def _wait_for_database(self, settings, retries: int = 10, delay_seconds: float = 2.0) -> None:
         for attempt in range(retries):
@@ -61,10 +74,135 @@ class StockRepository:
             return None
         return self._doc_to_payload(doc)
 
-    def list_peg_candidates(self) -> List[Dict[str, Any]]:
-        docs = StockDocumentNode.nodes.order_by("-updated_at")
+    # Page sections, read independently so the header does not wait for
+    # (or transfer) the kline/news JSON. None when the symbol is unknown.
+
+    def fetch_stock_meta(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Payload without daily_kline / news."""
+        fields = ", ".join(f"d.{name}" for name in META_FIELDS)
+        rows, _ = db.cypher_query(
+            f"MATCH (d:`{StockDocumentNode.__label__}` {{symbol: $symbol}}) RETURN {fields}",
+            {"symbol": symbol.upper()},
+        )
+        if not rows:
+            return None
+        meta = dict(zip(META_FIELDS, rows[0]))
+        for name in JSON_META_FIELDS:
+            meta[name] = json.loads(meta[name]) if meta[name] else {}
+        return meta
+
+    def fetch_stock_kline(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        return self._fetch_json_property(symbol, "daily_kline")
+
+    def fetch_stock_news(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        return self._fetch_json_property(symbol, "news")
+
+    def _fetch_json_property(self, symbol: str, name: str) -> Optional[List[Dict[str, Any]]]:
+        rows, _ = db.cypher_query(
+            f"MATCH (d:`{StockDocumentNode.__label__}` {{symbol: $symbol}}) RETURN d.{name}",
+            {"symbol": symbol.upper()},
+        )
+        if not rows:
+            return None
+        return json.loads(rows[0][0]) if rows[0][0] else []
+
+    def list_peg_candidates(
+        self,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked rows from the materialized PegCandidate table.
+        
+        `sort_by` and `filters` ({"factor", "min", "max"}) refer to factor
+        names (libs.analytics.factors.factor_names); both are evaluated in
+        Cypher on the stored `factors` array.
+        
+        Falls back to per-document metrics (newest first, or oldest first
+        when `descending`; `limit` applies too) until the screener has run
+        (`manage.py compute_peg_screener` in apps/cms). Factor sorts and
+        filters have no fallback.
+        """
+        candidates = self._query_peg_candidates(sort_by, descending, filters or [], limit)
+        if candidates or filters or (sort_by and sort_by != "rank"):
+            return candidates
+        docs = StockDocumentNode.nodes.order_by("updated_at" if descending else "-updated_at")
+        if limit is not None:
+            docs = docs[:int(limit)]
         return [self._doc_to_candidate(doc) for doc in docs]
 
+    def _query_peg_candidates(
+        self,
+        sort_by: Optional[str],
+        descending: bool,
+        filters: List[Dict[str, Any]],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        from libs.analytics.factors import factor_names
+
+        positions = {name: i for i, name in enumerate(factor_names())}
+
+        clauses = ["p.rank IS NOT NULL"]
+        params: Dict[str, Any] = {}
+        if filters or (sort_by and sort_by != "rank"):
+            clauses.append("size(p.factors) = $width")
+            params["width"] = len(positions)
+        for n, entry in enumerate(filters):
+            params[f"f{n}"] = self._factor_position(positions, entry["factor"])
+            for bound, op in (("min", ">="), ("max", "<=")):
+                if entry.get(bound) is not None:
+                    clauses.append(f"p.factors[$f{n}] {op} ${bound}{n}")
+                    params[f"{bound}{n}"] = float(entry[bound])
+
+        order = "p.rank"
+        if sort_by and sort_by != "rank":
+            params["sort"] = self._factor_position(positions, sort_by)
+            clauses.append("NOT isNaN(p.factors[$sort])")
+            order = f"p.factors[$sort] {'DESC' if descending else 'ASC'}, p.rank"
+        elif descending:
+            order = "p.rank DESC"
+
+        query = (
+            f"MATCH (p:`{PegCandidate.__label__}`) WHERE {' AND '.join(clauses)} "
+            f"RETURN p ORDER BY {order}"
+        )
+        if limit is not None:
+            query += " LIMIT $limit"
+            params["limit"] = int(limit)
+        rows, _ = db.cypher_query(query, params)
+        return [self._ranked_to_candidate(PegCandidate.inflate(row[0])) for row in rows]
+
+    @staticmethod
+    def _factor_position(positions: Dict[str, int], name: str) -> int:
+        if name not in positions:
+            raise ValueError(f"Unknown factor {name!r}; expected one of: {', '.join(positions)}")
+        return positions[name]
+
+    def list_sectors(self) -> List[Dict[str, Any]]:
+        """Sector aggregates materialized by `manage.py compute_sector_stats`."""
+        return [self._sector_to_summary(sector) for sector in Sector.nodes.order_by("name")]
+
+    def similar_companies(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Nearest companies by embedding (`manage.py build_vector_index` in apps/cms)."""
+        hits = self._vector_store().similar_to("company", symbol.upper(), k)
+        if not hits:
+            return []
+        names = {c.ticker: c.name for c in Company.nodes.filter(ticker__in=[key for key, _ in hits])}
+        return [
+            {"symbol": ticker, "name": names.get(ticker) or ticker, "score": score}
+            for ticker, score in hits
+        ]
+
+    def related_news(self, symbol: str, k: int = 10) -> List[Dict[str, Any]]:
+        """News articles whose embeddings are nearest to the company's."""
+        hits = self._vector_store().similar_to("company", symbol.upper(), k, target="news")
+        if not hits:
+            return []
+        articles = {a.article_id: a for a in NewsArticle.nodes.filter(article_id__in=[key for key, _ in hits])}
+        return [self._article_to_news(articles[key]) for key, _ in hits if key in articles]
+
     def has_stocks(self) -> bool:
         try:
             return bool(StockDocumentNode.nodes.first())
@@ -73,6 +211,14 @@ class StockRepository:
 
     @staticmethod
     def _doc_to_payload(doc: StockDocumentNode) -> Dict[str, Any]:
+        return {
+            **StockRepository._doc_to_meta(doc),
+            "daily_kline": doc.daily_kline or [],
+            "news": doc.news or [],
+        }
+
+    @staticmethod
+    def _doc_to_meta(doc: StockDocumentNode) -> Dict[str, Any]:
         return {
             "symbol": doc.symbol,
             "name": doc.name,
@@ -84,8 +230,6 @@ class StockRepository:
             "valuation": doc.valuation or {},
             "indicators": doc.indicators or {},
             "metrics": doc.metrics or {},
-            "daily_kline": doc.daily_kline or [],
-            "news": doc.news or [],
         }
 
     def _doc_to_candidate(self, doc: StockDocumentNode) -> Dict[str, Any]:
@@ -99,6 +243,59 @@ class StockRepository:
             "peg_ratio": metrics.get("peg_ratio"),
         }
 
+    @staticmethod
+    def _ranked_to_candidate(row: PegCandidate) -> Dict[str, Any]:
+        candidate = {
+            "symbol": row.ticker,
+            "name": row.name or row.ticker,
+            "pe_ratio": row.pe_ratio,
+            "earnings_growth": row.eps_growth,
+            "peg_ratio": row.peg_ratio,
+        }
+        if row.factors:
+            from libs.analytics.factors import factor_names
+            names = factor_names()
+            if len(names) == len(row.factors):
+                candidate["factors"] = {
+                    name: None if math.isnan(value) else value
+                    for name, value in zip(names, row.factors)
+                }
+        return candidate
+
+    @staticmethod
+    def _sector_to_summary(sector: Sector) -> Dict[str, Any]:
+        return {
+            "name": sector.name,
+            "company_count": sector.company_count or 0,
+            "reporting_count": sector.reporting_count or 0,
+            "pe_median": sector.pe_median,
+            "pe_p25": sector.pe_p25,
+            "pe_p75": sector.pe_p75,
+            "peg_median": sector.peg_median,
+            "peg_p25": sector.peg_p25,
+            "peg_p75": sector.peg_p75,
+            "growth_median": sector.growth_median,
+            "growth_p25": sector.growth_p25,
+            "growth_p75": sector.growth_p75,
+            "positive_growth_ratio": sector.positive_growth_ratio,
+            "computed_at": sector.stats_computed_at.timestamp() * 1000 if sector.stats_computed_at else None,
+        }
+
+    @staticmethod
+    def _article_to_news(article: NewsArticle) -> Dict[str, Any]:
+        return {
+            "title": article.title,
+            "url": article.url,
+            "source": article.source_name,
+            "published_at": article.published_at.timestamp() * 1000 if article.published_at else None,
+        }
+
+    def _vector_store(self):
+        if self._vectors is None:
+            from libs.analytics.vectors import VectorIndexStore  # numpy only when used
+            self._vectors = VectorIndexStore()
+        return self._vectors
+
     def seed_if_needed(self, payloads: Iterable[Dict[str, Any]]) -> None:
         if self.has_stocks():
             return
@@ -12,7 +12,7 @@ Dependencies are resolved by file order:
     1. common/*.graphql (base types)
     2. news/*.graphql (NewsItem used by market)
     3. market/*.graphql (depends on news)
-    4. query.graphql (root Query, depends on all)
+    4. query.graphql (root Query / Subscription, depends on all)
 """
 
 from pathlib import Path